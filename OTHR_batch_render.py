@@ -0,0 +1,559 @@
+#!/usr/bin/env python3
+"""
+Arctic OTHR Batch Renderer
+Coverage maps and performance curves for many scenarios
+
+UNCLASSIFIED // PUBLIC RELEASE
+Version: 1.0 Framework
+
+PURPOSE: plot_coverage_map and plot_performance_curves build a new figure,
+         contour the coverage and save at 300 dpi on every call, so
+         rendering a sweep or briefing deck is dominated by matplotlib
+         set-up. The renderers here build one figure template per process
+         (Agg canvas, no pyplot state) and per scenario only replace the
+         coverage raster (blended into the Agg buffer through a cached
+         pixel -> cell lookup), the site markers and the curve data, which
+         are computed vectorized. Output matches the 300 dpi tight-cropped
+         PNGs of OTHR_visualization; they are encoded with one Up filter and
+         run-length zlib instead of PIL's per-row adaptive filtering, which
+         dominated the save. render_batch spreads scenarios over a process
+         pool, each worker keeping its templates warm; plot_loop_batch runs
+         the plot functions over the same scenarios and processes, as the
+         baseline that --compare times.
+
+USAGE:
+    render_batch([{'max_range_km': r} for r in range(2500, 3500, 2)],
+                 output_dir='renders', workers=8)
+"""
+
+import functools
+import os
+import struct
+import zlib
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib import rcParams
+from matplotlib.cm import ScalarMappable
+from matplotlib.colors import BoundaryNorm, ListedColormap, to_rgba_array
+from matplotlib.figure import Figure
+
+from OTHR_coverage_model import (DEFAULT_OUTPUT_DIR, OTHRParameters,
+                                 apply_parameter_overrides, calculate_coverage_map,
+                                 calculate_detection_probability)
+from OTHR_visualization import (COVERAGE_ALPHA, COVERAGE_COLORS, COVERAGE_LEVELS,
+                                COVERAGE_MAP_TITLE, CURVE_TARGET, SAVE_DPI)
+
+# ============================================================================
+# RENDER DEFAULTS
+# ============================================================================
+
+DEFAULT_DPI = SAVE_DPI          # Same output resolution as OTHR_visualization
+DEFAULT_RESOLUTION_DEG = 0.5    # Coverage raster resolution
+CURVE_STEP_KM = 50              # Range step of the Pd curves
+PNG_COMPRESS_TYPE = zlib.Z_RLE  # Run-length zlib strategy: filtered flat plot areas are zero runs
+
+OUTPUT_FILES = {
+    'coverage_map': 'OTHR_Coverage_Map.png',
+    'performance_curves': 'OTHR_Performance_Curves.png'
+}
+
+# ============================================================================
+# PNG ENCODING
+# ============================================================================
+
+def _png_chunk(tag, data):
+    return (struct.pack('>I', len(data)) + tag + data
+            + struct.pack('>I', zlib.crc32(data, zlib.crc32(tag))))
+
+def _write_png(path, rgba, dpi, scanlines):
+    """
+    Write the RGB channels of an opaque RGBA image as an 8-bit RGB PNG
+
+    Every row but the first uses the Up filter (difference from the row
+    above), which turns the flat plot areas into zero runs for the RLE
+    strategy; scanlines is a reusable (height, 1 + 3 * width) uint8 buffer
+    """
+    height, width = rgba.shape[:2]
+    pixels = scanlines[:, 1:].reshape(height, width, 3)
+    scanlines[0, 0] = 0
+    scanlines[1:, 0] = 2
+    # One channel at a time: numpy copies single strided bytes much faster
+    # than 3-byte pixels out of 4-byte ones
+    for channel in range(3):
+        pixels[0, :, channel] = rgba[0, :, channel]
+        np.subtract(rgba[1:, :, channel], rgba[:-1, :, channel], out=pixels[1:, :, channel])
+
+    compressor = zlib.compressobj(level=1, strategy=PNG_COMPRESS_TYPE)
+    data = compressor.compress(scanlines) + compressor.flush()
+    pixels_per_meter = int(round(dpi / 0.0254))
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        f.write(_png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)))
+        f.write(_png_chunk(b'pHYs', struct.pack('>IIB', pixels_per_meter, pixels_per_meter, 1)))
+        f.write(_png_chunk(b'IDAT', data))
+        f.write(_png_chunk(b'IEND', b''))
+
+# ============================================================================
+# FIGURE TEMPLATES
+# ============================================================================
+
+def _runs(values):
+    """
+    Start and stop indices of the runs of equal consecutive values
+    """
+    starts = np.flatnonzero(np.concatenate([[True], values[1:] != values[:-1]]))
+    return starts, np.append(starts[1:], len(values))
+
+class _FigureTemplate(ABC):
+    """
+    Agg figure whose static parts (axes, ticks, labels, colorbar, legends)
+    are drawn once; each save restores that background and draws only the
+    animated artists over it. Saved images are cropped to the figure's
+    tight bounding box, as savefig(bbox_inches='tight') does.
+    """
+
+    def __init__(self, figsize, dpi):
+        self.fig = Figure(figsize=figsize, dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.fig)
+        self.background = None
+        self.crop = None
+        self.scanlines = None
+
+    @abstractmethod
+    def animated_artists(self):
+        """
+        Artists drawn over the cached background on every save
+        """
+
+    def _draw_background(self):
+        """
+        Draw and cache the static figure and the crop of the saved image
+        """
+        canvas = self.canvas
+        canvas.draw()   # Skips the animated artists
+        self.background = canvas.copy_from_bbox(self.fig.bbox)
+
+        width, height = canvas.get_width_height()
+        tight = self.fig.get_tightbbox(canvas.get_renderer()).padded(rcParams['savefig.pad_inches'])
+        x0, y0, x1, y1 = tight.extents * self.fig.dpi
+        rows = slice(max(0, int(height - y1)), min(height, int(np.ceil(height - y0))))
+        cols = slice(max(0, int(x0)), min(width, int(np.ceil(x1))))
+        self.crop = (rows, cols)
+        self.scanlines = np.empty((rows.stop - rows.start, 1 + 3 * (cols.stop - cols.start)),
+                                  dtype=np.uint8)
+
+    def _draw_dynamic(self):
+        for artist in self.animated_artists():
+            artist.axes.draw_artist(artist)
+
+    def _save(self, save_path):
+        if self.background is None:
+            self._draw_background()
+        else:
+            self.canvas.restore_region(self.background)
+        self._draw_dynamic()
+
+        # The figure is opaque, so the alpha channel is dropped in encoding
+        _write_png(save_path, np.asarray(self.canvas.buffer_rgba())[self.crop],
+                   self.fig.dpi, self.scanlines)
+        return save_path
+
+class CoverageMapRenderer(_FigureTemplate):
+    """
+    Reusable coverage map figure; render() swaps in one scenario's raster,
+    sites and routes and saves it
+
+    The raster is blended straight into the Agg buffer through a cached
+    pixel -> grid cell lookup (nearest cell, as the cells are drawn by an
+    imshow with interpolation='nearest'), over the grid lines (contourf in
+    plot_coverage_map is drawn under them)
+    """
+
+    def __init__(self, resolution_deg=DEFAULT_RESOLUTION_DEG, dpi=DEFAULT_DPI,
+                 cache_dir=None):
+        super().__init__((14, 10), dpi)
+        self.resolution_deg = resolution_deg
+        self.cache_dir = cache_dir
+        ax = self.ax = self.fig.add_subplot()
+
+        self.lat_range = np.arange(50, 85, resolution_deg)
+        self.lon_range = np.arange(-180, -60, resolution_deg)
+        colors = to_rgba_array(COVERAGE_COLORS, alpha=COVERAGE_ALPHA)
+        # Blended value for every (level, channel, background value), so
+        # blending is one table lookup per pixel channel
+        alpha = int(round(COVERAGE_ALPHA * 255))
+        levels = np.round(colors[:, :3] * 255).astype(np.int64)
+        self.blend_table = ((np.arange(256) * (255 - alpha) + levels[:, :, np.newaxis] * alpha)
+                            // 255).astype(np.uint8).ravel()
+        self.raster = None
+
+        scale = ScalarMappable(norm=BoundaryNorm(COVERAGE_LEVELS, len(COVERAGE_COLORS)),
+                               cmap=ListedColormap(colors))
+        cbar = self.fig.colorbar(scale, ax=ax, ticks=[0, 1, 2, 3])
+        cbar.set_label('Number of Sites Covering', rotation=270, labelpad=20)
+        cbar.set_ticklabels(['0', '1', '2', '3'])
+
+        self.site_markers, = ax.plot([], [], 'r*', markersize=20, linestyle='none',
+                                     animated=True)
+        self.labels = []
+        self.label_key = None
+
+        ax.set_xlabel('Longitude (degrees)')
+        ax.set_ylabel('Latitude (degrees)')
+        ax.set_title(COVERAGE_MAP_TITLE, fontsize=14, weight='bold')
+        ax.grid(True, alpha=0.3)
+        ax.set_xlim(-180, -60)
+        ax.set_ylim(50, 85)
+        self.fig.tight_layout()
+
+    def animated_artists(self):
+        return self.labels + [self.site_markers]
+
+    def _draw_background(self):
+        super()._draw_background()
+        self._prepare_raster()
+
+    def _prepare_raster(self):
+        """
+        Buffer region covered by grid cells and the blend table offsets of
+        its distinct pixel rows
+
+        A composited pixel row depends only on its cell row and its
+        background row, and the plot area has few distinct background rows
+        (grid lines), so each render blends one row per distinct (cell row,
+        background row) pair and copies it to every pixel row of the pair
+        """
+        width, height = self.canvas.get_width_height()
+        res = self.resolution_deg
+        x0, y0, x1, y1 = self.ax.bbox.extents
+        to_data = self.ax.transData.inverted()
+
+        # Cells are centered on their grid points, as contourf samples them
+        def cells(pixels, display, origin, count, axis):
+            values = to_data.transform(display)[:, axis]
+            index = np.floor((values - (origin - res / 2)) / res).astype(np.int64)
+            valid = (index >= 0) & (index < count)
+            return pixels[valid], index[valid]
+
+        cols = np.arange(int(np.ceil(x0 - 0.5)), int(np.floor(x1 - 0.5)) + 1)
+        cols, cell_cols = cells(cols, np.column_stack([cols + 0.5, np.full(len(cols), y0)]),
+                                self.lon_range[0], len(self.lon_range), 0)
+        rows = np.arange(int(np.ceil(height - y1 - 0.5)), int(np.floor(height - y0 - 0.5)) + 1)
+        rows, cell_rows = cells(rows, np.column_stack([np.full(len(rows), x0), height - rows - 0.5]),
+                                self.lat_range[0], len(self.lat_range), 1)
+
+        region = (slice(rows[0], rows[-1] + 1), slice(cols[0], cols[-1] + 1))
+        background = np.asarray(self.canvas.buffer_rgba())[region].reshape(len(rows), -1)
+        distinct = {}
+        background_index = np.array([distinct.setdefault(row.tobytes(), len(distinct))
+                                     for row in background])
+        background_rows = background[np.unique(background_index, return_index=True)[1]]
+        pairs, row_pair = np.unique(cell_rows * len(background_rows) + background_index,
+                                    return_inverse=True)
+        pair_background = background_rows[pairs % len(background_rows)].reshape(
+            len(pairs), len(cols), 4)
+
+        self.raster = {
+            'region': region,
+            'cell_cols': cell_cols,
+            'pair_cell_rows': pairs // len(background_rows),
+            # Pixel rows of each pair as consecutive runs
+            'runs': [(start, stop, row_pair[start])
+                     for start, stop in zip(*_runs(row_pair))],
+            # Blend table offset of each pair row's background channel values
+            'offsets': pair_background[:, :, :3] + np.arange(0, 3 * 256, 256, dtype=np.uint16),
+            'rows': pair_background.copy()
+        }
+
+    def _draw_dynamic(self):
+        raster = self.raster
+        cells = self.color_index.take(raster['pair_cell_rows'], axis=0).take(
+            raster['cell_cols'], axis=1)
+        rows = raster['rows']
+        rows[:, :, :3] = self.blend_table[raster['offsets']
+                                          + (cells * np.uint16(3 * 256))[:, :, np.newaxis]]
+        # Whole RGBA pixels are copied as 32-bit words
+        rows = rows.view(np.uint32)[:, :, 0]
+        region = np.asarray(self.canvas.buffer_rgba()).view(np.uint32)[:, :, 0][raster['region']]
+        for start, stop, pair in raster['runs']:
+            region[start:stop] = rows[pair]
+        super()._draw_dynamic()
+
+    def _update_labels(self, params):
+        """
+        Site names and routes are rebuilt only when they change
+        """
+        key = (tuple((s['name'], s['lat'], s['lon']) for s in params.sites),
+               tuple((r['name'], tuple(r['waypoints'])) for r in params.commercial_routes))
+        if key == self.label_key:
+            return
+        for artist in self.labels:
+            artist.remove()
+
+        ax = self.ax
+        self.labels = []
+        for route in params.commercial_routes:
+            lats, lons = np.array(route['waypoints']).T
+            self.labels += ax.plot(lons, lats, 'g--', linewidth=1, alpha=0.5, animated=True)
+            self.labels.append(ax.text(lons[0], lats[0], route['name'],
+                                       fontsize=7, color='green', animated=True))
+        self.labels += [
+            ax.text(site['lon'], site['lat'] + 1, site['name'],
+                    ha='center', fontsize=8, weight='bold', animated=True)
+            for site in params.sites
+        ]
+        self.label_key = key
+
+    def render(self, params, save_path):
+        """
+        Draw one scenario into the template and save it
+        """
+        _, _, coverage_grid = calculate_coverage_map(params, self.resolution_deg,
+                                                     cache_dir=self.cache_dir)
+        self.color_index = np.digitize(coverage_grid, COVERAGE_LEVELS[1:-1]).astype(np.uint16)
+        self.site_markers.set_data([s['lon'] for s in params.sites],
+                                   [s['lat'] for s in params.sites])
+        self._update_labels(params)
+        return self._save(save_path)
+
+class PerformanceCurveRenderer(_FigureTemplate):
+    """
+    Reusable detection performance figure; render() replaces the Pd curves
+
+    range_limits fixes the range axis for a whole batch, so the background
+    is drawn once; otherwise the axis follows each scenario's range limits
+    and the background is redrawn when they change
+    """
+
+    def __init__(self, target_types, dpi=DEFAULT_DPI, range_limits=None):
+        super().__init__((14, 6), dpi)
+        self.target_types = list(target_types)
+        self.range_limits = range_limits
+        ax1, ax2 = self.axes = self.fig.subplots(1, 2)
+
+        self.target_lines = [ax1.plot([], [], label=target_type, linewidth=2, animated=True)[0]
+                             for target_type in self.target_types]
+        ax1.axhline(y=0.5, color='r', linestyle='--', alpha=0.5, label='Pd=0.5 threshold')
+        ax1.set_xlabel('Range (km)', fontsize=12)
+        ax1.set_ylabel('Probability of Detection (Pd)', fontsize=12)
+        ax1.set_title('Detection Performance vs Range\n(Clear Conditions)', fontsize=12, weight='bold')
+        ax1.legend()
+        ax1.grid(True, alpha=0.3)
+        ax1.set_ylim(0, 1.05)
+
+        self.clear_line, = ax2.plot([], [], label='Clear Conditions', linewidth=2, color='blue',
+                                    animated=True)
+        self.aurora_line, = ax2.plot([], [], label='Auroral Conditions', linewidth=2,
+                                     color='red', animated=True)
+        self.degradation = ax2.fill_between([0, 1], [0, 0], [0, 0], alpha=0.2, color='yellow',
+                                            label='Performance Degradation', animated=True)
+        ax2.axhline(y=0.5, color='gray', linestyle='--', alpha=0.5)
+        ax2.set_xlabel('Range (km)', fontsize=12)
+        ax2.set_ylabel('Probability of Detection (Pd)', fontsize=12)
+        ax2.set_title(f'Arctic Performance Impact\n({CURVE_TARGET})', fontsize=12, weight='bold')
+        ax2.legend()
+        ax2.grid(True, alpha=0.3)
+        ax2.set_ylim(0, 1.05)
+        if range_limits is not None:
+            self._set_range_axis(range_limits)
+        self.fig.tight_layout()
+
+    def animated_artists(self):
+        return self.target_lines + [self.degradation, self.clear_line, self.aurora_line]
+
+    def _set_range_axis(self, limits):
+        for ax in self.axes:
+            ax.set_xlim(*limits)
+        self.background = None
+
+    def render(self, params, save_path):
+        """
+        Draw one scenario's curves into the template and save it
+        """
+        ranges = np.arange(params.min_range_km, params.max_range_km, CURVE_STEP_KM)
+        if self.range_limits is None and self.axes[0].get_xlim() != (ranges[0], ranges[-1]):
+            self._set_range_axis((ranges[0], ranges[-1]))
+
+        for line, target_type in zip(self.target_lines, self.target_types):
+            line.set_data(ranges, calculate_detection_probability(params, target_type,
+                                                                  ranges, 'clear'))
+
+        pds_clear = calculate_detection_probability(params, CURVE_TARGET, ranges, 'clear')
+        pds_aurora = calculate_detection_probability(params, CURVE_TARGET, ranges, 'auroral')
+        self.clear_line.set_data(ranges, pds_clear)
+        self.aurora_line.set_data(ranges, pds_aurora)
+        # Band between the curves: clear curve out, auroral curve back
+        self.degradation.set_verts([np.column_stack([
+            np.concatenate([ranges, ranges[::-1]]),
+            np.concatenate([pds_clear, pds_aurora[::-1]])
+        ])])
+        return self._save(save_path)
+
+# ============================================================================
+# BATCH RENDERING
+# ============================================================================
+
+_renderers = {}     # Figure templates of this process, by settings
+
+def _renderer(kind, params, resolution_deg, dpi, cache_dir, range_limits):
+    """
+    Per-process template for one kind of plot, built on first use
+    """
+    if kind == 'coverage_map':
+        key = (kind, resolution_deg, dpi, cache_dir)
+        if key not in _renderers:
+            _renderers[key] = CoverageMapRenderer(resolution_deg, dpi, cache_dir)
+    elif kind == 'performance_curves':
+        key = (kind, tuple(params.target_profiles), dpi, range_limits)
+        if key not in _renderers:
+            _renderers[key] = PerformanceCurveRenderer(params.target_profiles, dpi, range_limits)
+    else:
+        raise ValueError(f"Unknown plot kind: {kind}")
+    return _renderers[key]
+
+def render_scenario(params, output_dir, name, kinds=tuple(OUTPUT_FILES),
+                    resolution_deg=DEFAULT_RESOLUTION_DEG, dpi=DEFAULT_DPI, cache_dir=None,
+                    range_limits=None):
+    """
+    Render one parameter set with this process's templates
+    Returns list of paths written (<output_dir>/<name>_<file>)
+    """
+    return [
+        _renderer(kind, params, resolution_deg, dpi, cache_dir, range_limits).render(
+            params, os.path.join(output_dir, f'{name}_{OUTPUT_FILES[kind]}'))
+        for kind in kinds
+    ]
+
+def _render_chunk(base_params, chunk, output_dir, kinds, resolution_deg, dpi, cache_dir,
+                  range_limits):
+    """
+    Worker task: render a list of (name, overrides) pairs
+    """
+    return [path
+            for name, overrides in chunk
+            for path in render_scenario(apply_parameter_overrides(base_params, overrides),
+                                        output_dir, name, kinds, resolution_deg, dpi,
+                                        cache_dir, range_limits)]
+
+def render_batch(scenarios, output_dir=DEFAULT_OUTPUT_DIR, base_params=None,
+                 kinds=tuple(OUTPUT_FILES), workers=1, chunk_size=25,
+                 resolution_deg=DEFAULT_RESOLUTION_DEG, dpi=DEFAULT_DPI, cache_dir=None):
+    """
+    Render every scenario (override dicts, or a {name: overrides} dict)
+
+    Scenarios are split into chunks over a process pool (workers=1 renders
+    in-process); unnamed scenarios are numbered scenario_0000, ...
+    The performance curves of a batch share one range axis.
+    Returns list of paths written
+    """
+    base_params = base_params or OTHRParameters()
+    if isinstance(scenarios, dict):
+        scenarios = list(scenarios.items())
+    else:
+        scenarios = [(f'scenario_{i:04d}', overrides) for i, overrides in enumerate(scenarios)]
+    os.makedirs(output_dir, exist_ok=True)
+
+    range_limits = None
+    if 'performance_curves' in kinds:
+        scenario_params = [apply_parameter_overrides(base_params, overrides)
+                           for _, overrides in scenarios]
+        range_limits = (float(min(p.min_range_km for p in scenario_params)),
+                        float(max(p.max_range_km for p in scenario_params)))
+
+    render = functools.partial(_render_chunk, base_params, output_dir=output_dir,
+                               kinds=tuple(kinds), resolution_deg=resolution_deg,
+                               dpi=dpi, cache_dir=cache_dir, range_limits=range_limits)
+    return _map_chunks(render, scenarios, workers, chunk_size)
+
+def _map_chunks(task, scenarios, workers, chunk_size):
+    """
+    Run task over chunks of (name, overrides) pairs, in-process for
+    workers=1, and concatenate the returned paths
+    """
+    chunks = [scenarios[i:i + chunk_size] for i in range(0, len(scenarios), chunk_size)]
+    if workers == 1:
+        results = [task(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(task, chunks))
+    return [path for paths in results for path in paths]
+
+# ============================================================================
+# LOOP BASELINE
+# ============================================================================
+
+def _plot_chunk(base_params, chunk, output_dir):
+    """
+    Worker task: plot_coverage_map and plot_performance_curves for each
+    (name, overrides) pair, a new figure per plot
+    """
+    import contextlib
+    import matplotlib.pyplot as plt
+    from OTHR_visualization import plot_coverage_map, plot_performance_curves
+
+    paths = []
+    # The plot functions report every saved path on stdout
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for name, overrides in chunk:
+            params = apply_parameter_overrides(base_params, overrides)
+            for kind, plot in (('coverage_map', plot_coverage_map),
+                               ('performance_curves', plot_performance_curves)):
+                path = os.path.join(output_dir, f'{name}_loop_{OUTPUT_FILES[kind]}')
+                plt.close(plot(params, save_path=path))
+                paths.append(path)
+    return paths
+
+def plot_loop_batch(scenarios, output_dir=DEFAULT_OUTPUT_DIR, base_params=None, workers=1,
+                    chunk_size=25):
+    """
+    The baseline render_batch replaces: the plot functions called in a loop
+    over the same scenarios, split over the same number of processes
+    Returns list of paths written (<output_dir>/<name>_loop_<file>)
+    """
+    base_params = base_params or OTHRParameters()
+    scenarios = [(f'scenario_{i:04d}', overrides) for i, overrides in enumerate(scenarios)]
+    os.makedirs(output_dir, exist_ok=True)
+    plot = functools.partial(_plot_chunk, base_params, output_dir=output_dir)
+    return _map_chunks(plot, scenarios, workers, chunk_size)
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Render OTHR plots for a batch of scenarios")
+    parser.add_argument('--scenarios', type=int, default=100,
+                        help="Number of max_range_km scenarios to render")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--dpi', type=int, default=DEFAULT_DPI)
+    parser.add_argument('--output-dir', default=os.path.join(DEFAULT_OUTPUT_DIR, 'OTHR_Renders'))
+    parser.add_argument('--compare', action='store_true',
+                        help="Also time the plot functions in a loop (one process, and "
+                             "--workers processes) over the same scenarios at their 300 dpi")
+    args = parser.parse_args()
+
+    scenarios = [{'max_range_km': float(r)}
+                 for r in np.linspace(2500, 3500, args.scenarios)]
+
+    def timed(label, batch, workers, **kwargs):
+        start = time.perf_counter()
+        paths = batch(scenarios, args.output_dir, workers=workers, **kwargs)
+        elapsed = time.perf_counter() - start
+        print(f"{label:34s} {len(paths)} images in {elapsed:7.1f} s "
+              f"({elapsed / len(scenarios) * 1000:.0f} ms per scenario)")
+        return elapsed
+
+    print(f"{len(scenarios)} scenarios -> {args.output_dir}")
+    rendered = timed(f"render_batch, {args.workers} worker(s)", render_batch, args.workers,
+                     dpi=args.dpi)
+    if args.compare:
+        loop_counts = sorted({1, args.workers})
+        for workers in loop_counts:
+            looped = timed(f"plot function loop, {workers} worker(s)", plot_loop_batch, workers)
+            print(f"{'':34s} render_batch speedup {looped / rendered:.1f}x")
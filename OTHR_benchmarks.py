@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Arctic OTHR Benchmark Suite
+Times the model's hot paths and tracks regressions across runs
+
+UNCLASSIFIED // PUBLIC RELEASE
+Version: 1.0 Framework
+
+PURPOSE: Catch "harmless" model edits that make batch runs slower. Each run
+         times the coverage, detection-range, geometry and plotting paths,
+         compares them with the median of recent runs in a JSON history
+         file, and fails (exit code 1) when any benchmark is slower by more
+         than the configured factor. Failing runs are only recorded with
+         --accept, so a regression cannot become its own baseline.
+
+USAGE:
+    python3 OTHR_benchmarks.py                        # run, compare, record
+    python3 OTHR_benchmarks.py --max-slowdown 1.3     # stricter gate
+    python3 OTHR_benchmarks.py --filter coverage      # subset by name
+    python3 OTHR_benchmarks.py --accept               # record an intended slowdown
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from OTHR_coverage_cache import DEFAULT_CACHE_DIR
+from OTHR_coverage_model import (OTHRParameters, bearing_from_to, calculate_coverage_map,
+                                 detection_range_table, estimate_detection_range,
+                                 haversine_distance)
+
+# ============================================================================
+# BENCHMARK CONFIGURATION
+# ============================================================================
+
+# Timings are machine-specific, so the history lives with the local cache
+DEFAULT_HISTORY_PATH = os.path.join(DEFAULT_CACHE_DIR, 'OTHR_benchmark_history.json')
+DEFAULT_MAX_SLOWDOWN = 1.5      # Fail when median time grows by more than this factor
+DEFAULT_MIN_TIME_SEC = 0.2      # Minimum total measuring time per benchmark
+DEFAULT_BASELINE_RUNS = 5       # Baseline is the per-benchmark median of this many recent runs
+GEOMETRY_ARRAY_SIZE = 1_000_000
+IMPORT_TARGET_SEC = 0.1         # Cold import of the compute core (excluding interpreter startup)
+
+# ============================================================================
+# BENCHMARK FIXTURES
+# ============================================================================
+
+def ten_site_params():
+    """
+    Baseline parameters with 10 notional sites spread across the grid
+    """
+    params = OTHRParameters()
+    lons = np.linspace(-170, -70, 10)
+    params.sites = [
+        {
+            'name': f'Benchmark Site {k + 1}',
+            'lat': 62.0 + 3.0 * (k % 3),
+            'lon': float(lon),
+            'azimuth_center': float((30 * k) % 360),
+            'coverage_angle': 120
+        }
+        for k, lon in enumerate(lons)
+    ]
+    return params
+
+# Exits 3 if importing the compute core pulls in matplotlib; prints the import time
+_IMPORT_CHECK = ("import sys, time; start = time.perf_counter(); import OTHR_coverage_model; "
+                 "elapsed = time.perf_counter() - start; print(elapsed); "
+                 "sys.exit(3 if 'matplotlib' in sys.modules else 0)")
+
+def _import_compute_core():
+    """
+    Cold import of the compute core in a fresh interpreter, so matplotlib
+    creeping back into the core shows up
+    Returns the time of `import OTHR_coverage_model` alone, measured in the
+    child (interpreter startup excluded), in seconds
+    """
+    result = subprocess.run([sys.executable, '-c', _IMPORT_CHECK], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    if result.returncode:
+        raise RuntimeError("Importing OTHR_coverage_model loaded matplotlib"
+                           if result.returncode == 3 else result.stderr)
+    return float(result.stdout)
+
+def check_compute_core_import(target_sec=IMPORT_TARGET_SEC, repeats=3):
+    """
+    Check that the compute core imports without matplotlib and within
+    target_sec (best of repeats cold imports)
+    Returns (passed, best import time in seconds)
+    """
+    best = min(_import_compute_core() for _ in range(repeats))
+    return best <= target_sec, best
+
+def build_benchmarks():
+    """
+    Returns list of (name, callable) pairs
+    """
+    rng = np.random.default_rng(0)
+    lat1 = rng.uniform(50, 85, GEOMETRY_ARRAY_SIZE)
+    lon1 = rng.uniform(-180, -60, GEOMETRY_ARRAY_SIZE)
+    lat2 = rng.uniform(50, 85, GEOMETRY_ARRAY_SIZE)
+    lon2 = rng.uniform(-180, -60, GEOMETRY_ARRAY_SIZE)
+
+    params_3 = OTHRParameters()
+    params_10 = ten_site_params()
+
+    benchmarks = [
+        ('cold_start_compute_core', _import_compute_core),
+        ('haversine_distance_1e6', lambda: haversine_distance(lat1, lon1, lat2, lon2)),
+        ('bearing_from_to_1e6', lambda: bearing_from_to(lat1, lon1, lat2, lon2)),
+    ]
+
+    for num_sites, params in [(3, params_3), (10, params_10)]:
+        for resolution in [2.0, 1.0, 0.25, 0.05]:
+            benchmarks.append((
+                f'coverage_map_{resolution:g}deg_{num_sites}sites',
+                lambda p=params, r=resolution: calculate_coverage_map(p, r)
+            ))
+
+    def detection_ranges_scalar():
+        for target_type in params_3.target_profiles:
+            for conditions in ['clear', 'auroral']:
+                estimate_detection_range(params_3, target_type, 0.5, conditions)
+
+    benchmarks += [
+        ('detection_range_all_targets', detection_ranges_scalar),
+        ('detection_range_table_100_thresholds', lambda: detection_range_table(
+            params_3, pd_thresholds=np.linspace(0.05, 0.95, 100))),
+        ('plot_coverage_map', lambda: _render('plot_coverage_map', params_3)),
+        ('plot_performance_curves', lambda: _render('plot_performance_curves', params_3)),
+    ]
+    return benchmarks
+
+def _render(plot_name, params):
+    """
+    Build a figure with the named plot function and draw it with Agg
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import OTHR_visualization
+
+    fig = getattr(OTHR_visualization, plot_name)(params)
+    fig.canvas.draw()
+    plt.close(fig)
+
+# ============================================================================
+# TIMING
+# ============================================================================
+
+def time_benchmark(func, min_time_sec=DEFAULT_MIN_TIME_SEC, min_repeats=3, max_repeats=50):
+    """
+    Run func repeatedly (after one warm-up call) until min_time_sec has
+    elapsed and at least min_repeats samples exist
+    Returns dict with median/min/max seconds and the repeat count
+    """
+    func()
+
+    samples = []
+    start = time.perf_counter()
+    while len(samples) < min_repeats or \
+            (time.perf_counter() - start < min_time_sec and len(samples) < max_repeats):
+        t0 = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - t0)
+
+    return {
+        'median_sec': float(np.median(samples)),
+        'min_sec': float(np.min(samples)),
+        'max_sec': float(np.max(samples)),
+        'repeats': len(samples)
+    }
+
+# ============================================================================
+# HISTORY AND REGRESSION CHECK
+# ============================================================================
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                              capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+def save_history(path, history):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(history, f, indent=2)
+    os.replace(tmp_path, path)
+
+def history_baseline(history, num_runs=DEFAULT_BASELINE_RUNS):
+    """
+    Baseline run record whose per-benchmark medians are the median over the
+    last num_runs runs in the history that include each benchmark
+    """
+    recent = history[-num_runs:]
+    names = {name for run in recent for name in run['results']}
+    return {
+        'timestamp': f"{recent[0]['timestamp']} .. {recent[-1]['timestamp']}",
+        'git_revision': f"median of {len(recent)} run(s)",
+        'results': {
+            name: {'median_sec': float(np.median([run['results'][name]['median_sec']
+                                                  for run in recent if name in run['results']]))}
+            for name in names
+        }
+    }
+
+def compare_runs(current, baseline, max_slowdown):
+    """
+    Compare benchmark medians against a baseline run
+    Returns list of (name, baseline_sec, current_sec, ratio, regressed)
+    """
+    rows = []
+    for name, result in current['results'].items():
+        if name not in baseline['results']:
+            continue
+        base = baseline['results'][name]['median_sec']
+        ratio = result['median_sec'] / base if base > 0 else float('inf')
+        rows.append((name, base, result['median_sec'], ratio, ratio > max_slowdown))
+    return rows
+
+def run_benchmarks(name_filter=None, min_time_sec=DEFAULT_MIN_TIME_SEC, progress=True):
+    """
+    Time every benchmark whose name contains name_filter
+    Returns run record (metadata plus per-benchmark results)
+    """
+    results = {}
+    for name, func in build_benchmarks():
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = time_benchmark(func, min_time_sec)
+        if progress:
+            print(f"  {name:45s} {results[name]['median_sec'] * 1000:10.2f} ms "
+                  f"(n={results[name]['repeats']})")
+
+    return {
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'git_revision': _git_revision(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'results': results
+    }
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the OTHR benchmark suite")
+    parser.add_argument('--history', default=DEFAULT_HISTORY_PATH,
+                        help="JSON history file")
+    parser.add_argument('--max-slowdown', type=float, default=DEFAULT_MAX_SLOWDOWN,
+                        help="Fail when a median exceeds baseline x this factor")
+    parser.add_argument('--baseline', type=int, default=None,
+                        help="Pin the baseline to one history index "
+                             f"(default: median of the last {DEFAULT_BASELINE_RUNS} runs)")
+    parser.add_argument('--baseline-runs', type=int, default=DEFAULT_BASELINE_RUNS,
+                        help="Number of recent runs in the median baseline")
+    parser.add_argument('--filter', default=None, help="Only run benchmarks containing this text")
+    parser.add_argument('--min-time', type=float, default=DEFAULT_MIN_TIME_SEC,
+                        help="Minimum measuring time per benchmark (seconds)")
+    parser.add_argument('--no-save', action='store_true', help="Do not append to history")
+    parser.add_argument('--accept', action='store_true',
+                        help="Append the run to history even if it has regressions")
+    args = parser.parse_args(argv)
+
+    passed, import_sec = check_compute_core_import()
+    print(f"Compute core import: {import_sec * 1000:.1f} ms without matplotlib "
+          f"(target {IMPORT_TARGET_SEC * 1000:.0f} ms){'' if passed else '  TOO SLOW'}")
+
+    print("Running OTHR benchmarks...")
+    run = run_benchmarks(args.filter, args.min_time)
+
+    history = load_history(args.history)
+    regressions = []
+    if history:
+        baseline = (history[args.baseline] if args.baseline is not None
+                    else history_baseline(history, args.baseline_runs))
+        print(f"\nComparison with run {baseline['timestamp']} "
+              f"({baseline.get('git_revision') or 'unknown revision'}):")
+        for name, base, current, ratio, regressed in compare_runs(run, baseline, args.max_slowdown):
+            flag = '  REGRESSION' if regressed else ''
+            print(f"  {name:45s} {base * 1000:10.2f} -> {current * 1000:10.2f} ms "
+                  f"x{ratio:5.2f}{flag}")
+            if regressed:
+                regressions.append(name)
+
+    if not args.no_save:
+        if regressions and not args.accept:
+            print(f"\nRun not recorded in {args.history} (use --accept to record it)")
+        else:
+            history.append(run)
+            save_history(args.history, history)
+            print(f"\nResults appended to {args.history}")
+
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) slower than x{args.max_slowdown}: "
+              f"{', '.join(regressions)}")
+        return 1
+    return 0 if passed else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
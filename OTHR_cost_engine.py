@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Arctic OTHR Cost Model Engine
+Executable version of OTHR_Cost_Model.csv with Monte Carlo cost uncertainty
+
+UNCLASSIFIED // PUBLIC RELEASE
+Version: 1.0 Framework
+
+PURPOSE: Compile the cost CSV once into a computational graph
+         (line item -> qty x unit cost x multipliers -> category subtotals
+         -> reserves -> total) and evaluate it for any Number of Sites and
+         Arctic Multiplier. Uncertainty draws are reduced once to per-draw
+         sums of site-scaled and fixed costs per category, so re-evaluating
+         10^6 draws for new slider values is a few array operations.
+
+MODEL ASSUMPTIONS:
+- "per site" quantities scale with Number of Sites; other quantities are fixed
+- The Arctic Multiplier scales unit costs in SITE PREPARATION and
+  INFRASTRUCTURE relative to the CSV baseline multiplier
+- Reserve rows are percentages of a base (HW/SW, labor, total), calibrated so
+  the baseline parameters reproduce the listed reserve amounts
+"""
+
+import csv
+
+import numpy as np
+
+# ============================================================================
+# MODEL CONFIGURATION
+# ============================================================================
+
+DEFAULT_COST_CSV = 'OTHR_Cost_Model.csv'
+
+ACQUISITION_CATEGORIES = [
+    'DEVELOPMENT COSTS', 'SITE PREPARATION', 'INFRASTRUCTURE', 'RADAR HARDWARE',
+    'SOFTWARE & SYSTEMS', 'OPERATIONS CONTROL CENTER', 'SUPPORTING SYSTEMS',
+    'INTEGRATION & TEST'
+]
+RESERVE_CATEGORY = 'PROGRAM RESERVES'
+OS_CATEGORY = 'OPERATIONS & SUSTAINMENT'
+ARCTIC_SCALED_CATEGORIES = ['SITE PREPARATION', 'INFRASTRUCTURE']
+
+# Categories forming the base of each reserve type (keyed by the Unit column)
+RESERVE_BASES = {
+    '% of HW/SW': ['RADAR HARDWARE', 'SOFTWARE & SYSTEMS'],
+    '% of labor': ['DEVELOPMENT COSTS', 'SOFTWARE & SYSTEMS', 'INTEGRATION & TEST'],
+    '% of total': ACQUISITION_CATEGORIES
+}
+
+# Triangular unit-cost uncertainty (low, mode, high multipliers) by category
+DEFAULT_UNCERTAINTY = {
+    'DEVELOPMENT COSTS': (0.9, 1.0, 1.3),
+    'SITE PREPARATION': (0.9, 1.0, 1.6),
+    'INFRASTRUCTURE': (0.9, 1.0, 1.5),
+    'RADAR HARDWARE': (0.9, 1.0, 1.3),
+    'SOFTWARE & SYSTEMS': (0.9, 1.0, 1.5),
+    'OPERATIONS CONTROL CENTER': (0.9, 1.0, 1.25),
+    'SUPPORTING SYSTEMS': (0.9, 1.0, 1.25),
+    'INTEGRATION & TEST': (0.9, 1.0, 1.4)
+}
+
+OS_YEARS = 20
+DRAW_CHUNK = 100_000    # Monte Carlo draws generated per chunk
+
+# ============================================================================
+# CSV COMPILATION
+# ============================================================================
+
+def _number(text):
+    try:
+        return float(text.replace(',', '').replace('$', ''))
+    except (AttributeError, ValueError):
+        return None
+
+class CostModel:
+    """
+    Compiled cost graph for OTHR_Cost_Model.csv
+
+    items:     list of line-item dicts (category, item, unit, qty, unit_cost)
+    reserves:  list of reserve dicts (item, unit, fraction, listed amount)
+    listed_subtotals: category subtotals as written in the CSV
+    """
+
+    def __init__(self, path=DEFAULT_COST_CSV):
+        self.path = path
+        self.items = []
+        self.reserves = []
+        self.os_items = []
+        self.listed_subtotals = {}
+        self.baseline_sites = 3
+        self.baseline_arctic_multiplier = 2.5
+        self._parse(path)
+        self._compile()
+
+    def _parse(self, path):
+        with open(path, newline='') as f:
+            rows = [row for row in csv.reader(line for line in f
+                                              if not line.lstrip().startswith('#'))]
+
+        category = None
+        for row in rows[1:]:
+            row = (row + [''] * 8)[:8]
+            cat, item, unit, qty, unit_cost, subtotal = [c.strip() for c in row[:6]]
+
+            if cat:
+                category = cat
+                continue
+            if category == 'PARAMETERS':
+                if item == 'Number of Sites':
+                    self.baseline_sites = int(_number(qty))
+                elif item.startswith('Arctic Multiplier'):
+                    self.baseline_arctic_multiplier = _number(qty)
+            elif unit_cost == 'Subtotal:':
+                self.listed_subtotals[category] = _number(subtotal)
+            elif category == RESERVE_CATEGORY and qty.endswith('%'):
+                self.reserves.append({
+                    'item': item, 'unit': unit,
+                    'fraction': _number(qty.rstrip('%')) / 100,
+                    'listed_amount': _number(unit_cost)
+                })
+            elif category in ACQUISITION_CATEGORIES and _number(qty) is not None \
+                    and _number(unit_cost) is not None:
+                self.items.append({
+                    'category': category, 'item': item, 'unit': unit,
+                    'qty': _number(qty), 'unit_cost': _number(unit_cost)
+                })
+            elif category == OS_CATEGORY and _number(qty) is not None \
+                    and not item.startswith('TOTAL'):
+                self.os_items.append({'item': item, 'annual_cost': _number(subtotal)})
+
+    def _compile(self):
+        """
+        Build the item -> (category, site-scaled/fixed) group matrix
+        """
+        self.categories = list(ACQUISITION_CATEGORIES)
+        num_categories = len(self.categories)
+
+        # Group g = 2 * category + (1 if per-site else 0)
+        self.unit_costs = np.array([item['unit_cost'] for item in self.items])
+        per_site = np.array([item['unit'] == 'per site' for item in self.items])
+        fixed_qty = np.where(per_site, 1.0, [item['qty'] for item in self.items])
+        category_index = np.array([self.categories.index(item['category'])
+                                   for item in self.items])
+
+        self.group_matrix = np.zeros((len(self.items), 2 * num_categories))
+        self.group_matrix[np.arange(len(self.items)),
+                          2 * category_index + per_site] = fixed_qty
+
+        self.arctic_scaled = np.array([c in ARCTIC_SCALED_CATEGORIES
+                                       for c in self.categories])
+        self.uncertainty = np.array([DEFAULT_UNCERTAINTY.get(item['category'], (1, 1, 1))
+                                     for item in self.items])
+
+        self.reserve_base_masks = np.array([
+            [c in RESERVE_BASES[reserve['unit']] for c in self.categories]
+            for reserve in self.reserves
+        ])
+        self.reserve_fractions = np.array([r['fraction'] for r in self.reserves])
+
+        # Calibrate reserves so the baseline reproduces the listed amounts
+        baseline = self._category_subtotals(self.unit_costs @ self.group_matrix,
+                                            self.baseline_sites,
+                                            self.baseline_arctic_multiplier)
+        baseline_bases = self.reserve_base_masks @ baseline
+        self.reserve_calibration = np.array([r['listed_amount'] for r in self.reserves]) / \
+            (self.reserve_fractions * baseline_bases)
+
+    def set_uncertainty(self, item_name, low, mode, high):
+        """
+        Override the triangular unit-cost multipliers of one line item
+        """
+        for k, item in enumerate(self.items):
+            if item['item'] == item_name:
+                self.uncertainty[k] = (low, mode, high)
+                return
+        raise KeyError(f"Unknown cost item: {item_name}")
+
+    # ------------------------------------------------------------------------
+    # Evaluation
+    # ------------------------------------------------------------------------
+
+    def _category_subtotals(self, group_sums, num_sites, arctic_multiplier):
+        """
+        Category subtotals from group sums (last axis = groups)
+        """
+        fixed = group_sums[..., 0::2]
+        site_scaled = group_sums[..., 1::2]
+        arctic_scale = np.where(self.arctic_scaled,
+                                arctic_multiplier / self.baseline_arctic_multiplier, 1.0)
+        return (fixed + num_sites * site_scaled) * arctic_scale
+
+    def _totals(self, subtotals):
+        """
+        Reserves and total acquisition cost from category subtotals
+        """
+        bases = subtotals @ self.reserve_base_masks.T
+        reserves = bases * self.reserve_fractions * self.reserve_calibration
+        return reserves, subtotals.sum(axis=-1) + reserves.sum(axis=-1)
+
+    def evaluate(self, num_sites=None, arctic_multiplier=None):
+        """
+        Deterministic cost roll-up ($M) for the given parameters
+        Returns dict with category subtotals, reserves and totals
+        """
+        num_sites = self.baseline_sites if num_sites is None else num_sites
+        arctic_multiplier = arctic_multiplier or self.baseline_arctic_multiplier
+
+        subtotals = self._category_subtotals(self.unit_costs @ self.group_matrix,
+                                             num_sites, arctic_multiplier)
+        reserves, total = self._totals(subtotals)
+        annual_os = sum(item['annual_cost'] for item in self.os_items)
+
+        return {
+            'category_subtotals': dict(zip(self.categories, subtotals.tolist())),
+            'reserves': {r['item']: float(v) for r, v in zip(self.reserves, reserves)},
+            'total_acquisition': float(total),
+            'annual_os': float(annual_os),
+            'lifecycle_cost': float(total + OS_YEARS * annual_os)
+        }
+
+    def sample(self, num_draws=1_000_000, seed=None):
+        """
+        Draw per-line-item unit-cost uncertainty and reduce it to per-draw
+        group sums, which stay valid for any num_sites/arctic_multiplier
+        Returns CostSamples
+        """
+        rng = np.random.default_rng(seed)
+        low, mode, high = (self.unit_costs * self.uncertainty.T)
+        group_sums = np.empty((num_draws, self.group_matrix.shape[1]), dtype=np.float32)
+
+        for start in range(0, num_draws, DRAW_CHUNK):
+            n = min(DRAW_CHUNK, num_draws - start)
+            draws = rng.triangular(low, mode, high, size=(n, len(self.items)))
+            group_sums[start:start + n] = draws @ self.group_matrix
+
+        return CostSamples(self, group_sums)
+
+class CostSamples:
+    """
+    Monte Carlo draws reduced to group sums; evaluate() is cheap enough to
+    call on every slider change
+    """
+
+    def __init__(self, model, group_sums):
+        self.model = model
+        self.group_sums = group_sums
+
+    def evaluate(self, num_sites=None, arctic_multiplier=None,
+                 percentiles=(10, 50, 80, 90)):
+        """
+        Distribution of total acquisition cost ($M)
+        Returns dict with mean and P-levels
+        """
+        model = self.model
+        num_sites = model.baseline_sites if num_sites is None else num_sites
+        arctic_multiplier = arctic_multiplier or model.baseline_arctic_multiplier
+
+        # The roll-up is linear in the group sums, so its coefficients are
+        # found by evaluating each unit group once and applied as one matvec
+        unit_groups = np.eye(self.group_sums.shape[1])
+        _, coefficients = model._totals(
+            model._category_subtotals(unit_groups, num_sites, arctic_multiplier))
+        totals = self.group_sums @ coefficients.astype(np.float32)
+
+        return {
+            'draws': len(totals),
+            'mean': float(totals.mean()),
+            **{f'P{p}': float(v) for p, v in zip(percentiles, np.percentile(totals, percentiles))}
+        }
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    import time
+
+    model = CostModel()
+    baseline = model.evaluate()
+
+    print("Compiled cost model (baseline parameters):")
+    print("-" * 60)
+    for category, subtotal in baseline['category_subtotals'].items():
+        listed = model.listed_subtotals.get(category)
+        print(f"  {category:35s} {subtotal:9.1f}  (CSV {listed})")
+    print(f"  {'Reserves':35s} {sum(baseline['reserves'].values()):9.1f}  "
+          f"(CSV {model.listed_subtotals.get(RESERVE_CATEGORY)})")
+    print(f"  {'TOTAL ACQUISITION':35s} {baseline['total_acquisition']:9.1f}")
+
+    start = time.perf_counter()
+    samples = model.sample(1_000_000, seed=0)
+    print(f"\n1,000,000 draws sampled in {time.perf_counter() - start:.2f} s")
+
+    for num_sites, multiplier in [(3, 2.5), (2, 2.5), (4, 2.5), (3, 1.5), (3, 4.0)]:
+        start = time.perf_counter()
+        stats = samples.evaluate(num_sites, multiplier)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"  {num_sites} sites, {multiplier}x Arctic: "
+              f"P50 ${stats['P50']:,.0f}M  P80 ${stats['P80']:,.0f}M  ({elapsed:.0f} ms)")
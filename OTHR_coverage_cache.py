@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Arctic OTHR Coverage Raster Cache
+Content-addressed, memory-mapped store of per-site coverage rasters
+
+UNCLASSIFIED // PUBLIC RELEASE
+Version: 1.0 Framework
+
+PURPOSE: Compute the per-site coverage masks, ranges and bearings once per
+         parameter set and reuse them across plots, dashboard runs and
+         scripts. Rasters are stored as .npy files opened read-only with
+         memory mapping, so worker processes share one copy, and point
+         queries are a direct index lookup instead of trigonometry.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from OTHR_coverage_model import coverage_mask
+
+# ============================================================================
+# CACHE CONFIGURATION
+# ============================================================================
+
+CACHE_VERSION = 1   # Bump when the coverage model changes its results
+DEFAULT_CACHE_DIR = os.environ.get('OTHR_CACHE_DIR', '.othr_cache')
+
+GRID_LAT_BOUNDS = (50, 85)
+GRID_LON_BOUNDS = (-180, -60)
+
+# ============================================================================
+# PARAMETER HASHING
+# ============================================================================
+
+def coverage_parameter_hash(params, resolution_deg=1.0):
+    """
+    Hash of every input that affects the coverage rasters
+    Returns hex digest used as the cache key
+    """
+    key = {
+        'version': CACHE_VERSION,
+        'resolution_deg': float(resolution_deg),
+        'lat_bounds': GRID_LAT_BOUNDS,
+        'lon_bounds': GRID_LON_BOUNDS,
+        'min_range_km': float(params.min_range_km),
+        'max_range_km': float(params.max_range_km),
+        'sites': [
+            [float(site['lat']), float(site['lon']),
+             float(site['azimuth_center']), float(site['coverage_angle'])]
+            for site in params.sites
+        ]
+    }
+    encoded = json.dumps(key, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()[:32]
+
+# ============================================================================
+# RASTER STORE
+# ============================================================================
+
+class CoverageRaster:
+    """
+    Read-only view of a cached coverage raster
+
+    Site names are not part of the cache key (they do not change the
+    rasters), so query results are labelled with site_names when given
+    (the caller's parameters) rather than the names stored with the entry
+
+    site_masks:  bool (num_sites, num_lat, num_lon)
+    range_km:    float32 (num_sites, num_lat, num_lon)
+    bearing_deg: float32 (num_sites, num_lat, num_lon)
+    """
+
+    def __init__(self, path, site_names=None):
+        self.path = path
+        with open(os.path.join(path, 'meta.json')) as f:
+            self.meta = json.load(f)
+
+        self.site_names = list(site_names) if site_names is not None else self.meta['site_names']
+        self.resolution_deg = self.meta['resolution_deg']
+        self.lat_range = np.load(os.path.join(path, 'lat_range.npy'))
+        self.lon_range = np.load(os.path.join(path, 'lon_range.npy'))
+        self.site_masks = np.load(os.path.join(path, 'site_masks.npy'), mmap_mode='r')
+        self.range_km = np.load(os.path.join(path, 'range_km.npy'), mmap_mode='r')
+        self.bearing_deg = np.load(os.path.join(path, 'bearing_deg.npy'), mmap_mode='r')
+
+    def coverage_grid(self):
+        """
+        Number of sites covering each grid cell (float64, as calculate_coverage_map)
+        """
+        return np.sum(self.site_masks, axis=0, dtype=np.float64)
+
+    def grid_index(self, lat, lon):
+        """
+        Nearest grid cell indices for points
+        Returns (lat_index, lon_index, inside) arrays
+        """
+        lat = np.asarray(lat, dtype=float)
+        lon = np.asarray(lon, dtype=float)
+        i = np.rint((lat - self.lat_range[0]) / self.resolution_deg).astype(np.int64)
+        j = np.rint((lon - self.lon_range[0]) / self.resolution_deg).astype(np.int64)
+        inside = (i >= 0) & (i < len(self.lat_range)) & (j >= 0) & (j < len(self.lon_range))
+        return np.where(inside, i, 0), np.where(inside, j, 0), inside
+
+    def query_many(self, lats, lons):
+        """
+        Vectorized lookup for arrays of points
+        Returns (covered, range_km, bearing_deg) arrays of shape
+        (num_sites, num_points); points outside the grid are never covered
+        """
+        i, j, inside = self.grid_index(np.ravel(lats), np.ravel(lons))
+        covered = self.site_masks[:, i, j] & inside
+        return covered, self.range_km[:, i, j], self.bearing_deg[:, i, j]
+
+    def query(self, lat, lon):
+        """
+        Which sites cover (lat, lon), and at what range and bearing
+        Returns list of dicts, one per covering site
+        """
+        covered, range_km, bearing = self.query_many([lat], [lon])
+        return [
+            {
+                'site': self.site_names[k],
+                'range_km': float(range_km[k, 0]),
+                'bearing_deg': float(bearing[k, 0])
+            }
+            for k in np.flatnonzero(covered[:, 0])
+        ]
+
+def _build_raster(params, resolution_deg, path):
+    """
+    Compute the per-site rasters and write them to path
+    """
+    lat_range = np.arange(*GRID_LAT_BOUNDS, resolution_deg)
+    lon_range = np.arange(*GRID_LON_BOUNDS, resolution_deg)
+    shape = (len(params.sites), len(lat_range), len(lon_range))
+
+    site_masks = np.zeros(shape, dtype=bool)
+    range_km = np.zeros(shape, dtype=np.float32)
+    bearing_deg = np.zeros(shape, dtype=np.float32)
+
+    for k, site in enumerate(params.sites):
+        site_masks[k], range_km[k], bearing_deg[k] = coverage_mask(
+            lat_range[:, np.newaxis], lon_range[np.newaxis, :],
+            site['lat'], site['lon'],
+            site['azimuth_center'], site['coverage_angle'],
+            params.min_range_km, params.max_range_km
+        )
+
+    np.save(os.path.join(path, 'lat_range.npy'), lat_range)
+    np.save(os.path.join(path, 'lon_range.npy'), lon_range)
+    np.save(os.path.join(path, 'site_masks.npy'), site_masks)
+    np.save(os.path.join(path, 'range_km.npy'), range_km)
+    np.save(os.path.join(path, 'bearing_deg.npy'), bearing_deg)
+
+    with open(os.path.join(path, 'meta.json'), 'w') as f:
+        json.dump({
+            'version': CACHE_VERSION,
+            'resolution_deg': float(resolution_deg),
+            'site_names': [site['name'] for site in params.sites],
+            'min_range_km': params.min_range_km,
+            'max_range_km': params.max_range_km
+        }, f, indent=2)
+
+def get_coverage_raster(params, resolution_deg=1.0, cache_dir=None):
+    """
+    Load the coverage raster for params, computing and storing it on a miss
+    Returns CoverageRaster backed by read-only memory maps
+    """
+    cache_dir = cache_dir or DEFAULT_CACHE_DIR
+    path = os.path.join(cache_dir, coverage_parameter_hash(params, resolution_deg))
+
+    if not os.path.exists(os.path.join(path, 'meta.json')):
+        os.makedirs(cache_dir, exist_ok=True)
+        # Build in a private directory and rename into place, so concurrent
+        # processes never see a partially written raster
+        staging = tempfile.mkdtemp(prefix='.building-', dir=cache_dir)
+        try:
+            _build_raster(params, resolution_deg, staging)
+            os.rename(staging, path)
+        except OSError:
+            if not os.path.exists(os.path.join(path, 'meta.json')):
+                raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    return CoverageRaster(path, [site['name'] for site in params.sites])
+
+def clear_coverage_cache(cache_dir=None):
+    """
+    Remove every cached raster
+    """
+    shutil.rmtree(cache_dir or DEFAULT_CACHE_DIR, ignore_errors=True)
@@ -12,9 +12,12 @@ PURPOSE: Parametric model framework for Arctic OTHR acquisition planning.
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.patches import Wedge, Circle
+import copy
 import json
+import os
+import re
+
+from OTHR_instrumentation import annotate_stage, instrumented
 
 # ============================================================================
 # PARAMETRIC INPUTS - EASILY ADJUSTABLE
@@ -114,10 +117,51 @@ class OTHRParameters:
              'waypoints': [(49.2, -123.2), (60.0, 175.0), (22.3, 114.2)]}
         ]
 
+_SITE_FIELD = re.compile(r'^sites\[(\d+)\]\.(\w+)$')
+_TARGET_FIELD = re.compile(r'^target_profiles\[([^\]]+)\]\.(\w+)$')
+
+def apply_parameter_overrides(params, overrides):
+    """
+    Return a copy of params with overrides applied
+    
+    Keys are OTHRParameters attribute names (e.g. 'max_range_km') or
+    per-site fields written as 'sites[<index>].<field>'
+    (e.g. 'sites[1].azimuth_center') and per-target fields written as
+    'target_profiles[<name>].<field>' (e.g.
+    'target_profiles[Small Aircraft].pd_modifier'). Overriding
+    coverage_angle_deg also sets every site's coverage_angle.
+    """
+    params = copy.deepcopy(params)
+    
+    for key, value in overrides.items():
+        site_field = _SITE_FIELD.match(key)
+        target_field = _TARGET_FIELD.match(key)
+        if site_field:
+            index, field = int(site_field.group(1)), site_field.group(2)
+            if index >= len(params.sites) or field not in params.sites[index]:
+                raise KeyError(f"Unknown site parameter: {key}")
+            params.sites[index][field] = value
+        elif target_field:
+            target_type, field = target_field.group(1), target_field.group(2)
+            if field not in params.target_profiles.get(target_type, {}):
+                raise KeyError(f"Unknown target parameter: {key}")
+            params.target_profiles[target_type][field] = value
+        elif hasattr(params, key):
+            setattr(params, key, value)
+            if key == 'coverage_angle_deg':
+                for site in params.sites:
+                    site['coverage_angle'] = value
+        else:
+            raise KeyError(f"Unknown parameter: {key}")
+    
+    return params
+
 # ============================================================================
 # COVERAGE CALCULATION FUNCTIONS
 # ============================================================================
 
+COVERAGE_BLOCK_CELLS = 65536     # Grid cells evaluated per vectorized block
+
 def haversine_distance(lat1, lon1, lat2, lon2):
     """
     Calculate great circle distance between two points on Earth
@@ -175,34 +219,292 @@ def point_in_coverage(target_lat, target_lon, site_lat, site_lon,
     else:
         return False, range_km, bearing
 
-def calculate_coverage_map(params, resolution_deg=1.0):
+def coverage_mask(target_lat, target_lon, site_lat, site_lon,
+                  azimuth_center, coverage_angle, min_range, max_range):
+    """
+    Vectorized form of point_in_coverage
+    Accepts broadcastable arrays of target positions and returns
+    (in_coverage, range_km, bearing_deg) arrays using the same range and
+    azimuth tests as the scalar version
+    """
+    range_km = haversine_distance(site_lat, site_lon, target_lat, target_lon)
+    bearing = bearing_from_to(site_lat, site_lon, target_lat, target_lon)
+    
+    in_range = (range_km >= min_range) & (range_km <= max_range)
+    
+    angle_diff = np.abs(bearing - azimuth_center)
+    angle_diff = np.where(angle_diff > 180, 360 - angle_diff, angle_diff)
+    
+    in_coverage = in_range & (angle_diff <= coverage_angle / 2)
+    return in_coverage, range_km, bearing
+
+def calculate_site_masks(params, lat_range, lon_range):
+    """
+    Calculate per-site coverage masks over a lat/lon grid
+    Returns boolean array of shape (num_sites, len(lat_range), len(lon_range))
+    """
+    lat_grid = np.asarray(lat_range, dtype=float)[:, np.newaxis]
+    lon_grid = np.asarray(lon_range, dtype=float)[np.newaxis, :]
+    
+    masks = np.zeros((len(params.sites), lat_grid.shape[0], lon_grid.shape[1]),
+                     dtype=bool)
+    
+    # Evaluate in blocks of latitude rows so temporaries stay cache-sized
+    # regardless of grid resolution or number of sites
+    rows_per_block = max(1, COVERAGE_BLOCK_CELLS // max(1, lon_grid.shape[1]))
+    
+    for k, site in enumerate(params.sites):
+        for i in range(0, lat_grid.shape[0], rows_per_block):
+            masks[k, i:i + rows_per_block], _, _ = coverage_mask(
+                lat_grid[i:i + rows_per_block], lon_grid,
+                site['lat'], site['lon'],
+                site['azimuth_center'], site['coverage_angle'],
+                params.min_range_km, params.max_range_km
+            )
+    
+    return masks
+
+@instrumented()
+def calculate_coverage_map(params, resolution_deg=1.0, return_site_masks=False,
+                           cache_dir=None):
     """
     Calculate coverage map showing which areas are covered by each site
     Returns grid of coverage (lat/lon grid with coverage indicators)
+    
+    If return_site_masks is True, the per-site boolean masks are returned
+    as a fourth element: (lat_range, lon_range, coverage_grid, site_masks)
+    
+    If cache_dir is given, the per-site masks are read from (or stored in)
+    the on-disk coverage raster cache for this parameter set
     """
-    # Define grid
-    lat_range = np.arange(50, 85, resolution_deg)
-    lon_range = np.arange(-180, -60, resolution_deg)
-    
-    coverage_grid = np.zeros((len(lat_range), len(lon_range)))
-    
-    for i, lat in enumerate(lat_range):
-        for j, lon in enumerate(lon_range):
-            num_sites_covering = 0
-            for site in params.sites:
-                in_cov, _, _ = point_in_coverage(
-                    lat, lon, 
-                    site['lat'], site['lon'],
-                    site['azimuth_center'], site['coverage_angle'],
-                    params.min_range_km, params.max_range_km
-                )
-                if in_cov:
-                    num_sites_covering += 1
-            
-            coverage_grid[i, j] = num_sites_covering
+    if cache_dir is not None:
+        from OTHR_coverage_cache import get_coverage_raster
+        raster = get_coverage_raster(params, resolution_deg, cache_dir)
+        lat_range, lon_range = raster.lat_range, raster.lon_range
+        site_masks = np.asarray(raster.site_masks)
+    else:
+        # Define grid
+        lat_range = np.arange(50, 85, resolution_deg)
+        lon_range = np.arange(-180, -60, resolution_deg)
+        site_masks = calculate_site_masks(params, lat_range, lon_range)
     
+    coverage_grid = site_masks.sum(axis=0, dtype=np.float64)
+    annotate_stage(grid_cells=int(coverage_grid.size), num_sites=len(params.sites),
+                   resolution_deg=resolution_deg)
+    
+    if return_site_masks:
+        return lat_range, lon_range, coverage_grid, site_masks
     return lat_range, lon_range, coverage_grid
 
+def site_footprint_slices(site, max_range_km, lat_range, lon_range):
+    """
+    Grid index slices bounding the cells within max_range_km of a site
+    Returns (lat_slice, lon_slice); cells outside them cannot be covered
+    """
+    R = 6371  # Earth radius in km
+    
+    # Pad by one cell so boundary cells are always evaluated exactly
+    step_lat = abs(lat_range[1] - lat_range[0]) if len(lat_range) > 1 else 0.0
+    step_lon = abs(lon_range[1] - lon_range[0]) if len(lon_range) > 1 else 0.0
+    radius_deg = np.degrees(max_range_km / R)
+    
+    lat_min = site['lat'] - radius_deg - step_lat
+    lat_max = site['lat'] + radius_deg + step_lat
+    rows = np.flatnonzero((lat_range >= lat_min) & (lat_range <= lat_max))
+    if len(rows) == 0:
+        return slice(0, 0), slice(0, 0)
+    
+    # A spherical cap spans all longitudes once it reaches a pole; otherwise
+    # its half-width in longitude is asin(sin(radius) / cos(lat))
+    if radius_deg >= 90 - abs(site['lat']):
+        return slice(rows[0], rows[-1] + 1), slice(0, len(lon_range))
+    
+    half_width = np.degrees(np.arcsin(np.sin(np.radians(radius_deg)) /
+                                      np.cos(np.radians(site['lat'])))) + step_lon
+    offset = (np.asarray(lon_range) - site['lon'] + 180) % 360 - 180
+    cols = np.flatnonzero(np.abs(offset) <= half_width)
+    if len(cols) == 0:
+        return slice(0, 0), slice(0, 0)
+    
+    return slice(rows[0], rows[-1] + 1), slice(cols[0], cols[-1] + 1)
+
+class IncrementalCoverage:
+    """
+    Stateful coverage model for site studies
+    
+    Keeps per-site masks and the running count grid. Moving, adding or
+    removing a site recomputes only that site's mask inside its
+    max_range_km footprint and applies the difference to the counts, so
+    an edit costs one site's footprint instead of the whole grid x sites.
+    """
+    
+    def __init__(self, params, resolution_deg=1.0):
+        self.params = copy.copy(params)
+        self.params.sites = [dict(site) for site in params.sites]
+        self.lat_range = np.arange(50, 85, resolution_deg)
+        self.lon_range = np.arange(-180, -60, resolution_deg)
+        self.recompute()
+    
+    def recompute(self):
+        """
+        Full recompute (needed after changing range limits)
+        """
+        masks = calculate_site_masks(self.params, self.lat_range, self.lon_range)
+        self.site_masks = [mask for mask in masks]
+        self.counts = masks.sum(axis=0, dtype=np.int16)
+    
+    @property
+    def sites(self):
+        return self.params.sites
+    
+    @property
+    def coverage_grid(self):
+        """
+        Count grid in the same form as calculate_coverage_map
+        """
+        return self.counts.astype(np.float64)
+    
+    def _footprint_mask(self, site):
+        """
+        Mask of one site computed only inside its footprint
+        Returns (lat_slice, lon_slice, block)
+        """
+        lat_slice, lon_slice = site_footprint_slices(
+            site, self.params.max_range_km, self.lat_range, self.lon_range)
+        block, _, _ = coverage_mask(
+            self.lat_range[lat_slice, np.newaxis], self.lon_range[np.newaxis, lon_slice],
+            site['lat'], site['lon'],
+            site['azimuth_center'], site['coverage_angle'],
+            self.params.min_range_km, self.params.max_range_km
+        )
+        return lat_slice, lon_slice, block
+    
+    def _clear_site(self, index):
+        site = self.params.sites[index]
+        lat_slice, lon_slice = site_footprint_slices(
+            site, self.params.max_range_km, self.lat_range, self.lon_range)
+        self.counts[lat_slice, lon_slice] -= self.site_masks[index][lat_slice, lon_slice]
+        self.site_masks[index][lat_slice, lon_slice] = False
+    
+    def _paint_site(self, index):
+        lat_slice, lon_slice, block = self._footprint_mask(self.params.sites[index])
+        self.site_masks[index][lat_slice, lon_slice] = block
+        self.counts[lat_slice, lon_slice] += block
+    
+    def move_site(self, index, **changes):
+        """
+        Update one site's lat, lon, azimuth_center and/or coverage_angle
+        """
+        self._clear_site(index)
+        self.params.sites[index].update(changes)
+        self._paint_site(index)
+    
+    def add_site(self, site):
+        """
+        Add a site (dict in the OTHRParameters.sites format)
+        Returns the new site's index
+        """
+        self.params.sites.append(dict(site))
+        self.site_masks.append(np.zeros(self.counts.shape, dtype=bool))
+        self._paint_site(len(self.params.sites) - 1)
+        return len(self.params.sites) - 1
+    
+    def remove_site(self, index):
+        """
+        Remove a site and subtract its coverage
+        """
+        self._clear_site(index)
+        del self.params.sites[index]
+        del self.site_masks[index]
+
+# ============================================================================
+# ROUTE GEOMETRY FUNCTIONS
+# ============================================================================
+
+def _great_circle_fractions(lat1, lon1, lat2, lon2, fractions):
+    """
+    Points at the given fractions (0..1) of the great circle from point 1
+    to point 2
+    Returns (lats, lons) arrays (longitudes normalized to -180..180)
+    """
+    R = 6371  # Earth radius in km
+    
+    fractions = np.asarray(fractions, dtype=float)
+    lat1_rad, lon1_rad = np.radians(lat1), np.radians(lon1)
+    lat2_rad, lon2_rad = np.radians(lat2), np.radians(lon2)
+    p1 = np.array([np.cos(lat1_rad) * np.cos(lon1_rad),
+                   np.cos(lat1_rad) * np.sin(lon1_rad),
+                   np.sin(lat1_rad)])
+    p2 = np.array([np.cos(lat2_rad) * np.cos(lon2_rad),
+                   np.cos(lat2_rad) * np.sin(lon2_rad),
+                   np.sin(lat2_rad)])
+    
+    angle = haversine_distance(lat1, lon1, lat2, lon2) / R
+    if angle < 1e-12:
+        points = np.outer(p1, np.ones_like(fractions))
+    else:
+        # Spherical linear interpolation between the two unit vectors
+        a = np.sin((1 - fractions) * angle) / np.sin(angle)
+        b = np.sin(fractions * angle) / np.sin(angle)
+        points = np.outer(p1, a) + np.outer(p2, b)
+    
+    lats = np.degrees(np.arctan2(points[2], np.hypot(points[0], points[1])))
+    lons = np.degrees(np.arctan2(points[1], points[0]))
+    return lats, lons
+
+def interpolate_great_circle(lat1, lon1, lat2, lon2, step_km):
+    """
+    Sample points along the great circle from point 1 to point 2
+    Returns (lats, lons) arrays including both endpoints, spaced no more
+    than step_km apart (longitudes normalized to -180..180)
+    """
+    distance_km = haversine_distance(lat1, lon1, lat2, lon2)
+    num_steps = max(1, int(np.ceil(distance_km / step_km)))
+    fractions = np.linspace(0.0, 1.0, num_steps + 1)
+    
+    return _great_circle_fractions(lat1, lon1, lat2, lon2, fractions)
+
+def densify_route(waypoints, step_km):
+    """
+    Densify a route's (lat, lon) waypoints along great-circle legs
+    Returns (lats, lons) arrays with consecutive points no more than
+    step_km apart; shared leg endpoints appear once
+    """
+    lats = [np.array([waypoints[0][0]], dtype=float)]
+    lons = [np.array([waypoints[0][1]], dtype=float)]
+    
+    for (lat1, lon1), (lat2, lon2) in zip(waypoints[:-1], waypoints[1:]):
+        leg_lats, leg_lons = interpolate_great_circle(lat1, lon1, lat2, lon2, step_km)
+        lats.append(leg_lats[1:])
+        lons.append(leg_lons[1:])
+    
+    return np.concatenate(lats), np.concatenate(lons)
+
+def sample_route(waypoints, step_km):
+    """
+    Sample a route's (lat, lon) waypoints at exact along-track intervals
+    Returns (lats, lons, along_track_km) with points every step_km from the
+    first waypoint; the final point lies within step_km of the last waypoint
+    """
+    lats = np.array([wp[0] for wp in waypoints], dtype=float)
+    lons = np.array([wp[1] for wp in waypoints], dtype=float)
+    leg_km = haversine_distance(lats[:-1], lons[:-1], lats[1:], lons[1:])
+    leg_start_km = np.concatenate([[0.0], np.cumsum(leg_km)])
+    
+    along_track_km = np.arange(0.0, leg_start_km[-1] + 1e-9, step_km)
+    leg_index = np.clip(np.searchsorted(leg_start_km, along_track_km, side='right') - 1,
+                        0, len(leg_km) - 1)
+    
+    out_lats = np.empty_like(along_track_km)
+    out_lons = np.empty_like(along_track_km)
+    for leg in np.unique(leg_index):
+        selected = leg_index == leg
+        fractions = (along_track_km[selected] - leg_start_km[leg]) / max(leg_km[leg], 1e-12)
+        out_lats[selected], out_lons[selected] = _great_circle_fractions(
+            lats[leg], lons[leg], lats[leg + 1], lons[leg + 1], fractions)
+    
+    return out_lats, out_lons, along_track_km
+
 # ============================================================================
 # PERFORMANCE CALCULATION FUNCTIONS
 # ============================================================================
@@ -212,16 +514,19 @@ def calculate_detection_probability(params, target_type, range_km, conditions='c
     Calculate probability of detection for given target at given range
     
     conditions: 'clear' or 'auroral'
+    range_km may be a scalar or an array of ranges
     """
     base_pd = params.probability_detection
     target_modifier = params.target_profiles[target_type]['pd_modifier']
+    range_km = np.asarray(range_km)
     
     # Range degradation (simple model: linear decrease beyond nominal range)
-    if range_km > params.nominal_range_km:
-        range_factor = 1 - 0.3 * (range_km - params.nominal_range_km) / \
-                       (params.max_range_km - params.nominal_range_km)
-    else:
-        range_factor = 1.0
+    range_factor = np.where(
+        range_km > params.nominal_range_km,
+        1 - 0.3 * (range_km - params.nominal_range_km) /
+        (params.max_range_km - params.nominal_range_km),
+        1.0
+    )
     
     pd = base_pd * target_modifier * range_factor
     
@@ -230,15 +535,125 @@ def calculate_detection_probability(params, target_type, range_km, conditions='c
     
     return np.clip(pd, 0, 1)
 
-def estimate_detection_range(params, target_type, pd_threshold=0.5, conditions='clear'):
+def _detection_probability_elementwise(params, target_types, range_km, conditions):
+    """
+    Pd for element-wise arrays of target types, ranges and conditions
+    (one vectorized call per distinct target/conditions pair)
+    """
+    pd = np.empty(range_km.shape)
+    target_names, target_index = np.unique(target_types.ravel(), return_inverse=True)
+    condition_names, condition_index = np.unique(conditions.ravel(), return_inverse=True)
+    pairs = (target_index * len(condition_names) + condition_index).reshape(range_km.shape)
+    for pair in np.unique(pairs):
+        selected = pairs == pair
+        target_type, condition = divmod(pair, len(condition_names))
+        pd[selected] = calculate_detection_probability(
+            params, target_names[target_type], range_km[selected], condition_names[condition])
+    return pd
+
+def _detection_range_analytic(params, target_types, pd_threshold, conditions):
+    """
+    Closed-form inverse of the piecewise-linear Pd model
+    """
+    # For a single target type the parameters may also be arrays of
+    # parameter samples; they broadcast through the formula below
+    if target_types.ndim == 0:
+        modifiers = params.target_profiles[target_types.item()]['pd_modifier']
+    else:
+        modifiers = np.array([params.target_profiles[t]['pd_modifier']
+                              for t in target_types.ravel()]).reshape(target_types.shape)
+    peak_pd = params.probability_detection * modifiers * \
+        np.where(conditions == 'auroral', params.aurora_degradation_factor, 1.0)
+    
+    # Pd is flat at peak_pd out to nominal range, then falls by 30% of the
+    # peak at max range: solve peak_pd * (1 - 0.3 * x) = threshold for x
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fraction_past_nominal = (1 - pd_threshold / peak_pd) / 0.3
+    crossing_km = params.nominal_range_km + fraction_past_nominal * \
+        (params.max_range_km - params.nominal_range_km)
+    
+    range_km = np.clip(crossing_km, params.min_range_km, params.max_range_km)
+    return np.where(np.minimum(peak_pd, 1.0) >= pd_threshold, range_km,
+                    params.min_range_km).astype(float)
+
+def _detection_range_bisect(params, target_types, pd_threshold, conditions,
+                            tolerance_km=1e-6):
+    """
+    Vectorized bisection on calculate_detection_probability
+    Assumes Pd does not increase with range
+    """
+    low = np.full(target_types.shape, float(params.min_range_km))
+    high = np.full(target_types.shape, float(params.max_range_km))
+    
+    detect_min = _detection_probability_elementwise(
+        params, target_types, low, conditions) >= pd_threshold
+    detect_max = _detection_probability_elementwise(
+        params, target_types, high, conditions) >= pd_threshold
+    
+    iterations = int(np.ceil(np.log2(max(high.max() - low.min(), tolerance_km) / tolerance_km)))
+    for _ in range(iterations):
+        mid = 0.5 * (low + high)
+        detected = _detection_probability_elementwise(
+            params, target_types, mid, conditions) >= pd_threshold
+        low = np.where(detected, mid, low)
+        high = np.where(detected, high, mid)
+    
+    return np.where(detect_max, float(params.max_range_km),
+                    np.where(detect_min, low, float(params.min_range_km)))
+
+def estimate_detection_range(params, target_type, pd_threshold=0.5, conditions='clear',
+                             method='analytic'):
     """
     Estimate maximum detection range for given target type and Pd threshold
+    
+    Returns the farthest range in [min_range_km, max_range_km] at which
+    Pd >= pd_threshold (min_range_km if the threshold is never met).
+    target_type, pd_threshold and conditions may be scalars or broadcastable
+    arrays; array inputs return an array of ranges. With a scalar target_type
+    the analytic method also accepts parameter fields holding arrays of
+    parameter samples (batched evaluation, see OTHR_sensitivity).
+    
+    method: 'analytic' (closed-form inverse of the current Pd model) or
+            'bisect' (numerical root-finder for non-linear Pd models)
     """
-    for range_km in range(params.min_range_km, params.max_range_km, 50):
-        pd = calculate_detection_probability(params, target_type, range_km, conditions)
-        if pd < pd_threshold:
-            return range_km
-    return params.max_range_km
+    target_types, thresholds, condition_array = np.broadcast_arrays(
+        np.asarray(target_type, dtype=object),
+        np.asarray(pd_threshold, dtype=float),
+        np.asarray(conditions, dtype=object))
+    
+    if method == 'analytic':
+        range_km = _detection_range_analytic(params, target_types, thresholds, condition_array)
+    elif method == 'bisect':
+        range_km = _detection_range_bisect(params, target_types, thresholds, condition_array)
+    else:
+        raise ValueError(f"Unknown detection range method: {method}")
+    
+    return float(range_km) if range_km.ndim == 0 else range_km
+
+def detection_range_table(params, target_types=None, pd_thresholds=(0.5,),
+                          conditions=('clear', 'auroral'), method='analytic'):
+    """
+    Detection ranges for every target type x Pd threshold x condition
+    Returns dict with the axis labels and a 'range_km' array of shape
+    (num_target_types, num_thresholds, num_conditions)
+    """
+    target_types = list(target_types or params.target_profiles.keys())
+    pd_thresholds = np.atleast_1d(np.asarray(pd_thresholds, dtype=float))
+    conditions = list(conditions)
+    
+    range_km = estimate_detection_range(
+        params,
+        np.array(target_types, dtype=object)[:, np.newaxis, np.newaxis],
+        pd_thresholds[np.newaxis, :, np.newaxis],
+        np.array(conditions, dtype=object)[np.newaxis, np.newaxis, :],
+        method=method)
+    
+    return {
+        'target_types': target_types,
+        'pd_thresholds': pd_thresholds,
+        'conditions': conditions,
+        'range_km': range_km
+    }
 
 def calculate_track_accuracy(params, range_km):
     """
@@ -256,113 +671,27 @@ def calculate_track_accuracy(params, range_km):
     }
 
 # ============================================================================
-# VISUALIZATION FUNCTIONS
+# VISUALIZATION FUNCTIONS (lazy)
 # ============================================================================
 
-def plot_coverage_map(params, save_path=None):
-    """
-    Create coverage map visualization
-    """
-    fig, ax = plt.subplots(figsize=(14, 10))
-    
-    # Calculate coverage
-    lat_range, lon_range, coverage_grid = calculate_coverage_map(params, resolution_deg=2.0)
-    
-    # Plot coverage
-    coverage_plot = ax.contourf(lon_range, lat_range, coverage_grid, 
-                                levels=[0, 0.5, 1.5, 2.5, 3.5],
-                                colors=['white', 'lightblue', 'blue', 'darkblue'],
-                                alpha=0.6)
-    
-    # Add colorbar
-    cbar = plt.colorbar(coverage_plot, ax=ax, ticks=[0, 1, 2, 3])
-    cbar.set_label('Number of Sites Covering', rotation=270, labelpad=20)
-    cbar.set_ticklabels(['0', '1', '2', '3'])
-    
-    # Plot radar sites
-    for site in params.sites:
-        ax.plot(site['lon'], site['lat'], 'r*', markersize=20, label=site['name'])
-        
-        # Add coverage wedge (simplified, not accounting for Earth curvature)
-        # This is approximate visualization only
-        ax.text(site['lon'], site['lat']+1, site['name'], 
-               ha='center', fontsize=8, weight='bold')
-    
-    # Plot commercial routes
-    for route in params.commercial_routes:
-        lons = [wp[1] for wp in route['waypoints']]
-        lats = [wp[0] for wp in route['waypoints']]
-        ax.plot(lons, lats, 'g--', linewidth=1, alpha=0.5)
-        ax.text(lons[0], lats[0], route['name'], fontsize=7, color='green')
-    
-    ax.set_xlabel('Longitude (degrees)')
-    ax.set_ylabel('Latitude (degrees)')
-    ax.set_title('Arctic OTHR Coverage Map\n(Unclassified Framework - Notional Site Locations)', 
-                fontsize=14, weight='bold')
-    ax.grid(True, alpha=0.3)
-    ax.set_xlim(-180, -60)
-    ax.set_ylim(50, 85)
-    
-    plt.tight_layout()
-    
-    if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        print(f"Coverage map saved to {save_path}")
-    
-    return fig
-
-def plot_performance_curves(params, save_path=None):
-    """
-    Plot detection performance curves for different target types and conditions
-    """
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
-    
-    ranges = np.arange(params.min_range_km, params.max_range_km, 50)
-    
-    # Plot 1: Pd vs Range for different targets (clear conditions)
-    for target_type in params.target_profiles.keys():
-        pds = [calculate_detection_probability(params, target_type, r, 'clear') 
-               for r in ranges]
-        ax1.plot(ranges, pds, label=target_type, linewidth=2)
-    
-    ax1.axhline(y=0.5, color='r', linestyle='--', alpha=0.5, label='Pd=0.5 threshold')
-    ax1.set_xlabel('Range (km)', fontsize=12)
-    ax1.set_ylabel('Probability of Detection (Pd)', fontsize=12)
-    ax1.set_title('Detection Performance vs Range\n(Clear Conditions)', fontsize=12, weight='bold')
-    ax1.legend()
-    ax1.grid(True, alpha=0.3)
-    ax1.set_ylim(0, 1.05)
-    
-    # Plot 2: Pd vs Range for Large Aircraft (clear vs auroral)
-    target = 'Large Commercial Aircraft'
-    pds_clear = [calculate_detection_probability(params, target, r, 'clear') for r in ranges]
-    pds_aurora = [calculate_detection_probability(params, target, r, 'auroral') for r in ranges]
-    
-    ax2.plot(ranges, pds_clear, label='Clear Conditions', linewidth=2, color='blue')
-    ax2.plot(ranges, pds_aurora, label='Auroral Conditions', linewidth=2, color='red')
-    ax2.fill_between(ranges, pds_clear, pds_aurora, alpha=0.2, color='yellow', 
-                     label='Performance Degradation')
-    ax2.axhline(y=0.5, color='gray', linestyle='--', alpha=0.5)
-    
-    ax2.set_xlabel('Range (km)', fontsize=12)
-    ax2.set_ylabel('Probability of Detection (Pd)', fontsize=12)
-    ax2.set_title(f'Arctic Performance Impact\n({target})', fontsize=12, weight='bold')
-    ax2.legend()
-    ax2.grid(True, alpha=0.3)
-    ax2.set_ylim(0, 1.05)
-    
-    plt.tight_layout()
-    
-    if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        print(f"Performance curves saved to {save_path}")
-    
-    return fig
+# Plotting lives in OTHR_visualization so the compute core imports only
+# NumPy. The plot functions stay importable from this module and load
+# matplotlib on first access.
+_LAZY_VISUALIZATION = ('plot_coverage_map', 'plot_performance_curves')
+
+def __getattr__(name):
+    if name in _LAZY_VISUALIZATION:
+        import OTHR_visualization
+        return getattr(OTHR_visualization, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # ============================================================================
 # SUMMARY STATISTICS
 # ============================================================================
 
+DEFAULT_OUTPUT_DIR = os.environ.get('OTHR_OUTPUT_DIR', '.')   # Plots and summary JSON
+
+@instrumented()
 def generate_performance_summary(params):
     """
     Generate summary statistics for reporting
@@ -392,12 +721,13 @@ def generate_performance_summary(params):
     }
     
     # Calculate detection ranges for each target type
-    for target_type in params.target_profiles.keys():
-        range_clear = estimate_detection_range(params, target_type, 0.5, 'clear')
-        range_aurora = estimate_detection_range(params, target_type, 0.5, 'auroral')
+    table = detection_range_table(params, pd_thresholds=0.5,
+                                  conditions=('clear', 'auroral'))
+    for k, target_type in enumerate(table['target_types']):
+        range_clear, range_aurora = table['range_km'][k, 0]
         
-        summary['Detection Performance (Clear Conditions)'][target_type] = f"{range_clear} km"
-        summary['Detection Performance (Auroral Conditions)'][target_type] = f"{range_aurora} km"
+        summary['Detection Performance (Clear Conditions)'][target_type] = f"{range_clear:.0f} km"
+        summary['Detection Performance (Auroral Conditions)'][target_type] = f"{range_aurora:.0f} km"
     
     return summary
 
@@ -420,6 +750,7 @@ def print_summary(summary):
     print("      class for refined analysis with actual requirements.")
     print("="*80 + "\n")
 
+@instrumented()
 def export_summary_json(summary, filepath):
     """
     Export summary to JSON file
@@ -433,6 +764,15 @@ def export_summary_json(summary, filepath):
 # ============================================================================
 
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Arctic OTHR Coverage and Performance Model")
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR,
+                        help="Directory for the plots and summary JSON "
+                             "(default: $OTHR_OUTPUT_DIR or the current directory)")
+    args = parser.parse_args()
+    os.makedirs(args.output_dir, exist_ok=True)
+    
     print("Arctic OTHR Coverage and Performance Model")
     print("Initializing parameters...")
     
@@ -444,14 +784,16 @@ if __name__ == "__main__":
     print_summary(summary)
     
     # Create visualizations
+    from OTHR_visualization import plot_coverage_map, plot_performance_curves
+    
     print("Generating coverage map...")
-    fig1 = plot_coverage_map(params, save_path='/home/claude/OTHR_Coverage_Map.png')
+    fig1 = plot_coverage_map(params, save_path=os.path.join(args.output_dir, 'OTHR_Coverage_Map.png'))
     
     print("Generating performance curves...")
-    fig2 = plot_performance_curves(params, save_path='/home/claude/OTHR_Performance_Curves.png')
+    fig2 = plot_performance_curves(params, save_path=os.path.join(args.output_dir, 'OTHR_Performance_Curves.png'))
     
     # Export summary
-    export_summary_json(summary, '/home/claude/OTHR_Performance_Summary.json')
+    export_summary_json(summary, os.path.join(args.output_dir, 'OTHR_Performance_Summary.json'))
     
     print("\n" + "="*80)
     print("AI FACILITATOR TEAM NOTE:")
@@ -470,7 +812,7 @@ if __name__ == "__main__":
     print("- Add ionospheric models specific to selected sites")
     print("="*80 + "\n")
     
-    print("Analysis complete. Files generated:")
+    print(f"Analysis complete. Files generated in {args.output_dir}:")
     print("  - OTHR_Coverage_Map.png")
     print("  - OTHR_Performance_Curves.png")
     print("  - OTHR_Performance_Summary.json")
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Arctic OTHR Time-Varying Coverage
+Coverage as a function of (time, site, lat, lon) with a moving skip zone
+
+UNCLASSIFIED // PUBLIC RELEASE
+Version: 1.0 Framework
+
+PURPOSE: min_range_km and max_range_km are fixed in the static coverage map,
+         but the skip zone and maximum range move with local time of day,
+         season and auroral activity. This module steps coverage through
+         time (e.g. a year at 15-minute steps), streaming the cube in time
+         chunks sized to a memory budget. Each chunk is optionally written
+         to a memory-mapped, bit-packed .npy store, and availability,
+         dual-coverage availability, worst hour-of-day availability and
+         longest coverage gap are accumulated incrementally, so the whole
+         cube is never held in memory.
+
+IONOSPHERIC MODEL (notional, for trade studies):
+- Skip zone shrinks by day (peak near 14:00 local) and in summer, grows at
+  night and in winter
+- Maximum range drops somewhat at night
+- During auroral episodes (Markov chains from OTHR_monte_carlo) the skip
+  zone grows and the maximum range is scaled by aurora_degradation_factor
+
+USAGE:
+    stats = calculate_coverage_timeseries(params, duration_days=365,
+                                          store_path='coverage_cube.npy')
+"""
+
+import json
+
+import numpy as np
+
+from OTHR_coverage_model import coverage_mask
+from OTHR_instrumentation import annotate_stage, instrumented, stage
+from OTHR_monte_carlo import simulate_aurora_states
+
+# ============================================================================
+# IONOSPHERIC RANGE MODEL CONFIGURATION
+# ============================================================================
+
+SKIP_DIURNAL_AMPLITUDE = 0.25     # Fractional skip-zone swing, day vs night
+SKIP_SEASONAL_AMPLITUDE = 0.10    # Fractional skip-zone swing, summer vs winter
+MAX_RANGE_NIGHT_REDUCTION = 0.10  # Fractional max-range loss at local midnight
+AURORA_SKIP_FACTOR = 1.2          # Skip-zone growth during auroral episodes
+PEAK_LOCAL_HOUR = 14.0            # Local hour of maximum F-region density
+SUMMER_SOLSTICE_DAY = 172
+
+DEFAULT_START = '2026-01-01T00:00'
+BYTES_PER_CELL_STEP = 24          # Working bytes per grid cell and time step (besides sites)
+STATS_BYTES_PER_CELL = 112        # CoverageTimeStats accumulators (incl. 24 hour-of-day bins)
+RESULTS_BYTES_PER_CELL = 64       # Arrays built by CoverageTimeStats.results()
+SITE_BYTES_PER_CELL = 5           # Per-site range (float32) and azimuth mask (bool)
+BYTES_PER_SITE_STEP = 17          # Per-site range limits (2 x float64) and aurora state
+
+# ============================================================================
+# TIME AXIS AND RANGE LIMITS
+# ============================================================================
+
+def time_steps(start=DEFAULT_START, duration_days=365, step_minutes=15):
+    """
+    UTC time axis as a numpy datetime64[m] array
+    """
+    num_steps = int(round(duration_days * 24 * 60 / step_minutes))
+    return np.datetime64(start, 'm') + np.arange(num_steps) * np.timedelta64(int(step_minutes), 'm')
+
+def ionospheric_range_limits(params, times, aurora_states=None):
+    """
+    Skip-zone (minimum) and maximum detection range per site and time step
+    times: datetime64 array; aurora_states: optional (num_sites, num_steps) bool
+    Returns (min_range_km, max_range_km), each of shape (num_sites, num_steps)
+    """
+    times = np.asarray(times, dtype='datetime64[m]')
+    minutes = (times - times.astype('datetime64[D]')).astype(np.int64)
+    utc_hours = minutes / 60.0
+    day_of_year = (times.astype('datetime64[D]') - times.astype('datetime64[Y]')).astype(np.int64) + 1
+
+    site_lons = np.array([site['lon'] for site in params.sites], dtype=float)[:, np.newaxis]
+    local_hours = (utc_hours[np.newaxis, :] + site_lons / 15.0) % 24
+    diurnal = np.cos(2 * np.pi * (local_hours - PEAK_LOCAL_HOUR) / 24)     # +1 day, -1 night
+    seasonal = np.cos(2 * np.pi * (day_of_year - SUMMER_SOLSTICE_DAY) / 365.25)
+
+    min_range = params.min_range_km * (1 - SKIP_DIURNAL_AMPLITUDE * diurnal
+                                       - SKIP_SEASONAL_AMPLITUDE * seasonal[np.newaxis, :])
+    max_range = params.max_range_km * (1 - MAX_RANGE_NIGHT_REDUCTION * (1 - diurnal) / 2)
+
+    if aurora_states is not None:
+        min_range = np.where(aurora_states, min_range * AURORA_SKIP_FACTOR, min_range)
+        max_range = np.where(aurora_states, max_range * params.aurora_degradation_factor, max_range)
+
+    return min_range, max_range
+
+# ============================================================================
+# INCREMENTAL STATISTICS
+# ============================================================================
+
+class CoverageTimeStats:
+    """
+    Running coverage statistics per grid cell, updated one time chunk at a time
+
+    Tracks covered (1+ sites) and dual-covered step counts, covered steps by
+    UTC hour of day, and the current and longest uncovered run per cell.
+    """
+
+    def __init__(self, grid_shape, step_minutes):
+        self.grid_shape = grid_shape
+        self.step_minutes = step_minutes
+        self.steps = 0
+        self.covered_steps = np.zeros(grid_shape, dtype=np.int32)
+        self.dual_steps = np.zeros(grid_shape, dtype=np.int32)
+        self.hour_steps = np.zeros(24, dtype=np.int64)
+        self.hour_covered_steps = np.zeros((24,) + grid_shape, dtype=np.int32)
+        self.current_gap = np.zeros(grid_shape, dtype=np.int32)
+        self.longest_gap = np.zeros(grid_shape, dtype=np.int32)
+
+    def update(self, counts, utc_hours):
+        """
+        Fold in one chunk: counts of covering sites, shape (steps,) + grid_shape,
+        and the integer UTC hour of each step
+        """
+        covered = counts >= 1
+        self.steps += len(counts)
+        self.covered_steps += covered.sum(axis=0, dtype=np.int32)
+        self.dual_steps += (counts >= 2).sum(axis=0, dtype=np.int32)
+
+        for hour in np.unique(utc_hours):
+            in_hour = utc_hours == hour
+            self.hour_steps[hour] += int(in_hour.sum())
+            self.hour_covered_steps[hour] += covered[in_hour].sum(axis=0, dtype=np.int32)
+
+        # Gap length at step t is t minus the last covered step; the run
+        # carried over from the previous chunk acts as a covered step at
+        # -1 - current_gap
+        index = np.arange(len(counts), dtype=np.int32).reshape((-1,) + (1,) * len(self.grid_shape))
+        last_covered = np.where(covered, index, -1 - self.current_gap)
+        np.maximum.accumulate(last_covered, axis=0, out=last_covered)
+        gap = index - last_covered
+        np.maximum(self.longest_gap, gap.max(axis=0), out=self.longest_gap)
+        self.current_gap = gap[-1].astype(np.int32)
+
+    def results(self):
+        """
+        Availability fractions and gap lengths per cell
+        """
+        steps = max(self.steps, 1)
+        # Worst hour one hour at a time, so no (24,) + grid_shape float array
+        worst = np.full(self.grid_shape, np.inf)
+        worst_hour = np.zeros(self.grid_shape, dtype=np.int64)
+        for hour in np.flatnonzero(self.hour_steps > 0):
+            availability = self.hour_covered_steps[hour] / self.hour_steps[hour]
+            lower = availability < worst
+            worst[lower] = availability[lower]
+            worst_hour[lower] = hour
+        step_hours = self.step_minutes / 60.0
+        return {
+            'steps': self.steps,
+            'availability': self.covered_steps / steps,
+            'dual_availability': self.dual_steps / steps,
+            'worst_hour_availability': worst,
+            'worst_utc_hour': worst_hour,
+            'longest_gap_hours': self.longest_gap * step_hours
+        }
+
+# ============================================================================
+# CUBE EVALUATION
+# ============================================================================
+
+def _chunk_steps(num_sites, grid_cells, num_steps, memory_budget_mb):
+    """
+    Time steps per chunk, so that the fixed state (per-cell statistics,
+    site geometry, range limits) plus one chunk fits in memory_budget_mb
+    """
+    budget = memory_budget_mb * 1024 * 1024
+    fixed = grid_cells * (STATS_BYTES_PER_CELL + num_sites * SITE_BYTES_PER_CELL) + \
+        num_steps * (num_sites * BYTES_PER_SITE_STEP + 16)
+    bytes_per_step = grid_cells * (num_sites * 1.125 + BYTES_PER_CELL_STEP)
+    # results() runs after the chunk buffers are released
+    needed = fixed + max(bytes_per_step, grid_cells * RESULTS_BYTES_PER_CELL)
+    if needed > budget:
+        raise ValueError(f"memory_budget_mb={memory_budget_mb} is below the "
+                         f"{needed / (1024 * 1024):.0f} MB needed for the per-cell state "
+                         f"and one time step at this resolution")
+    return int((budget - fixed) // bytes_per_step)
+
+@instrumented()
+def calculate_coverage_timeseries(params, start=DEFAULT_START, duration_days=365,
+                                  step_minutes=15, resolution_deg=0.5,
+                                  memory_budget_mb=256, store_path=None,
+                                  mean_episode_hours=6.0, site_correlation=0.7,
+                                  seed=None):
+    """
+    Time-stepped coverage over the model grid with incremental statistics
+
+    The cube (time, site, lat, lon) is evaluated in chunks of time steps;
+    memory_budget_mb bounds the per-cell statistics and site geometry plus
+    one chunk (ValueError if the fixed state alone does not fit). If
+    store_path is given, each chunk is written to a memory-mapped .npy of
+    shape (time, site, lat, ceil(lon / 8)), bit-packed along longitude (see
+    load_coverage_cube), with a JSON sidecar describing the axes.
+
+    Returns dict with lat_range, lon_range, times and the per-cell
+    statistics from CoverageTimeStats.results()
+    """
+    rng = np.random.default_rng(seed)
+    times = time_steps(start, duration_days, step_minutes)
+    lat_range = np.arange(50, 85, resolution_deg)
+    lon_range = np.arange(-180, -60, resolution_deg)
+    grid_shape = (len(lat_range), len(lon_range))
+    num_sites = len(params.sites)
+
+    # Geometry is fixed: only the range limits move, so ranges and the
+    # azimuth sector test are computed once per site
+    with stage('site_geometry'):
+        azimuth_masks = np.empty((num_sites,) + grid_shape, dtype=bool)
+        ranges = np.empty((num_sites,) + grid_shape, dtype=np.float32)
+        for k, site in enumerate(params.sites):
+            # Unbounded range limits leave only the azimuth sector test
+            azimuth_masks[k], ranges[k], _ = coverage_mask(
+                lat_range[:, np.newaxis], lon_range[np.newaxis, :],
+                site['lat'], site['lon'], site['azimuth_center'],
+                site['coverage_angle'], 0, np.inf)
+
+    aurora = simulate_aurora_states(params, len(times), step_minutes / 60.0,
+                                    mean_episode_hours, site_correlation, rng)
+    min_range, max_range = ionospheric_range_limits(params, times, aurora)
+
+    cube = None
+    if store_path is not None:
+        cube = np.lib.format.open_memmap(
+            store_path, mode='w+', dtype=np.uint8,
+            shape=(len(times), num_sites, grid_shape[0], (grid_shape[1] + 7) // 8))
+        with open(store_path + '.json', 'w') as f:
+            json.dump({'start': str(times[0]), 'step_minutes': step_minutes,
+                       'num_steps': len(times), 'resolution_deg': resolution_deg,
+                       'num_lon': grid_shape[1],
+                       'sites': [site['name'] for site in params.sites]}, f, indent=2)
+
+    stats = CoverageTimeStats(grid_shape, step_minutes)
+    utc_hours = ((times - times.astype('datetime64[D]')).astype(np.int64) // 60).astype(np.int64)
+    chunk = min(len(times), _chunk_steps(num_sites, grid_shape[0] * grid_shape[1], len(times),
+                                         memory_budget_mb))
+    annotate_stage(num_steps=len(times), grid_cells=grid_shape[0] * grid_shape[1],
+                   num_sites=num_sites, chunk_steps=chunk)
+
+    site_cover = np.empty((chunk,) + grid_shape, dtype=bool)
+    scratch = np.empty((chunk,) + grid_shape, dtype=bool)
+    for t0 in range(0, len(times), chunk):
+        n = min(chunk, len(times) - t0)
+        counts = np.zeros((n,) + grid_shape, dtype=np.uint8)
+        for k in range(num_sites):
+            lo = min_range[k, t0:t0 + n, np.newaxis, np.newaxis]
+            hi = max_range[k, t0:t0 + n, np.newaxis, np.newaxis]
+            cover, tmp = site_cover[:n], scratch[:n]
+            np.greater_equal(ranges[k], lo, out=cover)
+            np.less_equal(ranges[k], hi, out=tmp)
+            cover &= tmp
+            cover &= azimuth_masks[k]
+            counts += cover
+            if cube is not None:
+                cube[t0:t0 + n, k] = np.packbits(cover, axis=-1)
+        stats.update(counts, utc_hours[t0:t0 + n])
+
+    if cube is not None:
+        cube.flush()
+    site_cover = scratch = counts = None    # Release the chunk buffers before results()
+
+    result = stats.results()
+    result.update({'lat_range': lat_range, 'lon_range': lon_range, 'times': times,
+                   'store_path': store_path})
+    return result
+
+def load_coverage_cube(store_path):
+    """
+    Open a stored coverage cube read-only
+    Returns (cube memmap, metadata dict)
+    """
+    with open(store_path + '.json') as f:
+        metadata = json.load(f)
+    return np.load(store_path, mmap_mode='r'), metadata
+
+def coverage_at_step(cube, metadata, step):
+    """
+    Per-site coverage masks (num_sites, lat, lon) for one stored time step
+    """
+    return np.unpackbits(cube[step], axis=-1, count=metadata['num_lon']).astype(bool)
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+    import time
+
+    from OTHR_coverage_model import OTHRParameters
+
+    params = OTHRParameters()
+    store_path = os.path.join(tempfile.gettempdir(), 'OTHR_coverage_cube.npy')
+
+    start = time.perf_counter()
+    result = calculate_coverage_timeseries(params, duration_days=365, step_minutes=15,
+                                           resolution_deg=0.5, memory_budget_mb=128,
+                                           store_path=store_path, seed=0)
+    elapsed = time.perf_counter() - start
+
+    weights = np.cos(np.radians(result['lat_range']))[:, np.newaxis] * \
+        np.ones(result['availability'].shape)
+    ever_covered = result['availability'] > 0
+
+    def area_mean(values):
+        return float((values * weights)[ever_covered].sum() / weights[ever_covered].sum())
+
+    print(f"Time-varying coverage: {result['steps']:,} steps x "
+          f"{result['availability'].size:,} cells x {len(params.sites)} sites in {elapsed:.1f} s")
+    print(f"Cube stored at {store_path} ({os.path.getsize(store_path) / 1e6:.0f} MB)")
+    print("\nOver cells ever covered (area weighted):")
+    print(f"  Mean availability (1+ sites):  {area_mean(result['availability']):.1%}")
+    print(f"  Mean availability (2+ sites):  {area_mean(result['dual_availability']):.1%}")
+    print(f"  Mean worst-hour availability:  {area_mean(result['worst_hour_availability']):.1%}")
+    print(f"  Longest gap (P90 of cells):    "
+          f"{np.percentile(result['longest_gap_hours'][ever_covered], 90):.1f} hours")
@@ -2,9 +2,15 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.colors import ListedColormap, BoundaryNorm
+import io
 import json
 import os
-from OTHR_coverage_model import OTHRParameters, calculate_detection_probability
+from OTHR_coverage_model import OTHRParameters, calculate_detection_probability, calculate_coverage_map
+from OTHR_cost_engine import CostModel
+from OTHR_schedule_engine import compare_schedules
+from OTHR_risk_engine import RiskModel
 
 # Set page config
 st.set_page_config(page_title="Arctic OTHR Analysis Dashboard", layout="wide")
@@ -17,6 +23,95 @@ st.markdown("**UNCLASSIFIED // PUBLIC RELEASE**")
 def load_csv(path):
     return pd.read_csv(path, comment='#')
 
+@st.cache_resource
+def get_base_params():
+    return OTHRParameters()
+
+@st.cache_resource
+def get_cost_engine():
+    """Compiled cost graph plus 10^6 uncertainty draws (built once per process)"""
+    model = CostModel("OTHR_Cost_Model.csv")
+    return model, model.sample(1_000_000, seed=0)
+
+@st.cache_resource
+def get_schedule_analysis():
+    """CPM and Monte Carlo FOC for the baseline and accelerated schedules"""
+    return compare_schedules(num_iterations=20_000, seed=0)
+
+@st.cache_resource
+def get_risk_engine():
+    """Risk register model plus stored occurrence/consequence draws"""
+    model = RiskModel("OTHR_Risk_Register.csv")
+    return model, model.sample(100_000, seed=0)
+
+@st.cache_data(max_entries=64)
+def compute_risk_exposure(mitigated, accelerated):
+    _, samples = get_risk_engine()
+    return samples.evaluate({rid: 'MITIGATED' for rid in mitigated}, accelerated=accelerated)
+
+# Notional additional sites used when the sidebar asks for more than the baseline three
+EXTRA_NOTIONAL_SITES = [
+    {'name': 'Site 4 - Southern Alaska', 'lat': 61.0, 'lon': -150.0, 'azimuth_center': 320, 'coverage_angle': 120},
+    {'name': 'Site 5 - Baffin Island', 'lat': 72.0, 'lon': -75.0, 'azimuth_center': 300, 'coverage_angle': 120},
+]
+
+def site_config(num_sites, coverage_angle):
+    """Hashable site tuple for the first num_sites sites (baseline, then notional extras)"""
+    sites = (get_base_params().sites + EXTRA_NOTIONAL_SITES)[:num_sites]
+    return tuple((s['name'], s['lat'], s['lon'], s['azimuth_center'], coverage_angle) for s in sites)
+
+@st.cache_data(max_entries=64)
+def compute_coverage(sites, min_range_km, max_range_km, resolution_deg):
+    params = OTHRParameters()
+    params.min_range_km = min_range_km
+    params.max_range_km = max_range_km
+    params.sites = [
+        {'name': name, 'lat': lat, 'lon': lon, 'azimuth_center': az, 'coverage_angle': angle}
+        for name, lat, lon, az, angle in sites
+    ]
+    lat_range, lon_range, coverage_grid = calculate_coverage_map(params, resolution_deg)
+    return lat_range, lon_range, coverage_grid.astype(np.uint8)
+
+MAX_DISPLAY_COLUMNS = 800
+
+@st.cache_data(max_entries=64)
+def render_coverage_png(sites, min_range_km, max_range_km, resolution_deg):
+    lat_range, lon_range, coverage_grid = compute_coverage(sites, min_range_km, max_range_km, resolution_deg)
+    max_count = max(len(sites), 1)
+
+    # Raster path: one imshow of the count grid instead of a high-dpi contourf,
+    # decimated to roughly the displayed pixel width
+    stride = max(1, int(np.ceil(len(lon_range) / MAX_DISPLAY_COLUMNS)))
+    lat_range, lon_range = lat_range[::stride], lon_range[::stride]
+    coverage_grid = coverage_grid[::stride, ::stride]
+
+    fig = Figure(figsize=(10, 4.5), dpi=100)
+    fig.subplots_adjust(left=0.07, right=0.98, bottom=0.11, top=0.97)
+    ax = fig.add_subplot()
+    colors = ['white', 'lightblue', 'blue', 'darkblue', 'navy', 'black'][:max_count + 1]
+    cmap = ListedColormap(colors)
+    norm = BoundaryNorm(np.arange(-0.5, max_count + 1), cmap.N)
+    half = resolution_deg * stride / 2
+    image = ax.imshow(coverage_grid, origin='lower', cmap=cmap, norm=norm, alpha=0.8,
+                      interpolation='nearest', aspect='auto',
+                      extent=(lon_range[0] - half, lon_range[-1] + half,
+                              lat_range[0] - half, lat_range[-1] + half))
+    fig.colorbar(image, ax=ax, ticks=range(max_count + 1), label='Number of Sites Covering')
+
+    for name, lat, lon, _, _ in sites:
+        ax.plot(lon, lat, 'r*', markersize=12)
+        ax.text(lon, lat + 1, name, ha='center', fontsize=7, weight='bold')
+
+    ax.set_xlabel('Longitude (degrees)')
+    ax.set_ylabel('Latitude (degrees)')
+    ax.set_xlim(-180, -60)
+    ax.set_ylim(50, 85)
+    ax.grid(True, alpha=0.3)
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png')
+    return buffer.getvalue()
+
 cost_df = load_csv("OTHR_Cost_Model.csv")
 risk_df = load_csv("OTHR_Risk_Register.csv")
 schedule_baseline = load_csv("OTHR_Schedule_Model.csv")
@@ -31,15 +126,20 @@ use_accel = st.sidebar.toggle("Use Accelerated SchedulePath", value=False)
 # Layout: 3 Columns for high-level metrics
 m1, m2, m3 = st.columns(3)
 
-# Calculate dynamic cost based on parameters
-base_total = cost_df.groupby('Category')['Subtotal ($M)'].sum().sum()
-# Simple parametric adjustment logic for dashboard demo
-dynamic_cost = 1735.3 + (num_sites - 3) * 550 + (arctic_multiplier - 2.5) * 150
-if use_accel: dynamic_cost += 150
+# Calculate dynamic cost from the compiled cost model
+cost_model, cost_samples = get_cost_engine()
+base_total = cost_model.evaluate()['total_acquisition']
+cost_rollup = cost_model.evaluate(num_sites, arctic_multiplier)
+cost_stats = cost_samples.evaluate(num_sites, arctic_multiplier)
+accel_premium = 150 if use_accel else 0
+dynamic_cost = cost_rollup['total_acquisition'] + accel_premium
 
-m1.metric("Est. Acquisition Cost", f"${dynamic_cost:,.1f}M", f"{(dynamic_cost-1735.3):.1f}M vs Baseline")
-foc_months = 84 if use_accel else 121
-m2.metric("Program Duration (FOC)", f"{foc_months} Months", f"{foc_months - 121} mo vs Baseline")
+m1.metric("Est. Acquisition Cost", f"${dynamic_cost:,.1f}M", f"{(dynamic_cost-base_total):.1f}M vs Baseline")
+schedule_analysis = get_schedule_analysis()
+schedule_result = schedule_analysis['accelerated' if use_accel else 'baseline']
+foc_months = round(schedule_result['cpm']['foc_month'])
+baseline_foc = round(schedule_analysis['baseline']['cpm']['foc_month'])
+m2.metric("Program Duration (FOC)", f"{foc_months} Months", f"{foc_months - baseline_foc} mo vs Baseline")
 critical_risks = len(risk_df[risk_df['Priority'] == 'Critical'])
 m3.metric("Critical Risks", critical_risks, "3 New (Accel Path)" if use_accel else None)
 
@@ -48,16 +148,28 @@ tab1, tab2, tab3, tab4 = st.tabs(["Coverage & Performance", "Cost Model", "Sched
 
 with tab1:
     st.header("Coverage Visualization")
-    if os.path.exists("OTHR_Coverage_Map.png"):
-        st.image("OTHR_Coverage_Map.png", caption="Baseline Coverage Map (Static Output)")
-    else:
-        st.warning("Run OTHR_coverage_model.py to generate latest map.")
+    base_params = get_base_params()
+    cc1, cc2, cc3, cc4 = st.columns(4)
+    min_range = cc1.slider("Min Range (km)", 200, 1500, base_params.min_range_km, 50)
+    max_range = cc2.slider("Max Range (km)", 1500, 4500, base_params.max_range_km, 100)
+    coverage_angle = cc3.slider("Coverage Angle (deg)", 30, 180, base_params.coverage_angle_deg, 10)
+    resolution = cc4.select_slider("Grid Resolution (deg)", [2.0, 1.0, 0.5, 0.25, 0.1, 0.05], 0.25)
+
+    sites = site_config(num_sites, coverage_angle)
+    lat_range, lon_range, coverage_grid = compute_coverage(sites, min_range, max_range, resolution)
+    st.image(render_coverage_png(sites, min_range, max_range, resolution),
+             caption=f"Live Coverage Map ({num_sites} sites, {resolution}\u00b0 grid)")
+
+    area_weights = np.cos(np.radians(lat_range))[:, np.newaxis] * np.ones(coverage_grid.shape)
+    k1, k2 = st.columns(2)
+    k1.metric("Area Covered (1+ sites)", f"{area_weights[coverage_grid >= 1].sum() / area_weights.sum():.1%}")
+    k2.metric("Area Covered (2+ sites)", f"{area_weights[coverage_grid >= 2].sum() / area_weights.sum():.1%}")
     
     st.header("Detection Performance")
     target_type = st.selectbox("Select Target Profile", ["Large Commercial Aircraft", "Generic Cruise Missile"])
     dist = st.slider("Detection Range (km)", 500, 3000, 1500)
     
-    params = OTHRParameters()
+    params = get_base_params()
     pd_clear = calculate_detection_probability(params, target_type, dist, 'clear')
     pd_aurora = calculate_detection_probability(params, target_type, dist, 'auroral')
     
@@ -66,10 +178,33 @@ with tab1:
     c2.write(f"**Pd (Auroral):** {pd_aurora:.2f}")
 
 with tab2:
+    st.header("Cost Roll-up")
+    r1, r2, r3, r4 = st.columns(4)
+    r1.metric("Point Estimate", f"${dynamic_cost:,.1f}M")
+    r2.metric("P50", f"${cost_stats['P50'] + accel_premium:,.0f}M")
+    r3.metric("P80", f"${cost_stats['P80'] + accel_premium:,.0f}M")
+    r4.metric("P90", f"${cost_stats['P90'] + accel_premium:,.0f}M")
+    st.dataframe(pd.DataFrame({
+        'Category': list(cost_rollup['category_subtotals']) + list(cost_rollup['reserves']),
+        'Subtotal ($M)': list(cost_rollup['category_subtotals'].values()) + list(cost_rollup['reserves'].values())
+    }), use_container_width=True)
+
     st.header("Detailed Cost Breakdown (Parametric)")
     st.dataframe(cost_df, use_container_width=True)
 
 with tab3:
+    st.header("Schedule Risk (Monte Carlo)")
+    schedule_sim = schedule_result['simulation']
+    s1, s2, s3, s4 = st.columns(4)
+    s1.metric("Planned FOC", f"{foc_months} mo")
+    s2.metric("P50 FOC", f"{schedule_sim['P50']:.0f} mo")
+    s3.metric("P80 FOC", f"{schedule_sim['P80']:.0f} mo")
+    s4.metric("P90 FOC", f"{schedule_sim['P90']:.0f} mo")
+    st.dataframe(pd.DataFrame({
+        'Task': list(schedule_sim['criticality']),
+        'Criticality Index': list(schedule_sim['criticality'].values())
+    }).sort_values('Criticality Index', ascending=False), use_container_width=True)
+
     st.header("Program Schedule")
     sched_to_show = schedule_accel if use_accel else schedule_baseline
     st.dataframe(sched_to_show, use_container_width=True)
@@ -81,6 +216,19 @@ with tab4:
     ax.pie(risk_counts, labels=risk_counts.index, autopct='%1.1f%%', colors=['red', 'orange', 'yellow', 'green'])
     st.pyplot(fig)
     
+    st.header("Risk Exposure (Monte Carlo)")
+    risk_model, _ = get_risk_engine()
+    mitigated = st.multiselect("Risks with mitigation in place",
+                               [r['id'] for r in risk_model.risks],
+                               format_func=lambda rid: f"{rid} - {risk_model.risks[risk_model.ids.index(rid)]['description']}")
+    exposure = compute_risk_exposure(tuple(sorted(mitigated)), use_accel)
+    e1, e2, e3, e4 = st.columns(4)
+    e1.metric("Expected Cost Exposure", f"${exposure['expected_cost']:,.0f}M")
+    e2.metric("P90 Cost Exposure", f"${exposure['P90_cost']:,.0f}M")
+    e3.metric("Expected Schedule Exposure", f"{exposure['expected_schedule']:.1f} mo")
+    e4.metric("P90 Schedule Exposure", f"{exposure['P90_schedule']:.1f} mo")
+    st.dataframe(pd.DataFrame(exposure['ranking']), use_container_width=True)
+
     st.header("Critical Mitigations")
     st.table(risk_df[risk_df['Priority'] == 'Critical'][['Risk ID', 'Risk Description', 'Mitigation Strategy']])
 
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Arctic OTHR Equal-Area Coverage Grid
+Alternative grid backend for coverage area statistics at high latitude
+
+UNCLASSIFIED // PUBLIC RELEASE
+Version: 1.0 Framework
+
+PURPOSE: The regular lat/lon grid of calculate_coverage_map shrinks its
+         cells toward the pole (a 1 deg cell at 84N is a tenth of the area
+         of one at 50N), so most cells oversample longitude and raw cell
+         counts misstate area. This grid splits the domain into latitude
+         bands of roughly cell_size_km height and divides each band into
+         the number of equal cells that keeps the cell area near
+         cell_size_km^2. Every cell carries its exact area, so coverage
+         statistics are area-weighted by construction and reach the same
+         area accuracy with several times fewer cells.
+
+         Results can be resampled onto the lat/lon grid for the existing
+         plots (see EqualAreaGrid.to_latlon and plot_coverage_map(grid=...)).
+"""
+
+import numpy as np
+
+from OTHR_coverage_model import COVERAGE_BLOCK_CELLS, coverage_mask
+from OTHR_instrumentation import annotate_stage, instrumented
+
+# ============================================================================
+# GRID CONFIGURATION
+# ============================================================================
+
+EARTH_RADIUS_KM = 6371
+DEFAULT_CELL_SIZE_KM = 50.0
+
+# Model domain (same as calculate_coverage_map)
+LAT_BOUNDS = (50.0, 85.0)
+LON_BOUNDS = (-180.0, -60.0)
+
+# ============================================================================
+# EQUAL-AREA GRID
+# ============================================================================
+
+class EqualAreaGrid:
+    """
+    Latitude bands split into equal-area cells
+
+    cell_lat, cell_lon: cell centers (degrees), band by band from the south
+    cell_area_km2:      exact area of each cell
+    band_edges:         band boundary latitudes (degrees)
+    band_counts:        cells per band; band_offsets index into the cell arrays
+    """
+
+    def __init__(self, cell_size_km=DEFAULT_CELL_SIZE_KM, lat_bounds=LAT_BOUNDS,
+                 lon_bounds=LON_BOUNDS):
+        self.cell_size_km = cell_size_km
+        self.lat_bounds = lat_bounds
+        self.lon_bounds = lon_bounds
+
+        lat_span_km = EARTH_RADIUS_KM * np.radians(lat_bounds[1] - lat_bounds[0])
+        num_bands = max(1, int(np.ceil(lat_span_km / cell_size_km)))
+        self.band_edges = np.linspace(lat_bounds[0], lat_bounds[1], num_bands + 1)
+
+        lon_span_rad = np.radians(lon_bounds[1] - lon_bounds[0])
+        sin_edges = np.sin(np.radians(self.band_edges))
+        band_area_km2 = EARTH_RADIUS_KM ** 2 * lon_span_rad * np.diff(sin_edges)
+        self.band_counts = np.maximum(1, np.rint(band_area_km2 / cell_size_km ** 2)).astype(np.int64)
+        self.band_offsets = np.concatenate([[0], np.cumsum(self.band_counts)])
+
+        # Area-weighted band center latitude, then evenly spaced longitudes
+        band_lat = np.degrees(np.arcsin((sin_edges[:-1] + sin_edges[1:]) / 2))
+        band = np.repeat(np.arange(num_bands), self.band_counts)
+        column = np.arange(self.num_cells) - self.band_offsets[band]
+        self.cell_lat = band_lat[band]
+        self.cell_lon = lon_bounds[0] + (column + 0.5) * \
+            (lon_bounds[1] - lon_bounds[0]) / self.band_counts[band]
+        self.cell_area_km2 = (band_area_km2 / self.band_counts)[band]
+
+    @property
+    def num_cells(self):
+        return int(self.band_offsets[-1])
+
+    @property
+    def total_area_km2(self):
+        return float(self.cell_area_km2.sum())
+
+    def cell_index(self, lat, lon):
+        """
+        Index of the cell containing each point (-1 outside the domain)
+        """
+        lat = np.asarray(lat, dtype=float)
+        lon = np.asarray(lon, dtype=float)
+        band = np.searchsorted(self.band_edges, lat, side='right') - 1
+        inside = (band >= 0) & (band < len(self.band_counts)) & \
+            (lon >= self.lon_bounds[0]) & (lon < self.lon_bounds[1])
+        band = np.clip(band, 0, len(self.band_counts) - 1)
+
+        counts = self.band_counts[band]
+        column = ((lon - self.lon_bounds[0]) / (self.lon_bounds[1] - self.lon_bounds[0])
+                  * counts).astype(np.int64)
+        column = np.clip(column, 0, counts - 1)
+        return np.where(inside, self.band_offsets[band] + column, -1)
+
+    def to_latlon(self, values, resolution_deg=0.25, fill_value=0):
+        """
+        Resample per-cell values onto the regular lat/lon grid used by
+        calculate_coverage_map (for plotting)
+        Returns (lat_range, lon_range, grid)
+        """
+        lat_range = np.arange(self.lat_bounds[0], self.lat_bounds[1], resolution_deg)
+        lon_range = np.arange(self.lon_bounds[0], self.lon_bounds[1], resolution_deg)
+        index = self.cell_index(lat_range[:, np.newaxis], lon_range[np.newaxis, :])
+        values = np.asarray(values)
+        grid = np.where(index >= 0, values[np.maximum(index, 0)], fill_value)
+        return lat_range, lon_range, grid
+
+# ============================================================================
+# COVERAGE ON THE EQUAL-AREA GRID
+# ============================================================================
+
+def calculate_site_masks_equal_area(params, grid):
+    """
+    Per-site coverage masks over the grid cells
+    Returns boolean array of shape (num_sites, grid.num_cells)
+    """
+    masks = np.zeros((len(params.sites), grid.num_cells), dtype=bool)
+    for k, site in enumerate(params.sites):
+        for i in range(0, grid.num_cells, COVERAGE_BLOCK_CELLS):
+            block = slice(i, i + COVERAGE_BLOCK_CELLS)
+            masks[k, block], _, _ = coverage_mask(
+                grid.cell_lat[block], grid.cell_lon[block],
+                site['lat'], site['lon'],
+                site['azimuth_center'], site['coverage_angle'],
+                params.min_range_km, params.max_range_km
+            )
+    return masks
+
+@instrumented()
+def calculate_coverage_equal_area(params, cell_size_km=DEFAULT_CELL_SIZE_KM,
+                                  return_site_masks=False):
+    """
+    Equal-area counterpart of calculate_coverage_map
+    Returns (grid, coverage_counts) with one count per cell, plus the
+    per-site masks as a third element if return_site_masks is True
+    """
+    grid = EqualAreaGrid(cell_size_km)
+    site_masks = calculate_site_masks_equal_area(params, grid)
+    coverage_counts = site_masks.sum(axis=0, dtype=np.int16)
+    annotate_stage(grid_cells=grid.num_cells, num_sites=len(params.sites),
+                   cell_size_km=cell_size_km)
+
+    if return_site_masks:
+        return grid, coverage_counts, site_masks
+    return grid, coverage_counts
+
+def latlon_cell_areas(lat_range, lon_range):
+    """
+    Exact areas (km^2) of lat/lon grid cells centered on lat_range x lon_range,
+    so lat/lon coverage grids can use coverage_area_statistics too
+    """
+    lat_range = np.asarray(lat_range, dtype=float)
+    dlat = np.radians(lat_range[1] - lat_range[0]) if len(lat_range) > 1 else 0.0
+    dlon = np.radians(lon_range[1] - lon_range[0]) if len(lon_range) > 1 else 0.0
+    lat_rad = np.radians(lat_range)
+    row_area = EARTH_RADIUS_KM ** 2 * dlon * \
+        (np.sin(lat_rad + dlat / 2) - np.sin(lat_rad - dlat / 2))
+    return np.broadcast_to(row_area[:, np.newaxis], (len(lat_range), len(lon_range)))
+
+def coverage_area_statistics(coverage_counts, cell_area_km2):
+    """
+    Area-weighted single/dual/triple coverage
+    coverage_counts and cell_area_km2 must have the same shape (equal-area
+    cells or a lat/lon grid with latlon_cell_areas)
+    Returns dict of areas (km^2) and fractions of the grid area
+    """
+    counts = np.asarray(coverage_counts).ravel()
+    area = np.asarray(cell_area_km2, dtype=float).ravel()
+    total = float(area.sum())
+    # Area covered by exactly k sites, then cumulative from the top (k or more)
+    exact = np.bincount(np.minimum(counts, 3).astype(np.int64), weights=area, minlength=4)
+    at_least = np.cumsum(exact[::-1])[::-1]
+
+    return {
+        'total_area_km2': total,
+        'single_coverage_km2': float(at_least[1]),
+        'dual_coverage_km2': float(at_least[2]),
+        'triple_coverage_km2': float(at_least[3]),
+        'single_coverage_fraction': float(at_least[1] / total),
+        'dual_coverage_fraction': float(at_least[2] / total),
+        'triple_coverage_fraction': float(at_least[3] / total)
+    }
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    import time
+    from OTHR_coverage_model import OTHRParameters, calculate_coverage_map
+
+    params = OTHRParameters()
+
+    print("Coverage areas: equal-area grid vs lat/lon grid")
+    print("-" * 78)
+    print(f"{'Grid':22s} {'Cells':>9s} {'1+ sites (km2)':>15s} {'2+ sites (km2)':>15s} "
+          f"{'3 sites (km2)':>14s} {'ms':>6s}")
+
+    for cell_size in [100.0, 50.0, 25.0]:
+        start = time.perf_counter()
+        grid, counts = calculate_coverage_equal_area(params, cell_size)
+        stats = coverage_area_statistics(counts, grid.cell_area_km2)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{f'equal-area {cell_size:g} km':22s} {grid.num_cells:9d} "
+              f"{stats['single_coverage_km2']:15,.0f} {stats['dual_coverage_km2']:15,.0f} "
+              f"{stats['triple_coverage_km2']:14,.0f} {elapsed:6.0f}")
+
+    for resolution in [1.0, 0.5, 0.25]:
+        start = time.perf_counter()
+        lat_range, lon_range, coverage_grid = calculate_coverage_map(params, resolution)
+        stats = coverage_area_statistics(coverage_grid.astype(np.int16),
+                                         latlon_cell_areas(lat_range, lon_range))
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{f'lat/lon {resolution:g} deg':22s} {coverage_grid.size:9d} "
+              f"{stats['single_coverage_km2']:15,.0f} {stats['dual_coverage_km2']:15,.0f} "
+              f"{stats['triple_coverage_km2']:14,.0f} {elapsed:6.0f}")
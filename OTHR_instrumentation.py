@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Arctic OTHR Stage Instrumentation
+Opt-in timing and memory records for the major model stages
+
+UNCLASSIFIED // PUBLIC RELEASE
+Version: 1.0 Framework
+
+PURPOSE: Show where a slow run spends its time (coverage, summary, plotting,
+         savefig, export). Each instrumented stage records wall time, CPU
+         time, Python-traced peak memory (tracemalloc, which does not see
+         C library allocations such as Agg buffers), growth of the process
+         RSS high-water mark, and any fields the stage attaches (such as
+         grid size), and emits them to the console or a JSON-lines file.
+         When disabled, a stage costs one flag check.
+
+USAGE:
+    OTHR_INSTRUMENT=console python3 OTHR_coverage_model.py
+    OTHR_INSTRUMENT=json:stages.jsonl python3 OTHR_coverage_model.py
+
+    or from Python:
+        enable_instrumentation('console')
+        with stage('my_stage', scenarios=10):
+            ...
+"""
+
+import functools
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:     # Not available on Windows
+    resource = None
+
+# ============================================================================
+# INSTRUMENTATION STATE
+# ============================================================================
+
+class _State:
+    enabled = False
+    sink = 'console'        # 'console', 'memory' or a JSON-lines file path
+    records = []
+    stack = []              # Open stage frames (innermost last)
+    started_tracemalloc = False
+
+_state = _State()
+
+def enable_instrumentation(sink='console'):
+    """
+    Start recording stages
+    sink: 'console' (stderr), 'memory' (see get_records) or a file path
+          that receives one JSON object per stage
+    """
+    _state.sink = sink
+    _state.records = []
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _state.started_tracemalloc = True
+    _state.enabled = True
+
+def disable_instrumentation():
+    """
+    Stop recording stages (records collected so far are kept)
+    """
+    _state.enabled = False
+    if _state.started_tracemalloc:
+        tracemalloc.stop()
+        _state.started_tracemalloc = False
+
+def instrumentation_enabled():
+    return _state.enabled
+
+def get_records():
+    """
+    Stage records collected since instrumentation was enabled
+    """
+    return list(_state.records)
+
+def _configure_from_environment():
+    setting = os.environ.get('OTHR_INSTRUMENT', '').strip()
+    if not setting or setting == '0':
+        return
+    if setting.startswith('json:'):
+        enable_instrumentation(setting[len('json:'):])
+    elif setting == 'memory':
+        enable_instrumentation('memory')
+    else:
+        enable_instrumentation('console')
+
+# ============================================================================
+# STAGE RECORDING
+# ============================================================================
+
+_CORE_FIELDS = ('stage', 'parent', 'depth', 'wall_sec', 'cpu_sec', 'peak_mem_mb',
+                'rss_hwm_growth_mb')
+
+# ru_maxrss is reported in kilobytes on Linux and in bytes on macOS
+_MAXRSS_BYTES = 1 if sys.platform == 'darwin' else 1024
+
+def _max_rss_bytes():
+    """
+    Process RSS high-water mark (None where resource is unavailable)
+    """
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _MAXRSS_BYTES
+
+def _emit(record):
+    _state.records.append(record)
+
+    if _state.sink == 'memory':
+        return
+    if _state.sink == 'console':
+        indent = '  ' * record['depth']
+        extra = ''.join(f" {k}={v}" for k, v in record.items() if k not in _CORE_FIELDS)
+        rss = record['rss_hwm_growth_mb']
+        print(f"[stage] {indent}{record['stage']:<{32 - len(indent)}s} "
+              f"wall {record['wall_sec'] * 1000:9.1f} ms  "
+              f"cpu {record['cpu_sec'] * 1000:9.1f} ms  "
+              f"py-peak {record['peak_mem_mb']:8.1f} MB  "
+              f"rss-hwm +{'n/a' if rss is None else f'{rss:.1f}'} MB{extra}", file=sys.stderr)
+    else:
+        with open(_state.sink, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+
+@contextmanager
+def _recorded_stage(name, fields):
+    frame = {'name': name, 'fields': dict(fields), 'peak': 0}
+    parent = _state.stack[-1] if _state.stack else None
+
+    # tracemalloc keeps a single peak, so the enclosing stage's peak so far
+    # is saved before resetting it for this stage
+    if parent is not None:
+        parent['peak'] = max(parent['peak'], tracemalloc.get_traced_memory()[1])
+    base_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    base_rss = _max_rss_bytes()
+
+    _state.stack.append(frame)
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    try:
+        yield frame['fields']
+    finally:
+        wall_sec = time.perf_counter() - wall_start
+        cpu_sec = time.process_time() - cpu_start
+        _state.stack.pop()
+
+        peak = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+        if parent is not None:
+            parent['peak'] = max(parent['peak'], peak)
+        end_rss = _max_rss_bytes()
+
+        record = {
+            'stage': name,
+            'parent': parent['name'] if parent is not None else None,
+            'depth': len(_state.stack),
+            'wall_sec': wall_sec,
+            'cpu_sec': cpu_sec,
+            # Python-traced peak above the stage's starting allocation
+            'peak_mem_mb': max(0, peak - base_memory) / (1024 * 1024),
+            # Growth of the process-wide RSS high-water mark (includes C
+            # allocations; 0 when the stage stays under an earlier peak)
+            'rss_hwm_growth_mb': None if base_rss is None else (end_rss - base_rss) / (1024 * 1024)
+        }
+        record.update(frame['fields'])
+        _emit(record)
+
+@contextmanager
+def _null_stage():
+    yield {}
+
+def stage(name, **fields):
+    """
+    Context manager around one stage; yields a dict the stage can add
+    fields to (e.g. grid_cells). Does nothing when disabled.
+    """
+    if not _state.enabled:
+        return _null_stage()
+    return _recorded_stage(name, fields)
+
+def annotate_stage(**fields):
+    """
+    Attach fields to the innermost open stage (no-op when disabled)
+    """
+    if _state.enabled and _state.stack:
+        _state.stack[-1]['fields'].update(fields)
+
+def instrumented(name=None):
+    """
+    Decorator recording each call of a function as a stage
+    """
+    def decorator(func):
+        stage_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _state.enabled:
+                return func(*args, **kwargs)
+            with _recorded_stage(stage_name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+_configure_from_environment()
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Arctic OTHR Parameter Sweep Runner
+Runs trade-study grids over OTHRParameters fields across a process pool
+
+UNCLASSIFIED // PUBLIC RELEASE
+Version: 1.0 Framework
+
+PURPOSE: Replace one-at-a-time edits of OTHRParameters with a sweep over
+         value grids. Scenarios are memoized by parameter hash and grid
+         resolution, completed chunks are written to disk as they finish
+         (so an interrupted sweep resumes where it stopped), and all results
+         are consolidated into one columnar .npz file.
+
+USAGE:
+    python3 OTHR_parameter_sweep.py \\
+        --param min_range_km=300:800:6 \\
+        --param "sites[1].azimuth_center=330,340,350" \\
+        --output sweep_results.npz --workers 8
+"""
+
+import argparse
+import glob
+import hashlib
+import itertools
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from OTHR_coverage_model import (OTHRParameters, apply_parameter_overrides,
+                                 calculate_coverage_map, detection_range_table)
+
+# ============================================================================
+# SWEEP DEFAULTS
+# ============================================================================
+
+DEFAULT_CHUNK_SIZE = 25         # Scenarios per worker task
+DEFAULT_RESOLUTION_DEG = 1.0    # Coverage grid resolution for sweeps
+PD_THRESHOLD = 0.5              # Pd threshold for detection ranges
+
+# ============================================================================
+# SCENARIO DEFINITION
+# ============================================================================
+
+def parameter_hash(params):
+    """
+    Hash of the full parameter set, used to memoize scenario results
+    """
+    encoded = json.dumps(vars(params), sort_keys=True, default=float).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()[:32]
+
+def scenario_hash(params, resolution_deg=DEFAULT_RESOLUTION_DEG):
+    """
+    Hash of a parameter set together with the coverage grid resolution,
+    used as the sweep's memo and resume key
+    """
+    encoded = f'{parameter_hash(params)}:{float(resolution_deg)!r}'.encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()[:32]
+
+def expand_grid(grid):
+    """
+    Cartesian product of a {field: [values]} grid
+    Returns list of override dicts
+    """
+    fields = list(grid.keys())
+    return [dict(zip(fields, values))
+            for values in itertools.product(*(grid[f] for f in fields))]
+
+def parse_param_spec(spec):
+    """
+    Parse a CLI sweep spec 'field=start:stop:num' (inclusive linspace)
+    or 'field=v1,v2,...'
+    Returns (field, list of values)
+    """
+    field, _, values = spec.partition('=')
+    if not values:
+        raise ValueError(f"Sweep spec must be field=values: {spec}")
+
+    if ':' in values:
+        start, stop, num = values.split(':')
+        values = np.linspace(float(start), float(stop), int(num))
+    else:
+        values = [float(v) for v in values.split(',')]
+
+    # Keep whole numbers as ints so integer-valued fields stay integers
+    return field, [int(v) if float(v).is_integer() else float(v) for v in values]
+
+def _column_name(text):
+    return re.sub(r'[^0-9a-zA-Z]+', '_', text).strip('_').lower()
+
+# ============================================================================
+# SCENARIO EVALUATION
+# ============================================================================
+
+def evaluate_scenario(params, resolution_deg=DEFAULT_RESOLUTION_DEG):
+    """
+    Coverage fractions and detection ranges for one parameter set
+    Coverage fractions are area weighted (cos(lat)) over the model grid
+
+    Returns flat dict of result columns
+    """
+    lat_range, _, coverage_grid = calculate_coverage_map(params, resolution_deg)
+    weights = np.cos(np.radians(lat_range))[:, np.newaxis] * np.ones_like(coverage_grid)
+    total = weights.sum()
+
+    result = {
+        'coverage_fraction_single': float(weights[coverage_grid >= 1].sum() / total),
+        'coverage_fraction_dual': float(weights[coverage_grid >= 2].sum() / total),
+        'coverage_fraction_triple': float(weights[coverage_grid >= 3].sum() / total)
+    }
+
+    table = detection_range_table(params, pd_thresholds=PD_THRESHOLD)
+    for k, target_type in enumerate(table['target_types']):
+        for c, conditions in enumerate(table['conditions']):
+            column = f'detection_range_{conditions}_km_{_column_name(target_type)}'
+            result[column] = float(table['range_km'][k, 0, c])
+
+    return result
+
+def _run_chunk(base_params, chunk, resolution_deg):
+    """
+    Worker task: evaluate a list of (scenario_hash, overrides) pairs
+    """
+    rows = []
+    for key, overrides in chunk:
+        params = apply_parameter_overrides(base_params, overrides)
+        row = {'scenario_hash': key, 'resolution_deg': float(resolution_deg)}
+        row.update({_column_name(k): float(v) for k, v in overrides.items()})
+        row.update(evaluate_scenario(params, resolution_deg))
+        rows.append(row)
+    return rows
+
+# ============================================================================
+# RESULT STORAGE
+# ============================================================================
+
+def _parts_dir(output_path):
+    return output_path + '.parts'
+
+def _write_part(output_path, rows):
+    """
+    Persist one finished chunk as its own columnar file
+    """
+    parts_dir = _parts_dir(output_path)
+    os.makedirs(parts_dir, exist_ok=True)
+
+    columns = {key: np.array([row[key] for row in rows]) for key in rows[0]}
+    digest = hashlib.sha256(''.join(columns['scenario_hash']).encode()).hexdigest()[:16]
+    final_path = os.path.join(parts_dir, f'part-{digest}.npz')
+    tmp_path = final_path + '.tmp.npz'
+    np.savez(tmp_path, **columns)
+    os.replace(tmp_path, final_path)
+
+def load_results(output_path):
+    """
+    Load sweep results (consolidated file plus any unmerged chunk files)
+    Returns dict of column arrays, one row per unique scenario
+    """
+    paths = sorted(glob.glob(os.path.join(_parts_dir(output_path), 'part-*.npz')))
+    if os.path.exists(output_path):
+        paths.insert(0, output_path)
+
+    rows = {}
+    for path in paths:
+        with np.load(path) as data:
+            columns = {key: data[key] for key in data.files}
+        for k, key in enumerate(columns['scenario_hash']):
+            rows[str(key)] = {key: values[k] for key, values in columns.items()}
+
+    if not rows:
+        return {}
+
+    keys = sorted({key for row in rows.values() for key in row})
+    return {
+        key: np.array([row.get(key, np.nan) for row in rows.values()])
+        for key in keys
+    }
+
+def _consolidate(output_path):
+    """
+    Merge chunk files into the single columnar output file
+    """
+    columns = load_results(output_path)
+    if not columns:
+        return columns
+
+    tmp_path = output_path + '.tmp.npz'
+    np.savez(tmp_path, **columns)
+    os.replace(tmp_path, output_path)
+
+    for path in glob.glob(os.path.join(_parts_dir(output_path), 'part-*.npz')):
+        os.remove(path)
+    try:
+        os.rmdir(_parts_dir(output_path))
+    except OSError:
+        pass
+    return columns
+
+# ============================================================================
+# SWEEP RUNNER
+# ============================================================================
+
+def run_sweep(grid, output_path, base_params=None, workers=None,
+              chunk_size=DEFAULT_CHUNK_SIZE, resolution_deg=DEFAULT_RESOLUTION_DEG,
+              progress=True):
+    """
+    Evaluate every scenario in a {field: [values]} grid
+
+    Scenarios whose hash (parameters and resolution) is already present in output_path (or
+    its chunk directory from an interrupted run) are skipped. Pending
+    scenarios are split into chunks and fanned out over a process pool
+    (workers=1 runs in-process).
+
+    Returns dict of result columns for all scenarios in the output file
+    """
+    base_params = base_params or OTHRParameters()
+    scenarios = expand_grid(grid)
+
+    done = set(str(h) for h in load_results(output_path).get('scenario_hash', []))
+    pending, seen = [], set()
+    for overrides in scenarios:
+        key = scenario_hash(apply_parameter_overrides(base_params, overrides), resolution_deg)
+        if key not in done and key not in seen:
+            seen.add(key)
+            pending.append((key, overrides))
+
+    if progress:
+        print(f"{len(scenarios)} scenarios, {len(scenarios) - len(pending)} already "
+              f"computed, {len(pending)} to run")
+
+    chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+    workers = workers or os.cpu_count() or 1
+    completed = 0
+
+    if workers == 1:
+        for chunk in chunks:
+            _write_part(output_path, _run_chunk(base_params, chunk, resolution_deg))
+            completed += len(chunk)
+            if progress:
+                print(f"  {completed}/{len(pending)} scenarios complete")
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_run_chunk, base_params, chunk, resolution_deg): len(chunk)
+                       for chunk in chunks}
+            for future in as_completed(futures):
+                _write_part(output_path, future.result())
+                completed += futures[future]
+                if progress:
+                    print(f"  {completed}/{len(pending)} scenarios complete")
+
+    return _consolidate(output_path)
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run an OTHR parameter sweep")
+    parser.add_argument('--param', action='append', required=True,
+                        help="Sweep spec field=start:stop:num or field=v1,v2,... "
+                             "(per-site fields as sites[<index>].<field>)")
+    parser.add_argument('--output', default='OTHR_Sweep_Results.npz',
+                        help="Columnar .npz results file")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Worker processes (default: all cores)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--resolution', type=float, default=DEFAULT_RESOLUTION_DEG,
+                        help="Coverage grid resolution (degrees)")
+    args = parser.parse_args(argv)
+
+    grid = dict(parse_param_spec(spec) for spec in args.param)
+    columns = run_sweep(grid, args.output, workers=args.workers,
+                        chunk_size=args.chunk_size, resolution_deg=args.resolution)
+    print(f"Results for {len(columns.get('scenario_hash', []))} scenarios saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
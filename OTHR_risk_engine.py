@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Arctic OTHR Risk Exposure Engine
+Quantitative cost and schedule exposure from OTHR_Risk_Register.csv
+
+UNCLASSIFIED // PUBLIC RELEASE
+Version: 1.0 Framework
+
+PURPOSE: Turn the register's 1-5 likelihood/impact scores into occurrence
+         probabilities and cost/schedule consequence distributions, sample
+         joint risk occurrence over many trials with vectorized Bernoulli
+         draws, and report expected and P90 exposure with per-risk
+         contribution rankings. The uniform draws and consequence draws are
+         kept, so re-evaluating after a mitigation status change is one
+         comparison and one reduction over the stored arrays (common random
+         numbers keep before/after comparisons stable).
+
+MODEL ASSUMPTIONS:
+- Likelihood scores map to the midpoints of the usual DoD probability bands
+- Impact scores map to triangular cost ($M) and schedule (months)
+  consequences, weighted by risk category (cost risks carry little
+  schedule consequence and vice versa)
+- Risk occurrences are independent. Cost consequences add; schedule delays
+  mostly fall on parallel activities, so the program delay in a trial is the
+  largest delay plus a fraction of the others
+- Mitigation status scales the occurrence probability
+- Risks whose description mentions the accelerated path apply only to it
+"""
+
+import csv
+import re
+
+import numpy as np
+
+# ============================================================================
+# MODEL CONFIGURATION
+# ============================================================================
+
+DEFAULT_RISK_CSV = 'OTHR_Risk_Register.csv'
+
+# Occurrence probability per likelihood score (1=Rare ... 5=Almost Certain)
+LIKELIHOOD_PROBABILITY = {1: 0.05, 2: 0.20, 3: 0.40, 4: 0.60, 5: 0.85}
+
+# Triangular (low, mode, high) consequences per impact score
+IMPACT_COST_MUSD = {
+    1: (0.0, 1.0, 3.0),
+    2: (2.0, 5.0, 10.0),
+    3: (5.0, 12.0, 25.0),
+    4: (10.0, 25.0, 50.0),
+    5: (25.0, 50.0, 100.0)
+}
+IMPACT_SCHEDULE_MONTHS = {
+    1: (0.0, 0.5, 1.0),
+    2: (0.5, 1.0, 3.0),
+    3: (1.0, 3.0, 6.0),
+    4: (3.0, 6.0, 12.0),     # "+6-12 months" in the schedule risk table
+    5: (6.0, 12.0, 24.0)
+}
+
+# (cost weight, schedule weight) of the consequences by risk category
+CATEGORY_CONSEQUENCE_WEIGHTS = {
+    'Technical': (1.0, 0.5),
+    'Schedule': (0.5, 1.0),
+    'Cost': (1.0, 0.0),
+    'Performance': (1.0, 0.25),
+    'Programmatic': (0.75, 1.0),
+    'Operational': (0.5, 0.0),
+    'Environmental': (0.5, 1.0),
+    'Safety': (0.5, 0.25),
+    'Cybersecurity': (0.75, 0.0),
+    'Legal': (0.5, 1.0),
+    'Supply Chain': (0.75, 0.5)
+}
+DEFAULT_CONSEQUENCE_WEIGHTS = (1.0, 1.0)
+
+# Occurrence probability multiplier by mitigation status
+STATUS_PROBABILITY_FACTOR = {
+    'OPEN': 1.0,
+    'IN PROGRESS': 0.75,
+    'MITIGATED': 0.4,
+    'CLOSED': 0.0
+}
+
+SCHEDULE_SERIAL_FRACTION = 0.25   # Share of non-largest delays that adds to the program delay
+
+ACCELERATED_PATTERN = re.compile(r'accelerated', re.IGNORECASE)
+TRIAL_CHUNK = 50_000            # Trials drawn per chunk
+
+# ============================================================================
+# REGISTER PARSING
+# ============================================================================
+
+class RiskModel:
+    """
+    Risk register compiled into probability and consequence arrays
+
+    risks: list of risk dicts (id, category, description, likelihood,
+           impact, priority, status, owner, accelerated_only)
+    """
+
+    def __init__(self, path=DEFAULT_RISK_CSV):
+        self.path = path
+        self.risks = []
+        self._parse(path)
+        self._compile()
+
+    def _parse(self, path):
+        with open(path, newline='') as f:
+            rows = [row for row in csv.reader(line for line in f
+                                              if not line.lstrip().startswith('#'))]
+
+        # The summary tables after the register reuse the file, so only rows
+        # with a risk ID are taken
+        for row in rows[1:]:
+            if not row or not re.fullmatch(r'R\d+', row[0].strip()):
+                continue
+            row = [c.strip() for c in (row + [''] * 11)[:11]]
+            risk_id, category, description, likelihood, impact, _, priority, \
+                mitigation, owner, status, notes = row
+            self.risks.append({
+                'id': risk_id,
+                'category': category,
+                'description': description,
+                'likelihood': int(likelihood),
+                'impact': int(impact),
+                'priority': priority,
+                'mitigation': mitigation,
+                'owner': owner,
+                'status': status.upper(),
+                'accelerated_only': bool(ACCELERATED_PATTERN.search(description))
+            })
+
+    def _compile(self):
+        self.ids = [r['id'] for r in self.risks]
+        self.base_probabilities = np.array([LIKELIHOOD_PROBABILITY[r['likelihood']]
+                                            for r in self.risks])
+        weights = np.array([CATEGORY_CONSEQUENCE_WEIGHTS.get(r['category'],
+                                                             DEFAULT_CONSEQUENCE_WEIGHTS)
+                            for r in self.risks])
+        self.cost_triangles = weights[:, :1] * np.array([IMPACT_COST_MUSD[r['impact']]
+                                                         for r in self.risks])
+        self.schedule_triangles = weights[:, 1:] * np.array([IMPACT_SCHEDULE_MONTHS[r['impact']]
+                                                             for r in self.risks])
+        self.accelerated_only = np.array([r['accelerated_only'] for r in self.risks])
+
+    def set_status(self, risk_id, status):
+        """
+        Change the mitigation status of one risk (see STATUS_PROBABILITY_FACTOR)
+        """
+        status = status.upper()
+        if status not in STATUS_PROBABILITY_FACTOR:
+            raise ValueError(f"Unknown mitigation status: {status}")
+        self.risks[self._index(risk_id)]['status'] = status
+
+    def _index(self, risk_id):
+        try:
+            return self.ids.index(risk_id)
+        except ValueError:
+            raise KeyError(f"Unknown risk: {risk_id}") from None
+
+    def probabilities(self, status_overrides=None, accelerated=False):
+        """
+        Occurrence probability per risk for the current statuses
+        status_overrides: optional dict risk_id -> status (not stored)
+        """
+        statuses = [r['status'] for r in self.risks]
+        for risk_id, status in (status_overrides or {}).items():
+            statuses[self._index(risk_id)] = status.upper()
+        factors = np.array([STATUS_PROBABILITY_FACTOR[s] for s in statuses])
+        probabilities = self.base_probabilities * factors
+        if not accelerated:
+            probabilities = np.where(self.accelerated_only, 0.0, probabilities)
+        return probabilities
+
+    def sample(self, num_trials=100_000, seed=None):
+        """
+        Draw occurrence uniforms and consequences for every risk and trial;
+        the draws stay valid for any mitigation statuses
+        Returns RiskSamples
+        """
+        rng = np.random.default_rng(seed)
+        num_risks = len(self.risks)
+        uniforms = np.empty((num_trials, num_risks), dtype=np.float32)
+        cost = np.empty((num_trials, num_risks), dtype=np.float32)
+        schedule = np.empty((num_trials, num_risks), dtype=np.float32)
+
+        def triangular(triangles, n):
+            low, mode, high = triangles.T
+            # Zero-width triangles (zero weight) are rejected by numpy
+            return np.where(high > low,
+                            rng.triangular(low, mode, np.maximum(high, low + 1e-9),
+                                           size=(n, num_risks)),
+                            mode)
+
+        for start in range(0, num_trials, TRIAL_CHUNK):
+            n = min(TRIAL_CHUNK, num_trials - start)
+            uniforms[start:start + n] = rng.random((n, num_risks))
+            cost[start:start + n] = triangular(self.cost_triangles, n)
+            schedule[start:start + n] = triangular(self.schedule_triangles, n)
+
+        return RiskSamples(self, uniforms, cost, schedule)
+
+class RiskSamples:
+    """
+    Stored risk draws; evaluate() applies occurrence probabilities to them
+    """
+
+    def __init__(self, model, uniforms, cost, schedule):
+        self.model = model
+        self.uniforms = uniforms
+        self.cost = cost
+        self.schedule = schedule
+
+    def evaluate(self, status_overrides=None, accelerated=False, tail_percentile=90):
+        """
+        Exposure for the current (or overridden) mitigation statuses
+        Returns dict with cost ($M) and schedule (months) exposure statistics
+        and a per-risk ranking by expected cost contribution
+        """
+        model = self.model
+        probabilities = model.probabilities(status_overrides, accelerated).astype(np.float32)
+        occurred = self.uniforms < probabilities
+        cost = np.where(occurred, self.cost, np.float32(0))
+        schedule = np.where(occurred, self.schedule, np.float32(0))
+        total_cost = cost.sum(axis=1)
+        largest_delay = schedule.max(axis=1)
+        total_schedule = largest_delay + SCHEDULE_SERIAL_FRACTION * (schedule.sum(axis=1) - largest_delay)
+
+        # Tail contribution: mean cost of each risk over the trials at or
+        # beyond the tail percentile of total cost
+        cost_tail = np.percentile(total_cost, tail_percentile)
+        tail = total_cost >= cost_tail
+        tail_contribution = cost[tail].mean(axis=0) if tail.any() else np.zeros(len(model.risks))
+
+        expected_cost = cost.mean(axis=0)
+        expected_schedule = schedule.mean(axis=0)
+        ranking = sorted((
+            {
+                'id': risk['id'],
+                'description': risk['description'],
+                'priority': risk['priority'],
+                'probability': float(p),
+                'expected_cost': float(c),
+                'expected_schedule': float(s),
+                'tail_cost': float(t)
+            }
+            for risk, p, c, s, t in zip(model.risks, probabilities, expected_cost,
+                                        expected_schedule, tail_contribution)
+        ), key=lambda r: -r['expected_cost'])
+
+        return {
+            'trials': len(total_cost),
+            'expected_cost': float(total_cost.mean()),
+            f'P{tail_percentile}_cost': float(cost_tail),
+            'expected_schedule': float(total_schedule.mean()),
+            f'P{tail_percentile}_schedule': float(np.percentile(total_schedule, tail_percentile)),
+            'ranking': ranking
+        }
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    import time
+
+    model = RiskModel()
+    print(f"Risk register: {len(model.risks)} risks "
+          f"({int(model.accelerated_only.sum())} accelerated-path only)")
+
+    start = time.perf_counter()
+    samples = model.sample(100_000, seed=0)
+    print(f"100,000 trials sampled in {time.perf_counter() - start:.2f} s")
+
+    for label, overrides, accelerated in [
+        ('Baseline, all open', None, False),
+        ('Accelerated, all open', None, True),
+        ('Baseline, critical risks mitigated',
+         {r['id']: 'MITIGATED' for r in model.risks if r['priority'] == 'Critical'}, False)
+    ]:
+        start = time.perf_counter()
+        result = samples.evaluate(overrides, accelerated)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"\n{label} ({elapsed:.0f} ms):")
+        print(f"  Cost exposure:     expected ${result['expected_cost']:,.0f}M  "
+              f"P90 ${result['P90_cost']:,.0f}M")
+        print(f"  Schedule exposure: expected {result['expected_schedule']:.1f} mo  "
+              f"P90 {result['P90_schedule']:.1f} mo")
+        print("  Top contributors:")
+        for risk in result['ranking'][:5]:
+            print(f"    {risk['id']} {risk['description'][:45]:45s} "
+                  f"${risk['expected_cost']:6.1f}M  {risk['expected_schedule']:4.1f} mo")
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Arctic OTHR Route Coverage and Detection Timelines
+Evaluates commercial routes and synthetic tracks against radar coverage
+
+UNCLASSIFIED // PUBLIC RELEASE
+Version: 1.0 Framework
+
+PURPOSE: Sample routes along great circles at one radar update per point,
+         test every track point against every site in one vectorized pass,
+         and report time-in-coverage, first-detection time and cumulative
+         Pd per target profile. Synthetic tracks are streamed through a
+         generator pipeline in batches so memory stays bounded.
+"""
+
+import numpy as np
+
+from OTHR_coverage_model import (OTHRParameters, calculate_detection_probability,
+                                 coverage_mask, sample_route)
+
+# ============================================================================
+# ROUTE ANALYSIS DEFAULTS
+# ============================================================================
+
+DETECTION_THRESHOLD = 0.9   # Cumulative Pd at which a track counts as detected
+TRACK_BATCH_SIZE = 256      # Synthetic tracks evaluated per vectorized pass
+
+# ============================================================================
+# POINT EVALUATION
+# ============================================================================
+
+def evaluate_track_points(params, lats, lons, target_type, conditions='clear'):
+    """
+    Evaluate track points against all sites in one broadcast pass
+    Sites are treated as independent looks on each scan
+
+    Returns (num_sites_covering, scan_pd) arrays, one entry per point
+    """
+    site_lat = np.array([s['lat'] for s in params.sites], dtype=float)[:, np.newaxis]
+    site_lon = np.array([s['lon'] for s in params.sites], dtype=float)[:, np.newaxis]
+    azimuth = np.array([s['azimuth_center'] for s in params.sites], dtype=float)[:, np.newaxis]
+    angle = np.array([s['coverage_angle'] for s in params.sites], dtype=float)[:, np.newaxis]
+
+    in_cov, range_km, _ = coverage_mask(
+        np.asarray(lats)[np.newaxis, :], np.asarray(lons)[np.newaxis, :],
+        site_lat, site_lon, azimuth, angle,
+        params.min_range_km, params.max_range_km
+    )
+
+    site_pd = np.where(in_cov, calculate_detection_probability(
+        params, target_type, range_km, conditions), 0.0)
+    scan_pd = 1 - np.prod(1 - site_pd, axis=0)
+
+    return in_cov.sum(axis=0), scan_pd
+
+def _first_index(flags, offsets, lengths):
+    """
+    Index (relative to each segment start) of the first True flag per
+    segment, or -1 where a segment has none
+    """
+    positions = np.where(flags, np.arange(len(flags)), len(flags))
+    first = np.minimum.reduceat(positions, offsets)
+    return np.where(first < offsets + lengths, first - offsets, -1)
+
+def _segment_statistics(num_covering, scan_pd, lengths, update_rate_sec,
+                        detection_threshold):
+    """
+    Per-segment coverage and detection statistics for concatenated tracks
+    """
+    offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(np.int64)
+    covered = num_covering > 0
+
+    # Cumulative Pd within each segment via running sums of log(1 - Pd)
+    log_miss = np.log1p(-np.minimum(scan_pd, 1 - 1e-15))
+    running = np.cumsum(log_miss)
+    segment_base = np.repeat(running[offsets] - log_miss[offsets], lengths)
+    cumulative_pd = 1 - np.exp(running - segment_base)
+
+    first_coverage = _first_index(covered, offsets, lengths)
+    first_detection = _first_index(cumulative_pd >= detection_threshold, offsets, lengths)
+
+    return {
+        'time_in_coverage_sec': np.add.reduceat(covered, offsets) * update_rate_sec,
+        'first_coverage_time_sec': np.where(first_coverage >= 0,
+                                            first_coverage * update_rate_sec, np.nan),
+        'first_detection_time_sec': np.where(first_detection >= 0,
+                                             first_detection * update_rate_sec, np.nan),
+        'cumulative_pd': cumulative_pd[offsets + lengths - 1],
+        'cumulative_pd_timeline': cumulative_pd
+    }
+
+# ============================================================================
+# COMMERCIAL ROUTE TIMELINES
+# ============================================================================
+
+def route_timeline(params, route, target_type, conditions='clear',
+                   step_km=None, detection_threshold=DETECTION_THRESHOLD):
+    """
+    Detection timeline for one route and target profile
+
+    Points are spaced by the distance the target flies in one update
+    interval unless step_km is given
+
+    Returns dict with per-point arrays and summary statistics
+    """
+    speed_mps = params.target_profiles[target_type]['speed_mps']
+    step_km = step_km or speed_mps * params.update_rate_sec / 1000
+    update_sec = step_km * 1000 / speed_mps
+
+    lats, lons, along_track_km = sample_route(route['waypoints'], step_km)
+    num_covering, scan_pd = evaluate_track_points(params, lats, lons,
+                                                  target_type, conditions)
+    stats = _segment_statistics(num_covering, scan_pd, np.array([len(lats)]),
+                                update_sec, detection_threshold)
+
+    return {
+        'route': route['name'],
+        'target_type': target_type,
+        'conditions': conditions,
+        'time_sec': along_track_km * 1000 / speed_mps,
+        'lats': lats,
+        'lons': lons,
+        'num_sites_covering': num_covering,
+        'scan_pd': scan_pd,
+        'cumulative_pd': stats['cumulative_pd_timeline'],
+        'flight_time_sec': float(along_track_km[-1] * 1000 / speed_mps),
+        'time_in_coverage_sec': float(stats['time_in_coverage_sec'][0]),
+        'first_coverage_time_sec': float(stats['first_coverage_time_sec'][0]),
+        'first_detection_time_sec': float(stats['first_detection_time_sec'][0]),
+        'final_cumulative_pd': float(stats['cumulative_pd'][0])
+    }
+
+def evaluate_routes(params, target_types=None, conditions='clear',
+                    detection_threshold=DETECTION_THRESHOLD):
+    """
+    Summarize every commercial route for every target profile
+    Returns nested dict: route name -> target type -> statistics
+    (first times are None when the track is never covered / detected)
+    """
+    target_types = target_types or list(params.target_profiles.keys())
+    results = {}
+
+    for route in params.commercial_routes:
+        results[route['name']] = {}
+        for target_type in target_types:
+            timeline = route_timeline(params, route, target_type, conditions,
+                                      detection_threshold=detection_threshold)
+            results[route['name']][target_type] = {
+                key: (None if np.isnan(timeline[key]) else timeline[key])
+                for key in ['flight_time_sec', 'time_in_coverage_sec',
+                            'first_coverage_time_sec', 'first_detection_time_sec',
+                            'final_cumulative_pd']
+            }
+
+    return results
+
+# ============================================================================
+# SYNTHETIC TRACK PIPELINE
+# ============================================================================
+
+def generate_synthetic_tracks(num_tracks, origin_box=((35, 55), (-130, -60)),
+                              destination_box=((25, 45), (100, 145)), seed=None):
+    """
+    Yield random great-circle tracks as waypoint lists [(lat, lon), (lat, lon)]
+    Boxes are ((lat_min, lat_max), (lon_min, lon_max)); the defaults give
+    trans-polar North America to Asia tracks
+    """
+    rng = np.random.default_rng(seed)
+
+    for _ in range(num_tracks):
+        origin = (rng.uniform(*origin_box[0]), rng.uniform(*origin_box[1]))
+        destination = (rng.uniform(*destination_box[0]), rng.uniform(*destination_box[1]))
+        yield [origin, destination]
+
+def _batched(iterable, batch_size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def score_tracks(params, tracks, target_type, conditions='clear',
+                 detection_threshold=DETECTION_THRESHOLD,
+                 batch_size=TRACK_BATCH_SIZE):
+    """
+    Score an iterable of waypoint tracks, yielding one result dict per track
+
+    Tracks are consumed lazily and evaluated batch_size at a time, with all
+    points of a batch tested against all sites in one vectorized pass
+    """
+    speed_mps = params.target_profiles[target_type]['speed_mps']
+    step_km = speed_mps * params.update_rate_sec / 1000
+
+    for batch in _batched(tracks, batch_size):
+        sampled = [sample_route(waypoints, step_km) for waypoints in batch]
+        lengths = np.array([len(s[0]) for s in sampled])
+        lats = np.concatenate([s[0] for s in sampled])
+        lons = np.concatenate([s[1] for s in sampled])
+
+        num_covering, scan_pd = evaluate_track_points(params, lats, lons,
+                                                      target_type, conditions)
+        stats = _segment_statistics(num_covering, scan_pd, lengths,
+                                    params.update_rate_sec, detection_threshold)
+
+        for k in range(len(batch)):
+            yield {
+                'flight_time_sec': float((lengths[k] - 1) * params.update_rate_sec),
+                'time_in_coverage_sec': float(stats['time_in_coverage_sec'][k]),
+                'first_coverage_time_sec': float(stats['first_coverage_time_sec'][k]),
+                'first_detection_time_sec': float(stats['first_detection_time_sec'][k]),
+                'final_cumulative_pd': float(stats['cumulative_pd'][k])
+            }
+
+def summarize_track_scores(scores):
+    """
+    Aggregate streamed track results without holding them in memory
+    Returns dict of counts, detection fraction and mean timings
+    """
+    count = covered = detected = 0
+    coverage_sum = detection_time_sum = pd_sum = 0.0
+
+    for score in scores:
+        count += 1
+        coverage_sum += score['time_in_coverage_sec']
+        pd_sum += score['final_cumulative_pd']
+        if not np.isnan(score['first_coverage_time_sec']):
+            covered += 1
+        if not np.isnan(score['first_detection_time_sec']):
+            detected += 1
+            detection_time_sum += score['first_detection_time_sec']
+
+    return {
+        'num_tracks': count,
+        'covered_fraction': covered / max(1, count),
+        'detected_fraction': detected / max(1, count),
+        'mean_time_in_coverage_sec': coverage_sum / max(1, count),
+        'mean_first_detection_time_sec': (detection_time_sum / detected
+                                          if detected else None),
+        'mean_final_cumulative_pd': pd_sum / max(1, count)
+    }
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    import time
+
+    params = OTHRParameters()
+
+    print("Commercial route detection timelines (clear conditions):")
+    print("-" * 80)
+    for route_name, targets in evaluate_routes(params).items():
+        print(f"\n{route_name}")
+        for target_type, stats in targets.items():
+            first = stats['first_detection_time_sec']
+            first_text = f"{first / 60:7.1f} min" if first is not None else "   never   "
+            print(f"  {target_type:28s} in coverage {stats['time_in_coverage_sec'] / 60:7.1f} min"
+                  f"  first detection {first_text}"
+                  f"  cumulative Pd {stats['final_cumulative_pd']:.3f}")
+
+    start = time.perf_counter()
+    summary = summarize_track_scores(score_tracks(
+        params, generate_synthetic_tracks(10_000, seed=0), 'Large Commercial Aircraft'))
+    elapsed = time.perf_counter() - start
+    print(f"\nSynthetic tracks: {summary['num_tracks']:,} scored in {elapsed:.1f} s")
+    print(f"  Detected fraction: {summary['detected_fraction']:.3f}")
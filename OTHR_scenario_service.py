@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+Arctic OTHR Scenario Service
+Long-lived JSON-in, JSON-out evaluation service for the coverage model
+
+UNCLASSIFIED // PUBLIC RELEASE
+Version: 1.0 Framework
+
+PURPOSE: Running OTHR_coverage_model.py once per scenario pays interpreter
+         start-up, imports and a full recompute every time. This service
+         stays up and answers scenario requests (OTHRParameters overrides)
+         with the performance summary and area-weighted coverage statistics,
+         either as NDJSON over stdin/stdout or over local HTTP.
+
+         Caches stay warm between requests: results are memoized by
+         parameter hash, per-site coverage masks by site geometry (a change
+         to one site recomputes one mask) and grids by resolution.
+         Requests fan out over a process pool (workers=1 runs in-process);
+         NDJSON responses are written in request order.
+
+REQUEST:
+    {"id": 1,
+     "overrides": {"max_range_km": 3200, "sites[1].azimuth_center": 330},
+     "resolution_deg": 1.0,
+     "outputs": ["summary", "coverage_map", "performance_curves"],
+     "name": "trade-07"}
+
+    outputs and name are optional; requested files are written to
+    <output_dir>/<name or scenario hash>/ (name must be a single path
+    component other than "." or "..")
+
+RESPONSE:
+    {"id": 1, "ok": true, "scenario_hash": "...", "cached": false,
+     "summary": {...generate_performance_summary...},
+     "coverage": {...coverage_area_statistics...},
+     "files": [...], "elapsed_ms": 2.1}
+    or {"id": 1, "ok": false, "error": "KeyError: ..."}
+
+USAGE:
+    python3 OTHR_scenario_service.py < scenarios.ndjson > results.ndjson
+    python3 OTHR_scenario_service.py --http 8765 --workers 4 --output-dir runs
+        POST /evaluate with one request object or a list of them
+        GET  /health
+"""
+
+import argparse
+import functools
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import numpy as np
+
+from OTHR_coverage_model import (DEFAULT_OUTPUT_DIR, OTHRParameters,
+                                 apply_parameter_overrides, calculate_site_masks,
+                                 generate_performance_summary)
+from OTHR_equal_area_grid import coverage_area_statistics, latlon_cell_areas
+from OTHR_parameter_sweep import parameter_hash
+
+# ============================================================================
+# SERVICE CONFIGURATION
+# ============================================================================
+
+DEFAULT_RESOLUTION_DEG = 1.0
+RESULT_CACHE_SIZE = 4096        # Memoized scenario results (parent process)
+SITE_MASK_CACHE_SIZE = 512      # Per-site coverage masks (each worker)
+MAX_IN_FLIGHT = 256             # NDJSON requests queued ahead of the writer
+
+# pyplot keeps global figure state, and with workers=1 scenarios run in the
+# HTTP request threads, so plotting is serialized within a process
+_PLOT_LOCK = threading.Lock()
+
+OUTPUT_FILES = {
+    'summary': 'OTHR_Performance_Summary.json',
+    'coverage_map': 'OTHR_Coverage_Map.png',
+    'performance_curves': 'OTHR_Performance_Curves.png'
+}
+
+# ============================================================================
+# WARM SCENARIO EVALUATION (runs in each worker)
+# ============================================================================
+
+@functools.lru_cache(maxsize=8)
+def _grid(resolution_deg):
+    """
+    Model grid and exact cell areas for one resolution
+    """
+    lat_range = np.arange(50, 85, resolution_deg)
+    lon_range = np.arange(-180, -60, resolution_deg)
+    cell_areas = np.ascontiguousarray(latlon_cell_areas(lat_range, lon_range))
+    return lat_range, lon_range, cell_areas
+
+@functools.lru_cache(maxsize=SITE_MASK_CACHE_SIZE)
+def _site_mask(site_key, min_range_km, max_range_km, resolution_deg):
+    """
+    Coverage mask of one site, keyed by (lat, lon, azimuth_center,
+    coverage_angle) so scenarios sharing a site share its mask
+    """
+    lat, lon, azimuth_center, coverage_angle = site_key
+    site = {'lat': lat, 'lon': lon, 'azimuth_center': azimuth_center,
+            'coverage_angle': coverage_angle}
+    lat_range, lon_range, _ = _grid(resolution_deg)
+    single = SimpleNamespace(sites=[site], min_range_km=min_range_km,
+                             max_range_km=max_range_km)
+    mask = calculate_site_masks(single, lat_range, lon_range)[0]
+    mask.setflags(write=False)
+    return mask
+
+def coverage_statistics(params, resolution_deg=DEFAULT_RESOLUTION_DEG):
+    """
+    Area-weighted single/dual/triple coverage of a parameter set, built
+    from the per-site mask cache
+    """
+    _, _, cell_areas = _grid(resolution_deg)
+    counts = np.zeros(cell_areas.shape, dtype=np.int16)
+    for site in params.sites:
+        site_key = (float(site['lat']), float(site['lon']),
+                    float(site['azimuth_center']), float(site['coverage_angle']))
+        counts += _site_mask(site_key, float(params.min_range_km),
+                             float(params.max_range_km), float(resolution_deg))
+    return coverage_area_statistics(counts, cell_areas)
+
+def _write_outputs(params, summary, outputs, directory, cache_dir):
+    """
+    Write the requested files for one scenario
+    Returns list of paths written
+    """
+    unknown = set(outputs) - set(OUTPUT_FILES)
+    if unknown:
+        raise ValueError(f"Unknown outputs: {sorted(unknown)}")
+    os.makedirs(directory, exist_ok=True)
+
+    paths = []
+    for output in outputs:
+        path = os.path.join(directory, OUTPUT_FILES[output])
+        if output == 'summary':
+            with open(path, 'w') as f:
+                json.dump(summary, f, indent=2)
+        else:
+            import matplotlib
+            matplotlib.use('Agg')
+            import matplotlib.pyplot as plt
+            from OTHR_visualization import (SAVE_DPI, plot_coverage_map,
+                                            plot_performance_curves)
+            # Saved here rather than through save_path, whose message would
+            # go to stdout (the NDJSON response stream)
+            with _PLOT_LOCK:
+                if output == 'coverage_map':
+                    fig = plot_coverage_map(params, cache_dir=cache_dir)
+                else:
+                    fig = plot_performance_curves(params)
+                try:
+                    fig.savefig(path, dpi=SAVE_DPI, bbox_inches='tight')
+                finally:
+                    plt.close(fig)
+            print(f"Saved {path}", file=sys.stderr)
+        paths.append(path)
+    return paths
+
+def run_scenario(params, resolution_deg=DEFAULT_RESOLUTION_DEG, outputs=(),
+                 output_dir=None, cache_dir=None):
+    """
+    Summary and coverage statistics for one parameter set, writing any
+    requested outputs to output_dir
+    Returns dict with 'summary', 'coverage' and 'files'
+    """
+    summary = generate_performance_summary(params)
+    result = {
+        'summary': summary,
+        'coverage': coverage_statistics(params, resolution_deg),
+        'files': []
+    }
+    if outputs:
+        result['files'] = _write_outputs(params, summary, outputs, output_dir, cache_dir)
+    return result
+
+def _warm_up(resolution_deg=DEFAULT_RESOLUTION_DEG):
+    """
+    Worker initializer: import and evaluate the baseline once so the first
+    real request finds the caches and modules loaded
+    """
+    run_scenario(OTHRParameters(), resolution_deg)
+
+# ============================================================================
+# SCENARIO SERVICE
+# ============================================================================
+
+class ScenarioService:
+    """
+    Dispatches scenario requests to warm workers and memoizes the results
+
+    submit(request) returns a Future whose result is always a response dict
+    (errors are reported in the response, not raised)
+    """
+
+    def __init__(self, workers=1, output_dir=DEFAULT_OUTPUT_DIR, cache_dir=None,
+                 base_params=None, resolution_deg=DEFAULT_RESOLUTION_DEG):
+        self.workers = workers
+        self.output_dir = output_dir
+        self.cache_dir = cache_dir
+        self.base_params = base_params or OTHRParameters()
+        self.resolution_deg = resolution_deg
+        self.results = OrderedDict()
+        self._lock = threading.Lock()
+
+        if workers > 1:
+            self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_warm_up,
+                                            initargs=(resolution_deg,))
+        else:
+            self.pool = None
+            _warm_up(resolution_deg)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def evaluate(self, request):
+        """
+        Evaluate one request and wait for its response
+        """
+        return self.submit(request).result()
+
+    def submit(self, request):
+        """
+        Queue one request (dict or JSON text)
+        Returns Future of the response dict
+        """
+        start = time.perf_counter()
+        response = Future()
+        request_id = None
+        try:
+            if isinstance(request, (str, bytes)):
+                request = json.loads(request)
+            if not isinstance(request, dict):
+                raise ValueError("Request must be a JSON object")
+            request_id = request.get('id')
+
+            params = apply_parameter_overrides(self.base_params, request.get('overrides') or {})
+            resolution_deg = float(request.get('resolution_deg', self.resolution_deg))
+            outputs = tuple(request.get('outputs') or ())
+            scenario_hash = parameter_hash(params)
+            key = (scenario_hash, resolution_deg)
+            name = _output_name(request.get('name'), scenario_hash)
+        except Exception as e:
+            response.set_result(_error(request_id, e))
+            return response
+
+        with self._lock:
+            cached = self.results.get(key)
+            if cached is not None:
+                self.results.move_to_end(key)
+        if cached is not None and not outputs:
+            response.set_result(self._response(request_id, scenario_hash, cached, True, start))
+            return response
+
+        args = (params, resolution_deg, outputs,
+                os.path.join(self.output_dir, name), self.cache_dir)
+
+        def finish(result=None, error=None):
+            if error is not None:
+                response.set_result(_error(request_id, error))
+                return
+            self._store(key, result)
+            response.set_result(self._response(request_id, scenario_hash, result, False, start))
+
+        if self.pool is None:
+            try:
+                result = run_scenario(*args)
+            except Exception as e:
+                finish(error=e)
+            else:
+                finish(result)
+        else:
+            def done(future):
+                error = future.exception()
+                if error is not None:
+                    finish(error=error)
+                else:
+                    finish(future.result())
+
+            self.pool.submit(run_scenario, *args).add_done_callback(done)
+        return response
+
+    def _store(self, key, result):
+        with self._lock:
+            self.results[key] = {'summary': result['summary'], 'coverage': result['coverage']}
+            self.results.move_to_end(key)
+            while len(self.results) > RESULT_CACHE_SIZE:
+                self.results.popitem(last=False)
+
+    @staticmethod
+    def _response(request_id, scenario_hash, result, cached, start):
+        return {
+            'id': request_id,
+            'ok': True,
+            'scenario_hash': scenario_hash,
+            'cached': cached,
+            'summary': result['summary'],
+            'coverage': result['coverage'],
+            'files': result.get('files', []),
+            'elapsed_ms': (time.perf_counter() - start) * 1000
+        }
+
+def _output_name(name, default):
+    """
+    Output subdirectory name for a request, confined to the output directory
+    """
+    if name is None:
+        return default
+    name = str(name)
+    # Path separators of any platform, and NUL, are rejected
+    if name in ('', '.', '..') or any(c in name for c in '/\\\0'):
+        raise ValueError(f"Invalid output name: {name!r}")
+    return name
+
+def _error(request_id, error):
+    return {'id': request_id, 'ok': False, 'error': f"{type(error).__name__}: {error}"}
+
+# ============================================================================
+# FRONT ENDS
+# ============================================================================
+
+def serve_stdio(service, infile=None, outfile=None, max_in_flight=MAX_IN_FLIGHT):
+    """
+    NDJSON loop: one request per input line, one response per output line,
+    in request order. Requests are dispatched while earlier ones are still
+    being evaluated; a writer thread emits each response once it and all
+    earlier ones are done.
+    """
+    infile = infile or sys.stdin
+    outfile = outfile or sys.stdout
+    pending = queue.Queue(maxsize=max_in_flight)
+
+    def write():
+        while True:
+            response = pending.get()
+            if response is None:
+                return
+            outfile.write(json.dumps(response.result(), default=float) + '\n')
+            outfile.flush()
+
+    writer = threading.Thread(target=write, daemon=True)
+    writer.start()
+    for line in infile:
+        if line.strip():
+            pending.put(service.submit(line))
+    pending.put(None)
+    writer.join()
+
+def make_http_server(service, host='127.0.0.1', port=8765):
+    """
+    Threaded local HTTP front end
+    POST /evaluate takes one request object or a list (answered in order);
+    GET /health reports the worker and cache state
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status, body):
+            payload = json.dumps(body, default=float).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            if self.path != '/health':
+                self._send(404, {'ok': False, 'error': f"Unknown path: {self.path}"})
+                return
+            self._send(200, {'ok': True, 'workers': service.workers,
+                             'cached_results': len(service.results)})
+
+        def do_POST(self):
+            if self.path != '/evaluate':
+                self._send(404, {'ok': False, 'error': f"Unknown path: {self.path}"})
+                return
+            try:
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+            except ValueError as e:
+                self._send(400, _error(None, e))
+                return
+            if isinstance(body, list):
+                futures = [service.submit(request) for request in body]
+                self._send(200, [future.result() for future in futures])
+            else:
+                self._send(200, service.evaluate(body))
+
+        def log_message(self, format, *args):
+            pass
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the OTHR scenario service")
+    parser.add_argument('--http', type=int, metavar='PORT', default=None,
+                        help="Serve HTTP on this port (default: NDJSON on stdin/stdout)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Worker processes (1 evaluates in-process)")
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR,
+                        help="Root directory for requested output files "
+                             "(default: $OTHR_OUTPUT_DIR or the current directory)")
+    parser.add_argument('--cache-dir', default=None,
+                        help="Coverage raster cache used for coverage map plots")
+    parser.add_argument('--resolution', type=float, default=DEFAULT_RESOLUTION_DEG,
+                        help="Default coverage grid resolution (degrees)")
+    args = parser.parse_args(argv)
+
+    with ScenarioService(args.workers, args.output_dir, args.cache_dir,
+                         resolution_deg=args.resolution) as service:
+        if args.http is None:
+            serve_stdio(service)
+            return
+        server = make_http_server(service, args.host, args.http)
+        print(f"OTHR scenario service on http://{args.host}:{args.http} "
+              f"({args.workers} worker(s))", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""
+Arctic OTHR Schedule Engine
+Critical-path and Monte Carlo schedule risk over the schedule CSVs
+
+UNCLASSIFIED // PUBLIC RELEASE
+Version: 1.0 Framework
+
+PURPOSE: Resolve the free-text Dependencies column of
+         OTHR_Schedule_Model.csv / OTHR_Schedule_Accelerated.csv into a task
+         DAG, compute the critical path with a topological-order CPM pass,
+         and run Monte Carlo over duration uncertainty. All iterations are
+         advanced together, one task at a time along the topological order,
+         so 10^4-10^5 iterations take one array pass.
+
+MODEL ASSUMPTIONS:
+- Tasks are the rows under the "PHASE ..." headings; summary, milestone and
+  constraint sections are not scheduled
+- A dependency phrase resolves to the earlier-listed task(s) sharing the
+  most words with it, preferring tasks of the same site ("Site N - ...");
+  "All ..." means every earlier task of the same phase
+- Dependencies are finish-to-start with a lag calibrated from the listed
+  dates (listed start - predecessor's listed end; negative lags are the
+  plan's overlaps), so the deterministic pass reproduces the listed
+  schedule. lags='none' gives strict finish-to-start instead
+- The listed Start Month is a start-no-earlier-than constraint (planned
+  start), so early finishes do not pull later work ahead of plan
+- Durations are triangular (low, mode, high) multiples of the listed
+  duration; tasks noted as fast-tracked or compressed get a wider high tail
+"""
+
+import csv
+import re
+
+import numpy as np
+
+# ============================================================================
+# MODEL CONFIGURATION
+# ============================================================================
+
+BASELINE_SCHEDULE_CSV = 'OTHR_Schedule_Model.csv'
+ACCELERATED_SCHEDULE_CSV = 'OTHR_Schedule_Accelerated.csv'
+
+# Abbreviations in task names and dependency text
+WORD_ALIASES = {
+    'conops': 'concept operations',
+    'eis': 'environmental impact statement',
+    'cdr': 'design review',
+    'tx': 'transmitter',
+    'rx': 'receiver',
+    'occ': 'operations control center'
+}
+
+# Dependency phrases that do not name a task
+PHRASE_ALIASES = {
+    'lessons': None,
+    'hardware': 'transmitter systems + receiver systems + signal processing hardware',
+    'systems available': 'integration test',
+    'sites nearing completion': 'installation'
+}
+
+STOP_WORDS = {'of', 'and', 'the', 'all', 'complete', 'operational', 'items'}
+
+# Triangular duration multipliers (low, mode, high) by task-name keyword;
+# first match wins
+DURATION_UNCERTAINTY = [
+    ('environmental', (0.9, 1.0, 1.5)),     # Litigation or scope expansion
+    ('consultation', (0.9, 1.0, 1.5)),      # Agreement negotiations
+    ('site prep', (0.9, 1.0, 1.6)),         # Short construction seasons
+    ('infrastructure', (0.9, 1.0, 1.5)),
+    ('long-lead', (0.9, 1.0, 1.4)),         # Supply chain disruptions
+    ('software development', (0.9, 1.0, 1.5)),
+    ('integration', (0.9, 1.0, 1.4)),
+]
+DEFAULT_DURATION_UNCERTAINTY = (0.9, 1.0, 1.25)
+FAST_TRACK_HIGH_SCALE = 1.5     # Extra high-tail factor for fast-tracked tasks
+FAST_TRACK_PATTERN = re.compile(r'fast-track|compressed|high risk', re.IGNORECASE)
+
+CRITICAL_FLOAT_MONTHS = 1e-3    # Total float at or below this is critical
+ITERATION_CHUNK = 20_000        # Monte Carlo iterations advanced per chunk
+
+_SITE_PATTERN = re.compile(r'^\s*sites?\s+([\d\s&,]+)', re.IGNORECASE)
+
+# ============================================================================
+# CSV PARSING AND DEPENDENCY RESOLUTION
+# ============================================================================
+
+def _words(text):
+    """
+    Normalized word set of a task name or dependency phrase
+    """
+    text = text.lower()
+    for abbreviation, expansion in WORD_ALIASES.items():
+        text = re.sub(rf'\b{abbreviation}\b', expansion, text)
+    words = set()
+    for word in re.findall(r'[a-z][a-z&]*', text):
+        word = word.rstrip('s') if len(word) > 3 else word
+        if word not in STOP_WORDS:
+            words.add(word)
+    return words
+
+def _words_match(a, b):
+    # Prefix match covers abbreviations such as "Auth" and "Arch"
+    return a == b or (min(len(a), len(b)) >= 3 and (a.startswith(b) or b.startswith(a)))
+
+def _site_numbers(text):
+    """
+    Site numbers a phrase refers to ("Site 2 - ...", "Sites 1&2 ...")
+    """
+    match = _SITE_PATTERN.match(text)
+    if not match:
+        return []
+    return [int(n) for n in re.findall(r'\d+', match.group(1))]
+
+class ScheduleModel:
+    """
+    Task DAG compiled from a schedule CSV
+
+    tasks:        list of task dicts (name, phase, duration, listed start/end,
+                  dependency text, listed critical flag, notes)
+    predecessors: list of predecessor index lists (resolved dependencies)
+    lags:         list of lag lists (months) aligned with predecessors
+    unresolved:   list of (task name, phrase) that matched no task
+    """
+
+    def __init__(self, path=BASELINE_SCHEDULE_CSV, lags='listed'):
+        if lags not in ('listed', 'none'):
+            raise ValueError(f"Unknown lag mode: {lags}")
+        self.path = path
+        self.lag_mode = lags
+        self.tasks = []
+        self.unresolved = []
+        self._parse(path)
+        self.predecessors = [self._resolve(k) for k in range(len(self.tasks))]
+        self._compile()
+
+    def _parse(self, path):
+        with open(path, newline='') as f:
+            rows = [row for row in csv.reader(line for line in f
+                                              if not line.lstrip().startswith('#'))]
+
+        phase = None
+        for row in rows[1:]:
+            row = [c.strip() for c in (row + [''] * 8)[:8]]
+            heading, name, duration, start, end, dependencies, critical, notes = row
+
+            if heading:
+                phase = heading if heading.upper().startswith('PHASE') else None
+                continue
+            if phase is None or not name or not duration.isdigit():
+                continue
+
+            site = _site_numbers(name)
+            self.tasks.append({
+                'name': name,
+                'phase': phase,
+                'site': site[0] if site else None,
+                'duration': float(duration),
+                'listed_start': float(start),
+                'listed_end': float(end),
+                'dependencies': dependencies,
+                'listed_critical': critical == '*',
+                'notes': notes
+            })
+
+    def _match(self, index, phrase):
+        """
+        Earlier tasks best matching one dependency phrase
+        """
+        task = self.tasks[index]
+        sites = _site_numbers(phrase)
+        words = _words(_SITE_PATTERN.sub('', phrase) if sites else phrase)
+        candidates = range(index)
+        if sites:
+            candidates = [k for k in candidates if self.tasks[k]['site'] in sites]
+            if not words:
+                # A bare site reference means that site's last task so far
+                return [max(k for k in candidates if self.tasks[k]['site'] == s)
+                        for s in sites if any(self.tasks[k]['site'] == s for k in candidates)]
+
+        best_score, best = 0, []
+        for k in candidates:
+            other = self.tasks[k]
+            other_words = _words(other['name'])
+            score = sum(any(_words_match(w, o) for o in other_words) for w in words)
+            if score == 0:
+                continue
+            if task['site'] is not None and other['site'] == task['site']:
+                score += 0.5
+            if score > best_score:
+                best_score, best = score, [k]
+            elif score == best_score:
+                best.append(k)
+        return best
+
+    def _resolve(self, index):
+        """
+        Predecessor indices for the dependency text of one task
+        """
+        task = self.tasks[index]
+        text = task['dependencies']
+        if not text or text.lower() == 'none':
+            return []
+
+        if text.lower().startswith('all '):
+            same_phase = [k for k in range(index) if self.tasks[k]['phase'] == task['phase']]
+            if same_phase:
+                return same_phase
+
+        predecessors = set()
+        phrases = [p.strip() for p in text.split('+')]
+        while phrases:
+            phrase = phrases.pop(0)
+            key = phrase.lower()
+            if key in PHRASE_ALIASES:
+                if PHRASE_ALIASES[key]:
+                    phrases += [p.strip() for p in PHRASE_ALIASES[key].split('+')]
+                continue
+            matches = self._match(index, phrase)
+            if not matches:
+                self.unresolved.append((task['name'], phrase))
+            predecessors.update(matches)
+        return sorted(predecessors)
+
+    def _compile(self):
+        """
+        Topological order, successor lists and per-task arrays
+        """
+        num_tasks = len(self.tasks)
+        self.successors = [[] for _ in range(num_tasks)]
+        self.lags = []
+        for k, preds in enumerate(self.predecessors):
+            # Only the binding (latest-finishing) predecessor carries the full
+            # listed gap as a lag; other edges keep listed overlaps but not
+            # listed slack, so their float survives
+            binding = max(preds, key=lambda p: self.tasks[p]['listed_end']) if preds else None
+            lags = []
+            for p in preds:
+                self.successors[p].append((k, len(lags)))
+                gap = self.tasks[k]['listed_start'] - self.tasks[p]['listed_end']
+                if self.lag_mode != 'listed':
+                    gap = 0.0
+                elif p != binding:
+                    gap = min(gap, 0.0)
+                lags.append(gap)
+            self.lags.append(lags)
+
+        # Kahn's algorithm (dependencies only point at earlier rows, but the
+        # order is derived rather than assumed)
+        in_degree = [len(p) for p in self.predecessors]
+        ready = [k for k in range(num_tasks) if in_degree[k] == 0]
+        self.order = []
+        while ready:
+            k = ready.pop(0)
+            self.order.append(k)
+            for s, _ in self.successors[k]:
+                in_degree[s] -= 1
+                if in_degree[s] == 0:
+                    ready.append(s)
+        if len(self.order) != num_tasks:
+            raise ValueError(f"Dependency cycle in {self.path}")
+
+        self.durations = np.array([t['duration'] for t in self.tasks])
+        self.planned_starts = np.array([t['listed_start'] for t in self.tasks])
+
+        # Free slack implied by the listed dates (successor start - own end)
+        listed_end = max(t['listed_end'] for t in self.tasks)
+        self.listed_float = np.array([
+            min((self.tasks[s]['listed_start'] for s, _ in self.successors[k]),
+                default=listed_end) - self.tasks[k]['listed_end']
+            for k in range(num_tasks)])
+
+        uncertainty = []
+        for t in self.tasks:
+            name = t['name'].lower()
+            low, mode, high = next((u for keyword, u in DURATION_UNCERTAINTY if keyword in name),
+                                   DEFAULT_DURATION_UNCERTAINTY)
+            if FAST_TRACK_PATTERN.search(t['notes']):
+                high = mode + (high - mode) * FAST_TRACK_HIGH_SCALE
+            uncertainty.append((low, mode, high))
+        self.uncertainty = np.array(uncertainty)
+
+    def set_uncertainty(self, task_name, low, mode, high):
+        """
+        Override the triangular duration multipliers of one task
+        """
+        for k, task in enumerate(self.tasks):
+            if task['name'] == task_name:
+                self.uncertainty[k] = (low, mode, high)
+                return
+        raise KeyError(f"Unknown schedule task: {task_name}")
+
+    def dependency_table(self):
+        """
+        (task, dependency text, resolved predecessor names) per task
+        """
+        return [(t['name'], t['dependencies'], [self.tasks[p]['name'] for p in preds])
+                for t, preds in zip(self.tasks, self.predecessors)]
+
+    # ------------------------------------------------------------------------
+    # Critical path
+    # ------------------------------------------------------------------------
+
+    def _forward_backward(self, durations):
+        """
+        CPM passes over durations of shape (iterations, tasks)
+        Returns early starts, early finishes and total float (same shape)
+        """
+        early_start = np.empty_like(durations)
+        early_finish = np.empty_like(durations)
+        for k in self.order:
+            start = np.full(durations.shape[0], self.planned_starts[k], dtype=durations.dtype)
+            for p, lag in zip(self.predecessors[k], self.lags[k]):
+                np.maximum(start, early_finish[:, p] + lag, out=start)
+            early_start[:, k] = start
+            early_finish[:, k] = start + durations[:, k]
+
+        finish = early_finish.max(axis=1)
+        late_finish = np.empty_like(durations)
+        for k in reversed(self.order):
+            late = finish.copy()
+            for s, edge in self.successors[k]:
+                np.minimum(late, late_finish[:, s] - durations[:, s] - self.lags[s][edge], out=late)
+            late_finish[:, k] = late
+
+        return early_start, early_finish, late_finish - early_finish
+
+    def critical_path(self):
+        """
+        Deterministic CPM with the listed durations
+        Returns dict with FOC month, critical task names, and per-task
+        early start/finish and total float
+        """
+        early_start, early_finish, total_float = self._forward_backward(self.durations[np.newaxis, :])
+        critical = total_float[0] <= CRITICAL_FLOAT_MONTHS
+        return {
+            'foc_month': float(early_finish.max()),
+            'critical_path': [self.tasks[k]['name'] for k in self.order if critical[k]],
+            'early_start': early_start[0],
+            'early_finish': early_finish[0],
+            'total_float': total_float[0]
+        }
+
+    # ------------------------------------------------------------------------
+    # Monte Carlo
+    # ------------------------------------------------------------------------
+
+    def simulate(self, num_iterations=10_000, seed=None, percentiles=(10, 50, 80, 90)):
+        """
+        Monte Carlo over triangular duration uncertainty
+        Returns dict with FOC mean/percentiles, the FOC sample array and the
+        criticality index (fraction of iterations on the critical path) per task
+        """
+        rng = np.random.default_rng(seed)
+        low, mode, high = (self.durations * self.uncertainty.T)
+        foc = np.empty(num_iterations)
+        critical_counts = np.zeros(len(self.tasks))
+
+        for start in range(0, num_iterations, ITERATION_CHUNK):
+            n = min(ITERATION_CHUNK, num_iterations - start)
+            # Zero-duration tasks have low == high, which triangular rejects
+            durations = np.where(high > low,
+                                 rng.triangular(low, mode, np.maximum(high, low + 1e-9),
+                                                size=(n, len(self.tasks))),
+                                 mode)
+            _, early_finish, total_float = self._forward_backward(durations)
+            foc[start:start + n] = early_finish.max(axis=1)
+            critical_counts += (total_float <= CRITICAL_FLOAT_MONTHS).sum(axis=0)
+
+        criticality = critical_counts / num_iterations
+        return {
+            'iterations': num_iterations,
+            'mean': float(foc.mean()),
+            **{f'P{p}': float(v) for p, v in zip(percentiles, np.percentile(foc, percentiles))},
+            'foc_samples': foc,
+            'criticality': {t['name']: float(c) for t, c in zip(self.tasks, criticality)}
+        }
+
+    def slack_violations(self, cpm, simulation):
+        """
+        Tasks with listed slack that the deterministic CPM puts on the critical
+        path or the Monte Carlo reports as always critical (a sign that lags
+        have absorbed the float)
+        """
+        return [t['name'] for k, t in enumerate(self.tasks)
+                if self.listed_float[k] > CRITICAL_FLOAT_MONTHS
+                and (cpm['total_float'][k] <= CRITICAL_FLOAT_MONTHS
+                     or simulation['criticality'][t['name']] >= 1.0)]
+
+def compare_schedules(paths=None, num_iterations=10_000, seed=None):
+    """
+    Deterministic and Monte Carlo FOC for several schedule CSVs
+    paths: dict label -> CSV path (default baseline and accelerated)
+    Returns dict label -> {'model', 'cpm', 'simulation'}
+    """
+    paths = paths or {'baseline': BASELINE_SCHEDULE_CSV, 'accelerated': ACCELERATED_SCHEDULE_CSV}
+    results = {}
+    for label, path in paths.items():
+        model = ScheduleModel(path)
+        results[label] = {
+            'model': model,
+            'cpm': model.critical_path(),
+            'simulation': model.simulate(num_iterations, seed)
+        }
+    return results
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    start = time.perf_counter()
+    results = compare_schedules(num_iterations=100_000, seed=0)
+    elapsed = time.perf_counter() - start
+
+    failed = False
+    for label, result in results.items():
+        model, cpm, sim = result['model'], result['cpm'], result['simulation']
+        print(f"\n{label.upper()} SCHEDULE ({model.path}, {len(model.tasks)} tasks)")
+        print("-" * 60)
+        print(f"  Deterministic FOC: month {cpm['foc_month']:.0f}")
+        print(f"  Monte Carlo FOC:   mean {sim['mean']:.1f}  P50 {sim['P50']:.1f}  "
+              f"P80 {sim['P80']:.1f}  P90 {sim['P90']:.1f}")
+        for task, phrase in model.unresolved:
+            print(f"  Unresolved dependency: {task} <- '{phrase}'")
+        print("  Most critical tasks (criticality index, listed *):")
+        ranked = sorted(sim['criticality'].items(), key=lambda kv: -kv[1])
+        listed = {t['name']: t['listed_critical'] for t in model.tasks}
+        for name, index in ranked[:10]:
+            print(f"    {name:40s} {index:5.2f}  {'*' if listed[name] else ''}")
+        violations = model.slack_violations(cpm, sim)
+        for name in violations:
+            print(f"  Task with listed slack reported critical: {name}")
+        failed = failed or bool(violations)
+
+    print(f"\n2 x 100,000 iterations in {elapsed:.2f} s")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Arctic OTHR Global Sensitivity Analysis
+Sobol and Morris sensitivity indices of coverage and detection range
+
+UNCLASSIFIED // PUBLIC RELEASE
+Version: 1.0 Framework
+
+PURPOSE: Answer "which inputs drive coverage and detection range" with
+         variance-based (Sobol) and screening (Morris) indices instead of
+         one-at-a-time edits. Parameters are declared as (low, high) ranges
+         using the apply_parameter_overrides key syntax, sample matrices are
+         built over them, and the model is evaluated on whole blocks of
+         samples at once: the parameter fields hold arrays of samples and
+         broadcast through coverage_mask and estimate_detection_range.
+         Blocks can be spread over a process pool.
+
+METHODS:
+- Sobol: Saltelli sampling (N * (D + 2) evaluations), first-order indices
+  by the Saltelli (2010) estimator, total indices by the Jansen estimator
+- Morris: r one-at-a-time trajectories on a p-level grid; mu* (mean
+  absolute elementary effect), mu and sigma, with effects measured in
+  units of each parameter's range
+- Confidence intervals by bootstrap over the base samples / trajectories
+
+USAGE:
+    python3 OTHR_sensitivity.py --method sobol --samples 8192 --workers 4
+"""
+
+import argparse
+import functools
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from OTHR_coverage_model import (OTHRParameters, apply_parameter_overrides,
+                                 coverage_mask, estimate_detection_range)
+from OTHR_equal_area_grid import latlon_cell_areas
+
+# ============================================================================
+# ANALYSIS DEFAULTS
+# ============================================================================
+
+# (low, high) ranges of the analyzed parameters, keyed as in
+# apply_parameter_overrides
+DEFAULT_PARAMETER_RANGES = {
+    'probability_detection': (0.5, 0.9),
+    'aurora_degradation_factor': (0.4, 0.9),
+    'target_profiles[Medium Aircraft].pd_modifier': (0.7, 1.0),
+    'target_profiles[Small Aircraft].pd_modifier': (0.5, 0.9),
+    'coverage_angle_deg': (90.0, 150.0),
+    'max_range_km': (2500.0, 3500.0),
+    'sites[1].lat': (66.0, 74.0),
+    'sites[1].lon': (-120.0, -100.0)
+}
+
+DEFAULT_RESOLUTION_DEG = 2.0    # Coverage grid resolution for the analysis
+PD_THRESHOLD = 0.5              # Pd threshold for detection ranges
+BATCH_SIZE = 1024               # Parameter samples evaluated per vectorized block
+NUM_RESAMPLES = 1000            # Bootstrap resamples for confidence intervals
+BOOTSTRAP_BLOCK_ROWS = 65536    # Resampled rows gathered per bootstrap block
+CONFIDENCE_LEVEL = 0.95
+
+# ============================================================================
+# BATCHED MODEL EVALUATION
+# ============================================================================
+
+def _column_name(text):
+    return re.sub(r'[^0-9a-zA-Z]+', '_', text).strip('_').lower()
+
+def output_names(params=None):
+    """
+    Names of the model outputs analyzed, in evaluate_batch column order
+    """
+    params = params or OTHRParameters()
+    names = ['coverage_fraction_single', 'coverage_fraction_dual',
+             'coverage_fraction_triple']
+    for target_type in params.target_profiles:
+        for conditions in ('clear', 'auroral'):
+            names.append(f'detection_range_{conditions}_km_{_column_name(target_type)}')
+    return names
+
+def _samples_column(value):
+    """
+    Parameter field as a (samples, 1) column (scalars become (1, 1))
+    """
+    return np.asarray(value, dtype=float).reshape(-1, 1)
+
+def evaluate_batch(values, parameter_names, base_params=None,
+                   resolution_deg=DEFAULT_RESOLUTION_DEG):
+    """
+    Evaluate the model for a block of parameter samples at once
+
+    values: array of shape (num_samples, len(parameter_names))
+    Returns array of shape (num_samples, len(output_names())) with
+    area-weighted coverage fractions and detection ranges (km)
+    """
+    base_params = base_params or OTHRParameters()
+    values = np.asarray(values, dtype=float)
+    num_samples = len(values)
+
+    # One parameter set whose varied fields hold the whole block of samples
+    batch = apply_parameter_overrides(
+        base_params, {name: values[:, j] for j, name in enumerate(parameter_names)})
+
+    lat_range = np.arange(50, 85, resolution_deg)
+    lon_range = np.arange(-180, -60, resolution_deg)
+    lat_grid, lon_grid = np.meshgrid(lat_range, lon_range, indexing='ij')
+    cell_area = latlon_cell_areas(lat_range, lon_range).ravel()
+
+    counts = np.zeros((num_samples, lat_grid.size), dtype=np.int8)
+    for site in batch.sites:
+        in_coverage, _, _ = coverage_mask(
+            lat_grid.ravel()[np.newaxis, :], lon_grid.ravel()[np.newaxis, :],
+            _samples_column(site['lat']), _samples_column(site['lon']),
+            _samples_column(site['azimuth_center']), _samples_column(site['coverage_angle']),
+            _samples_column(batch.min_range_km), _samples_column(batch.max_range_km))
+        counts += in_coverage
+
+    columns = [(counts >= k) @ cell_area / cell_area.sum() for k in (1, 2, 3)]
+    for target_type in batch.target_profiles:
+        for conditions in ('clear', 'auroral'):
+            range_km = estimate_detection_range(batch, target_type, PD_THRESHOLD, conditions)
+            columns.append(np.broadcast_to(range_km, (num_samples,)))
+
+    return np.column_stack(columns)
+
+def evaluate_samples(values, parameter_names, base_params=None,
+                     resolution_deg=DEFAULT_RESOLUTION_DEG, workers=1,
+                     batch_size=BATCH_SIZE):
+    """
+    Evaluate the model on every row of a sample matrix in blocks of
+    batch_size, across a process pool (workers=1 runs in-process)
+    Returns array of shape (num_samples, num_outputs)
+    """
+    evaluate = functools.partial(evaluate_batch, parameter_names=parameter_names,
+                                 base_params=base_params or OTHRParameters(),
+                                 resolution_deg=resolution_deg)
+    blocks = [values[i:i + batch_size] for i in range(0, len(values), batch_size)]
+
+    if workers == 1:
+        results = [evaluate(block) for block in blocks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(evaluate, blocks))
+    return np.concatenate(results)
+
+# ============================================================================
+# SAMPLING
+# ============================================================================
+
+def _scale(unit, bounds):
+    """
+    Map unit-cube samples onto the parameter ranges
+    """
+    return bounds[:, 0] + unit * (bounds[:, 1] - bounds[:, 0])
+
+def saltelli_sample(num_parameters, num_base_samples, rng):
+    """
+    Saltelli sample matrices on the unit cube
+    Returns (A, B, AB) with A, B of shape (N, D) and AB of shape (D, N, D),
+    AB[i] being A with column i taken from B
+    """
+    a = rng.random((num_base_samples, num_parameters))
+    b = rng.random((num_base_samples, num_parameters))
+    ab = np.repeat(a[np.newaxis], num_parameters, axis=0)
+    for i in range(num_parameters):
+        ab[i, :, i] = b[:, i]
+    return a, b, ab
+
+def morris_sample(num_parameters, num_trajectories, num_levels, rng):
+    """
+    Morris trajectories on a num_levels grid of the unit cube
+    Each trajectory moves one parameter at a time by delta, in random order
+    and direction
+    Returns (points, order, delta): points of shape (r, D + 1, D) and the
+    parameter moved at each step, shape (r, D)
+    """
+    delta = num_levels / (2 * (num_levels - 1))
+    r, d = num_trajectories, num_parameters
+
+    # Start on a grid level low enough that +delta stays in the cube, then
+    # flip half the coordinates so those steps move down instead
+    start = rng.integers(0, num_levels // 2, size=(r, d)) / (num_levels - 1)
+    direction = np.where(rng.random((r, d)) < 0.5, 1.0, -1.0)
+    start = np.where(direction > 0, start, start + delta)
+    order = np.argsort(rng.random((r, d)), axis=1)
+
+    steps = np.zeros((r, d + 1, d))
+    rows = np.arange(r)
+    for k in range(d):
+        moved = order[:, k]
+        steps[:, k + 1] = steps[:, k]
+        steps[rows, k + 1, moved] = direction[rows, moved] * delta
+
+    return start[:, np.newaxis, :] + steps, order, delta
+
+# ============================================================================
+# INDEX ESTIMATION
+# ============================================================================
+
+def _bootstrap_interval(statistic, num_samples, rng, num_resamples, confidence):
+    """
+    Percentile bootstrap interval of statistic(indices) over sample rows
+    statistic maps an index array of shape (R, n) to R stacked estimates;
+    resamples are drawn in blocks so the gathered rows stay bounded
+    Returns (low, high)
+    """
+    block = max(1, BOOTSTRAP_BLOCK_ROWS // num_samples)
+    estimates = np.concatenate([
+        statistic(rng.integers(0, num_samples, size=(min(block, num_resamples - i), num_samples)))
+        for i in range(0, num_resamples, block)
+    ])
+    tail = (1 - confidence) / 2 * 100
+    return (np.percentile(estimates, tail, axis=0),
+            np.percentile(estimates, 100 - tail, axis=0))
+
+def _sobol_estimates(f_a, f_b, f_ab):
+    """
+    First-order (Saltelli 2010) and total (Jansen) indices
+    f_a, f_b: (..., n, outputs); f_ab: (D, ..., n, outputs)
+    Returns (first, total), each of shape (..., outputs, D)
+    """
+    variance = np.var(np.concatenate([f_a, f_b], axis=-2), axis=-2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        first = np.mean(f_b * (f_ab - f_a), axis=-2) / variance
+        total = 0.5 * np.mean((f_a - f_ab) ** 2, axis=-2) / variance
+    return np.moveaxis(first, 0, -1), np.moveaxis(total, 0, -1)
+
+def sobol_analysis(parameter_ranges=None, num_base_samples=4096, base_params=None,
+                   resolution_deg=DEFAULT_RESOLUTION_DEG, workers=1,
+                   batch_size=BATCH_SIZE, num_resamples=NUM_RESAMPLES,
+                   confidence=CONFIDENCE_LEVEL, seed=None):
+    """
+    Sobol first-order (S1) and total (ST) indices of every model output
+
+    Runs num_base_samples * (D + 2) model evaluations. Outputs that do not
+    vary over the ranges have undefined (NaN) indices.
+    Returns dict with 'parameters', 'outputs', 'num_evaluations' and
+    arrays of shape (num_outputs, D): 'S1', 'S1_low', 'S1_high', 'ST',
+    'ST_low', 'ST_high'
+    """
+    parameter_ranges = parameter_ranges or DEFAULT_PARAMETER_RANGES
+    base_params = base_params or OTHRParameters()
+    names = list(parameter_ranges)
+    bounds = np.array([parameter_ranges[name] for name in names], dtype=float)
+    rng = np.random.default_rng(seed)
+    n, d = num_base_samples, len(names)
+
+    a, b, ab = saltelli_sample(d, n, rng)
+    values = _scale(np.concatenate([a, b, ab.reshape(d * n, d)]), bounds)
+    outputs = evaluate_samples(values, names, base_params, resolution_deg,
+                               workers, batch_size)
+    f_a, f_b, f_ab = outputs[:n], outputs[n:2 * n], outputs[2 * n:].reshape(d, n, -1)
+
+    first, total = _sobol_estimates(f_a, f_b, f_ab)
+    # One set of resampled rows serves every parameter
+    low, high = _bootstrap_interval(
+        lambda idx: np.stack(_sobol_estimates(f_a[idx], f_b[idx], f_ab[:, idx]), axis=1),
+        n, rng, num_resamples, confidence)
+
+    return {
+        'parameters': names,
+        'outputs': output_names(base_params),
+        'num_evaluations': len(values),
+        'S1': first,
+        'S1_low': low[0],
+        'S1_high': high[0],
+        'ST': total,
+        'ST_low': low[1],
+        'ST_high': high[1]
+    }
+
+def morris_analysis(parameter_ranges=None, num_trajectories=1000, num_levels=4,
+                    base_params=None, resolution_deg=DEFAULT_RESOLUTION_DEG,
+                    workers=1, batch_size=BATCH_SIZE, num_resamples=NUM_RESAMPLES,
+                    confidence=CONFIDENCE_LEVEL, seed=None):
+    """
+    Morris elementary-effect screening of every model output
+
+    Runs num_trajectories * (D + 1) model evaluations. Effects are output
+    changes per full parameter range.
+    Returns dict with 'parameters', 'outputs', 'num_evaluations' and
+    arrays of shape (num_outputs, D): 'mu_star', 'mu_star_low',
+    'mu_star_high', 'mu', 'sigma'
+    """
+    parameter_ranges = parameter_ranges or DEFAULT_PARAMETER_RANGES
+    base_params = base_params or OTHRParameters()
+    names = list(parameter_ranges)
+    bounds = np.array([parameter_ranges[name] for name in names], dtype=float)
+    rng = np.random.default_rng(seed)
+    r, d = num_trajectories, len(names)
+
+    points, order, delta = morris_sample(d, r, num_levels, rng)
+    values = _scale(points.reshape(r * (d + 1), d), bounds)
+    outputs = evaluate_samples(values, names, base_params, resolution_deg,
+                               workers, batch_size).reshape(r, d + 1, -1)
+
+    # Elementary effect of the parameter moved at each step, signed by the
+    # direction of the move
+    moved = points[:, 1:] - points[:, :-1]
+    step_sign = np.sign(moved.sum(axis=2))
+    effects = np.empty((r, d, outputs.shape[2]))
+    rows = np.arange(r)[:, np.newaxis]
+    effects[rows, order] = np.diff(outputs, axis=1) * (step_sign / delta)[:, :, np.newaxis]
+
+    mu_star_low, mu_star_high = _bootstrap_interval(
+        lambda idx: np.abs(effects[idx]).mean(axis=1), r, rng, num_resamples, confidence)
+
+    return {
+        'parameters': names,
+        'outputs': output_names(base_params),
+        'num_evaluations': len(values),
+        'mu_star': np.abs(effects).mean(axis=0).T,
+        'mu_star_low': mu_star_low.T,
+        'mu_star_high': mu_star_high.T,
+        'mu': effects.mean(axis=0).T,
+        'sigma': effects.std(axis=0, ddof=1).T
+    }
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def print_indices(result, keys):
+    """
+    Print one table per output: index value and interval per parameter
+    """
+    for k, output in enumerate(result['outputs']):
+        print(f"\n{output}:")
+        for j, name in enumerate(result['parameters']):
+            cells = []
+            for key in keys:
+                value = result[key][k, j]
+                if f'{key}_low' in result:
+                    cells.append(f"{key} {value:8.3f} [{result[f'{key}_low'][k, j]:7.3f}, "
+                                 f"{result[f'{key}_high'][k, j]:7.3f}]")
+                else:
+                    cells.append(f"{key} {value:8.3f}")
+            print(f"  {name:46s} " + "  ".join(cells))
+
+def main(argv=None):
+    import time
+
+    parser = argparse.ArgumentParser(description="Run an OTHR sensitivity analysis")
+    parser.add_argument('--method', choices=('sobol', 'morris'), default='sobol')
+    parser.add_argument('--samples', type=int, default=8192,
+                        help="Base samples (Sobol) or trajectories (Morris)")
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--resolution', type=float, default=DEFAULT_RESOLUTION_DEG,
+                        help="Coverage grid resolution (degrees)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.method == 'sobol':
+        result = sobol_analysis(num_base_samples=args.samples, resolution_deg=args.resolution,
+                                workers=args.workers, seed=args.seed)
+        keys = ('S1', 'ST')
+    else:
+        result = morris_analysis(num_trajectories=args.samples, resolution_deg=args.resolution,
+                                 workers=args.workers, seed=args.seed)
+        keys = ('mu_star', 'sigma')
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.method.capitalize()} analysis: {result['num_evaluations']:,} model "
+          f"evaluations in {elapsed:.1f} s ({CONFIDENCE_LEVEL:.0%} bootstrap intervals)")
+    print_indices(result, keys)
+
+if __name__ == "__main__":
+    main()
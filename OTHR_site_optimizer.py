@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Arctic OTHR Site Placement Optimizer
+Selects the best N radar sites (location + boresight) from a candidate list
+
+UNCLASSIFIED // PUBLIC RELEASE
+Version: 1.0 Framework
+
+PURPOSE: Replace hand-editing of OTHRParameters.sites with a search over
+         candidate sites. Each candidate's coverage is computed once and
+         packed into bitsets, so scoring a combination is only OR/AND and
+         popcount operations.
+"""
+
+import copy
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from OTHR_coverage_model import (OTHRParameters, calculate_site_masks,
+                                 coverage_mask, densify_route)
+from OTHR_equal_area_grid import latlon_cell_areas
+
+# ============================================================================
+# OPTIMIZER DEFAULTS
+# ============================================================================
+
+DEFAULT_WEIGHTS = {
+    'single': 1.0,   # Area covered by at least one site
+    'dual': 0.5,     # Area covered by at least two sites
+    'routes': 1.0    # Fraction of commercial route samples covered
+}
+
+# Number of set bits for every possible byte value
+_POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+# ============================================================================
+# CANDIDATE GENERATION
+# ============================================================================
+
+def generate_candidates(lats, lons, azimuths, coverage_angle=120):
+    """
+    Build a candidate list from the product of latitudes, longitudes and
+    boresight azimuths
+    Returns list of site dicts in the OTHRParameters.sites format
+    """
+    candidates = []
+    for lat in lats:
+        for lon in lons:
+            for azimuth in azimuths:
+                candidates.append({
+                    'name': f'Candidate {lat:.1f}N {lon:.1f}E az{azimuth:.0f}',
+                    'lat': float(lat),
+                    'lon': float(lon),
+                    'azimuth_center': float(azimuth),
+                    'coverage_angle': coverage_angle
+                })
+    return candidates
+
+# ============================================================================
+# BITSET PRECOMPUTATION
+# ============================================================================
+
+def _popcount_rows(bits):
+    """
+    Count set bits along the last axis of a packed uint8 array
+    """
+    return _POPCOUNT_TABLE[bits].sum(axis=-1, dtype=np.int64)
+
+class CoverageBitsets:
+    """
+    Packed coverage of every candidate site over the analysis grid and the
+    densified commercial routes
+
+    grid_bits:  uint8 array (num_candidates, num_lat, num_bytes), one bit per
+                grid cell, packed along longitude so each row shares one
+                area weight
+    route_bits: uint8 array (num_candidates, num_bytes), one bit per route sample
+    """
+
+    def __init__(self, params, candidates, resolution_deg=1.0, route_step_km=50):
+        self.candidates = list(candidates)
+        self.lat_range = np.arange(50, 85, resolution_deg)
+        self.lon_range = np.arange(-180, -60, resolution_deg)
+
+        # Exact area of each grid row's cells in km^2
+        self.row_area_km2 = np.ascontiguousarray(
+            latlon_cell_areas(self.lat_range, self.lon_range)[:, 0])
+        self.total_area_km2 = float(self.row_area_km2.sum() * len(self.lon_range))
+
+        # Packed one candidate at a time, so the unpacked masks of all
+        # candidates are never held at once
+        self.grid_bits = np.empty((len(self.candidates), len(self.lat_range),
+                                   (len(self.lon_range) + 7) // 8), dtype=np.uint8)
+        candidate_params = copy.copy(params)
+        for k, site in enumerate(self.candidates):
+            candidate_params.sites = [site]
+            mask = calculate_site_masks(candidate_params, self.lat_range, self.lon_range)[0]
+            self.grid_bits[k] = np.packbits(mask, axis=-1)
+
+        route_lats, route_lons = [], []
+        for route in params.commercial_routes:
+            lats, lons = densify_route(route['waypoints'], route_step_km)
+            route_lats.append(lats)
+            route_lons.append(lons)
+        route_lats = np.concatenate(route_lats)
+        route_lons = np.concatenate(route_lons)
+        self.num_route_points = len(route_lats)
+
+        route_masks = np.zeros((len(self.candidates), self.num_route_points), dtype=bool)
+        for k, site in enumerate(self.candidates):
+            route_masks[k], _, _ = coverage_mask(
+                route_lats, route_lons,
+                site['lat'], site['lon'],
+                site['azimuth_center'], site['coverage_angle'],
+                params.min_range_km, params.max_range_km
+            )
+        self.route_bits = np.packbits(route_masks, axis=-1)
+
+    def weighted_area(self, grid_bits):
+        """
+        Area in km^2 of the set bits of one or more packed grid masks
+        """
+        return _popcount_rows(grid_bits) @ self.row_area_km2
+
+    def route_fraction(self, route_bits):
+        """
+        Fraction of route samples set in one or more packed route masks
+        """
+        return _popcount_rows(route_bits) / max(1, self.num_route_points)
+
+# ============================================================================
+# COMBINATION SCORING
+# ============================================================================
+
+def _combine(bitsets, selection):
+    """
+    OR/AND-reduce the packed masks of a selection
+    Returns (any_grid, dual_grid, any_routes)
+    """
+    any_grid = np.zeros(bitsets.grid_bits.shape[1:], dtype=np.uint8)
+    dual_grid = np.zeros_like(any_grid)
+    any_routes = np.zeros(bitsets.route_bits.shape[1:], dtype=np.uint8)
+
+    for k in selection:
+        dual_grid |= any_grid & bitsets.grid_bits[k]
+        any_grid |= bitsets.grid_bits[k]
+        any_routes |= bitsets.route_bits[k]
+
+    return any_grid, dual_grid, any_routes
+
+def _score(bitsets, any_grid, dual_grid, any_routes, weights):
+    """
+    Weighted objective for packed combination masks (broadcasts over a
+    leading candidate axis)
+    """
+    single = bitsets.weighted_area(any_grid) / bitsets.total_area_km2
+    dual = bitsets.weighted_area(dual_grid) / bitsets.total_area_km2
+    routes = bitsets.route_fraction(any_routes)
+    return weights['single'] * single + weights['dual'] * dual + \
+        weights['routes'] * routes
+
+def score_selection(bitsets, selection, weights=None):
+    """
+    Score a combination of candidate indices
+    Returns dict with the objective value and the coverage it achieves
+    """
+    weights = weights or DEFAULT_WEIGHTS
+    any_grid, dual_grid, any_routes = _combine(bitsets, selection)
+
+    return {
+        'score': float(_score(bitsets, any_grid, dual_grid, any_routes, weights)),
+        'single_coverage_km2': float(bitsets.weighted_area(any_grid)),
+        'dual_coverage_km2': float(bitsets.weighted_area(dual_grid)),
+        'single_coverage_fraction': float(bitsets.weighted_area(any_grid) /
+                                          bitsets.total_area_km2),
+        'dual_coverage_fraction': float(bitsets.weighted_area(dual_grid) /
+                                        bitsets.total_area_km2),
+        'route_coverage_fraction': float(bitsets.route_fraction(any_routes))
+    }
+
+# ============================================================================
+# SEARCH
+# ============================================================================
+
+def greedy_selection(bitsets, num_sites, weights=None):
+    """
+    Add the candidate with the best marginal score one site at a time
+    All candidates are scored in a single vectorized pass per step
+    """
+    weights = weights or DEFAULT_WEIGHTS
+    selection = []
+
+    for _ in range(min(num_sites, len(bitsets.candidates))):
+        any_grid, dual_grid, any_routes = _combine(bitsets, selection)
+        scores = _score(bitsets,
+                        any_grid | bitsets.grid_bits,
+                        dual_grid | (any_grid & bitsets.grid_bits),
+                        any_routes | bitsets.route_bits,
+                        weights)
+        scores[selection] = -np.inf
+        selection.append(int(np.argmax(scores)))
+
+    return selection
+
+def anneal_selection(bitsets, selection, weights=None, iterations=2000,
+                     initial_temperature=0.01, seed=None):
+    """
+    Improve a selection by simulated annealing over single-site swaps
+    Returns (best_selection, best_score)
+    """
+    weights = weights or DEFAULT_WEIGHTS
+    rng = np.random.default_rng(seed)
+    num_candidates = len(bitsets.candidates)
+
+    current = list(selection)
+    current_score = float(_score(bitsets, *_combine(bitsets, current), weights))
+    best, best_score = list(current), current_score
+
+    if num_candidates <= len(current):
+        return best, best_score
+
+    for step in range(iterations):
+        temperature = initial_temperature * (1 - step / iterations)
+
+        position = rng.integers(len(current))
+        replacement = int(rng.integers(num_candidates))
+        if replacement in current:
+            continue
+
+        trial = list(current)
+        trial[position] = replacement
+        trial_score = float(_score(bitsets, *_combine(bitsets, trial), weights))
+
+        delta = trial_score - current_score
+        if delta >= 0 or (temperature > 0 and
+                          rng.random() < np.exp(delta / temperature)):
+            current, current_score = trial, trial_score
+            if current_score > best_score:
+                best, best_score = list(current), current_score
+
+    return best, best_score
+
+# Per-process state for pool workers (set once by the pool initializer)
+_worker_bitsets = None
+
+def _init_worker(bitsets):
+    global _worker_bitsets
+    _worker_bitsets = bitsets
+
+def _anneal_worker(args):
+    selection, weights, iterations, temperature, seed = args
+    return anneal_selection(_worker_bitsets, selection, weights,
+                            iterations, temperature, seed)
+
+def optimize_sites(params, candidates, num_sites, resolution_deg=1.0,
+                   weights=None, restarts=4, iterations=2000,
+                   initial_temperature=0.01, workers=None, seed=0,
+                   route_step_km=50):
+    """
+    Choose the best num_sites candidates for area and route coverage
+
+    Runs a greedy construction followed by independent annealing restarts
+    distributed across a process pool (workers=1 runs in-process)
+
+    Returns dict with the selected site list (ready for params.sites) and
+    the coverage statistics of the selection
+    """
+    weights = weights or DEFAULT_WEIGHTS
+    bitsets = CoverageBitsets(params, candidates, resolution_deg, route_step_km)
+
+    start = greedy_selection(bitsets, num_sites, weights)
+    best, best_score = start, score_selection(bitsets, start, weights)['score']
+
+    seeds = np.random.SeedSequence(seed).generate_state(restarts)
+    jobs = [(start, weights, iterations, initial_temperature, int(s)) for s in seeds]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or restarts <= 1:
+        results = [anneal_selection(bitsets, *job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, restarts),
+                                 initializer=_init_worker,
+                                 initargs=(bitsets,)) as pool:
+            results = list(pool.map(_anneal_worker, jobs))
+
+    for selection, score in results:
+        if score > best_score:
+            best, best_score = selection, score
+
+    result = score_selection(bitsets, best, weights)
+    result['selection'] = [int(k) for k in best]
+    result['sites'] = [dict(bitsets.candidates[k]) for k in best]
+    result['total_area_km2'] = bitsets.total_area_km2
+    return result
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    params = OTHRParameters()
+
+    candidates = generate_candidates(
+        lats=np.arange(60, 76, 2.5),
+        lons=np.arange(-170, -60, 5),
+        azimuths=np.arange(0, 360, 30),
+        coverage_angle=params.coverage_angle_deg
+    )
+    print(f"Evaluating {len(candidates)} candidate sites...")
+
+    baseline = CoverageBitsets(params, params.sites)
+    baseline_stats = score_selection(baseline, range(len(params.sites)))
+
+    result = optimize_sites(params, candidates, num_sites=len(params.sites))
+
+    print(f"\n{'Metric':40s} {'Baseline':>12s} {'Optimized':>12s}")
+    print("-" * 66)
+    for key in ['score', 'single_coverage_fraction', 'dual_coverage_fraction',
+                'route_coverage_fraction']:
+        print(f"{key:40s} {baseline_stats[key]:12.3f} {result[key]:12.3f}")
+
+    print("\nSelected sites:")
+    for site in result['sites']:
+        print(f"  {site['name']}")
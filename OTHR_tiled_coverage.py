@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Arctic OTHR Tiled Coverage
+Out-of-core, multi-process coverage over hemisphere-scale grids
+
+UNCLASSIFIED // PUBLIC RELEASE
+Version: 1.0 Framework
+
+PURPOSE: calculate_coverage_map holds one dense float64 grid over the fixed
+         50-85N, 180-60W domain. This backend covers any latitude/longitude
+         box, by default the whole northern hemisphere (across the
+         antimeridian), at fine resolution and for any number of sites.
+         The domain is split into tiles computed in worker processes; each
+         tile evaluates a site only inside its footprint, and writes uint8
+         coverage counts and per-site masks bit-packed along longitude into
+         memory-mapped .npy files of a store directory. Peak memory is set
+         by the tile shape, not the domain.
+
+         Per-tile covered areas are kept in the store, so an interrupted run
+         resumes with the tiles still missing and the area statistics stay
+         exact.
+
+STORE LAYOUT (directory):
+    meta.json        grid axes, tile shape, site names, parameter key and
+                     area statistics once complete
+    counts.npy       uint8 (num_lat, num_lon) sites covering each cell
+    site_masks.npy   uint8 (num_sites, num_lat, ceil(num_lon / 8)), bit-packed
+    tile_areas.npy   float64 (tile_rows, tile_cols, 4) km^2 covered by exactly
+                     0/1/2/3+ sites per tile (NaN until the tile is written)
+
+Longitudes run eastward from lon_bounds[0] and may pass 180 (e.g.
+lon_bounds=(120, 240) spans the Bering Sea); queries accept either form.
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from OTHR_coverage_model import coverage_mask, site_footprint_slices
+from OTHR_equal_area_grid import coverage_area_statistics, latlon_cell_areas
+from OTHR_instrumentation import annotate_stage, instrumented
+
+# ============================================================================
+# TILING CONFIGURATION
+# ============================================================================
+
+HEMISPHERE_LAT_BOUNDS = (0.0, 90.0)
+HEMISPHERE_LON_BOUNDS = (-180.0, 180.0)
+DEFAULT_RESOLUTION_DEG = 0.05
+DEFAULT_TILE_SHAPE = (512, 1024)    # Cells per tile (lat, lon); lon a multiple of 8
+
+STORE_VERSION = 1   # Bump when the store layout or coverage model changes
+
+# ============================================================================
+# GRID AND STORE
+# ============================================================================
+
+def grid_axes(lat_bounds, lon_bounds, resolution_deg):
+    """
+    Cell latitudes and longitudes of a box (start edges, as np.arange in
+    calculate_coverage_map); computed from integer indices so fine
+    resolutions do not drift
+    """
+    num_lat = int(np.ceil((lat_bounds[1] - lat_bounds[0]) / resolution_deg - 1e-9))
+    num_lon = int(np.ceil((lon_bounds[1] - lon_bounds[0]) / resolution_deg - 1e-9))
+    return (lat_bounds[0] + np.arange(num_lat) * resolution_deg,
+            lon_bounds[0] + np.arange(num_lon) * resolution_deg)
+
+def _store_key(params, lat_bounds, lon_bounds, resolution_deg, tile_shape):
+    """
+    Hash of every input that affects the stored tiles
+    """
+    key = {
+        'version': STORE_VERSION,
+        'lat_bounds': [float(v) for v in lat_bounds],
+        'lon_bounds': [float(v) for v in lon_bounds],
+        'resolution_deg': float(resolution_deg),
+        'tile_shape': list(tile_shape),
+        'min_range_km': float(params.min_range_km),
+        'max_range_km': float(params.max_range_km),
+        'sites': [
+            [float(site['lat']), float(site['lon']),
+             float(site['azimuth_center']), float(site['coverage_angle'])]
+            for site in params.sites
+        ]
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode('utf-8')).hexdigest()[:32]
+
+class TiledCoverage:
+    """
+    Read-only view of a tiled coverage store
+
+    counts:       uint8 memmap (num_lat, num_lon)
+    packed_masks: uint8 memmap (num_sites, num_lat, ceil(num_lon / 8))
+    statistics:   area statistics (coverage_area_statistics keys), None
+                  until every tile is written
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, 'meta.json')) as f:
+            self.meta = json.load(f)
+        self.resolution_deg = self.meta['resolution_deg']
+        self.site_names = self.meta['site_names']
+        self.lat_range, self.lon_range = grid_axes(
+            self.meta['lat_bounds'], self.meta['lon_bounds'], self.resolution_deg)
+        self.counts = np.load(os.path.join(path, 'counts.npy'), mmap_mode='r')
+        self.packed_masks = np.load(os.path.join(path, 'site_masks.npy'), mmap_mode='r')
+        self.statistics = self.meta.get('statistics')
+
+    def site_masks(self, lat_slice=slice(None), lon_slice=slice(None)):
+        """
+        Unpacked per-site masks for a window of the grid
+        Returns bool array (num_sites, rows, cols)
+        """
+        cols = range(len(self.lon_range))[lon_slice]
+        if cols.step != 1:
+            raise ValueError("Longitude window must be contiguous")
+        first, last = cols.start // 8, (cols.stop + 7) // 8
+        bits = np.unpackbits(self.packed_masks[:, lat_slice, first:last], axis=-1)
+        offset = cols.start - first * 8
+        return bits[..., offset:offset + len(cols)].astype(bool)
+
+    def window(self, lat_bounds, lon_bounds):
+        """
+        Counts over a lat/lon box inside the domain
+        Returns (lat_range, lon_range, counts) with counts read from disk
+        """
+        i0, i1 = np.searchsorted(self.lat_range, lat_bounds)
+        j0, j1 = np.searchsorted(self.lon_range, lon_bounds)
+        return (self.lat_range[i0:i1], self.lon_range[j0:j1],
+                np.array(self.counts[i0:i1, j0:j1]))
+
+    def grid_index(self, lat, lon):
+        """
+        Indices of the cells containing points (longitudes in any 360 deg form)
+        Returns (lat_index, lon_index, inside) arrays
+        """
+        lat = np.asarray(lat, dtype=float)
+        lon = np.asarray(lon, dtype=float)
+        i = np.floor((lat - self.lat_range[0]) / self.resolution_deg + 1e-9).astype(np.int64)
+        j = np.floor(((lon - self.lon_range[0]) % 360) / self.resolution_deg + 1e-9).astype(np.int64)
+        inside = (i >= 0) & (i < len(self.lat_range)) & (j < len(self.lon_range))
+        return np.where(inside, i, 0), np.where(inside, j, 0), inside
+
+    def query_many(self, lats, lons):
+        """
+        Coverage counts at arrays of points (0 outside the domain)
+        """
+        i, j, inside = self.grid_index(np.ravel(lats), np.ravel(lons))
+        return np.where(inside, self.counts[i, j], 0).astype(np.uint8)
+
+def load_tiled_coverage(path):
+    """
+    Open a tiled coverage store read-only
+    """
+    return TiledCoverage(path)
+
+def _create_store(path, key, params, lat_range, lon_range, meta):
+    """
+    Allocate the store files (or reopen them to resume a run with the same key)
+    Returns the tile_areas memmap
+    """
+    meta_path = os.path.join(path, 'meta.json')
+    if os.path.exists(meta_path):
+        with open(meta_path) as f:
+            if json.load(f).get('key') == key:
+                return np.load(os.path.join(path, 'tile_areas.npy'), mmap_mode='r+')
+
+    os.makedirs(path, exist_ok=True)
+    num_lat, num_lon = len(lat_range), len(lon_range)
+    tile_rows = -(-num_lat // meta['tile_shape'][0])
+    tile_cols = -(-num_lon // meta['tile_shape'][1])
+
+    np.lib.format.open_memmap(os.path.join(path, 'counts.npy'), mode='w+',
+                              dtype=np.uint8, shape=(num_lat, num_lon)).flush()
+    np.lib.format.open_memmap(os.path.join(path, 'site_masks.npy'), mode='w+', dtype=np.uint8,
+                              shape=(len(params.sites), num_lat, (num_lon + 7) // 8)).flush()
+    tile_areas = np.lib.format.open_memmap(os.path.join(path, 'tile_areas.npy'), mode='w+',
+                                           dtype=np.float64, shape=(tile_rows, tile_cols, 4))
+    tile_areas[:] = np.nan
+    tile_areas.flush()
+
+    with open(meta_path, 'w') as f:
+        json.dump(dict(meta, key=key), f, indent=2)
+    return tile_areas
+
+# ============================================================================
+# TILE EVALUATION (runs in each worker)
+# ============================================================================
+
+_worker_store = None    # Store memmaps opened by each pool worker
+
+def _open_store(path):
+    """
+    Writable memmaps (counts, site_masks, tile_areas) of a store
+    """
+    return tuple(np.load(os.path.join(path, name), mmap_mode='r+')
+                 for name in ('counts.npy', 'site_masks.npy', 'tile_areas.npy'))
+
+def _init_worker(path):
+    global _worker_store
+    _worker_store = _open_store(path)
+
+def _compute_tile(params, lat_range, lon_range, row_area, tile, store=None):
+    """
+    Coverage of one tile written into the store (the worker's store unless
+    given)
+    row_area: cell area (km^2) of each grid row
+    tile: (tile_row, tile_col, lat_slice, lon_slice)
+    """
+    tile_row, tile_col, lat_slice, lon_slice = tile
+    tile_lat, tile_lon = lat_range[lat_slice], lon_range[lon_slice]
+    counts_store, masks_store, areas_store = store or _worker_store
+
+    counts = np.zeros((len(tile_lat), len(tile_lon)), dtype=np.uint8)
+    masks = np.zeros((len(params.sites),) + counts.shape, dtype=bool)
+    for k, site in enumerate(params.sites):
+        # Only the part of the tile inside the site's footprint is evaluated
+        rows, cols = site_footprint_slices(site, params.max_range_km, tile_lat, tile_lon)
+        if rows.stop == rows.start or cols.stop == cols.start:
+            continue
+        masks[k, rows, cols], _, _ = coverage_mask(
+            tile_lat[rows, np.newaxis], tile_lon[np.newaxis, cols],
+            site['lat'], site['lon'], site['azimuth_center'], site['coverage_angle'],
+            params.min_range_km, params.max_range_km)
+        counts += masks[k]
+
+    packed_cols = slice(lon_slice.start // 8, lon_slice.start // 8 + (len(tile_lon) + 7) // 8)
+    counts_store[lat_slice, lon_slice] = counts
+    masks_store[:, lat_slice, packed_cols] = np.packbits(masks, axis=-1)
+    counts_store.flush()
+    masks_store.flush()
+
+    # Written last: a finite entry marks the tile as complete
+    cell_area = np.broadcast_to(row_area[lat_slice, np.newaxis], counts.shape)
+    areas_store[tile_row, tile_col] = np.bincount(np.minimum(counts, 3).ravel(),
+                                                  weights=cell_area.ravel(), minlength=4)
+    areas_store.flush()
+
+@instrumented()
+def calculate_coverage_tiled(params, store_path, resolution_deg=DEFAULT_RESOLUTION_DEG,
+                             lat_bounds=HEMISPHERE_LAT_BOUNDS, lon_bounds=HEMISPHERE_LON_BOUNDS,
+                             tile_shape=DEFAULT_TILE_SHAPE, workers=1):
+    """
+    Coverage over a lat/lon box, computed tile by tile into a store directory
+
+    Tiles are fanned out over a process pool (workers=1 runs in-process).
+    Rerunning with the same inputs and store_path computes only the tiles
+    not yet written.
+
+    Returns TiledCoverage for the store, with area statistics
+    """
+    if tile_shape[1] % 8:
+        raise ValueError("Tile longitude size must be a multiple of 8 (bit packing)")
+
+    lat_range, lon_range = grid_axes(lat_bounds, lon_bounds, resolution_deg)
+    key = _store_key(params, lat_bounds, lon_bounds, resolution_deg, tile_shape)
+    tile_areas = _create_store(store_path, key, params, lat_range, lon_range, {
+        'version': STORE_VERSION,
+        'lat_bounds': [float(v) for v in lat_bounds],
+        'lon_bounds': [float(v) for v in lon_bounds],
+        'resolution_deg': float(resolution_deg),
+        'tile_shape': list(tile_shape),
+        'site_names': [site['name'] for site in params.sites]
+    })
+
+    pending = [
+        (r, c, slice(r * tile_shape[0], (r + 1) * tile_shape[0]),
+         slice(c * tile_shape[1], (c + 1) * tile_shape[1]))
+        for r in range(tile_areas.shape[0]) for c in range(tile_areas.shape[1])
+        if np.isnan(tile_areas[r, c, 0])
+    ]
+    row_area = latlon_cell_areas(lat_range, lon_range[:2])[:, 0]
+    annotate_stage(grid_cells=len(lat_range) * len(lon_range), num_sites=len(params.sites),
+                   tiles=int(tile_areas[..., 0].size), pending_tiles=len(pending))
+
+    if workers == 1:
+        store = _open_store(store_path)
+        for tile in pending:
+            _compute_tile(params, lat_range, lon_range, row_area, tile, store)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(store_path,)) as pool:
+            futures = [pool.submit(_compute_tile, params, lat_range, lon_range, row_area, tile)
+                       for tile in pending]
+            for future in futures:
+                future.result()
+
+    # Exact areas by number of covering sites, summed over tiles, fed back
+    # through coverage_area_statistics as one "cell" per count
+    exact_km2 = np.asarray(tile_areas).reshape(-1, 4).sum(axis=0)
+    meta_path = os.path.join(store_path, 'meta.json')
+    with open(meta_path) as f:
+        meta = json.load(f)
+    meta['statistics'] = coverage_area_statistics(np.arange(4), exact_km2)
+    with open(meta_path, 'w') as f:
+        json.dump(meta, f, indent=2)
+
+    return TiledCoverage(store_path)
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    import time
+    from OTHR_coverage_model import DEFAULT_OUTPUT_DIR, OTHRParameters
+
+    params = OTHRParameters()
+    store = os.path.join(DEFAULT_OUTPUT_DIR, 'OTHR_Hemisphere_Coverage')
+
+    start = time.perf_counter()
+    coverage = calculate_coverage_tiled(params, store, workers=os.cpu_count() or 1)
+    elapsed = time.perf_counter() - start
+
+    stats = coverage.statistics
+    print(f"Northern hemisphere at {coverage.resolution_deg:g} deg: "
+          f"{coverage.counts.size:,} cells in {elapsed:.1f} s -> {store}")
+    print(f"  1+ sites: {stats['single_coverage_km2']:,.0f} km2   "
+          f"2+ sites: {stats['dual_coverage_km2']:,.0f} km2   "
+          f"3 sites: {stats['triple_coverage_km2']:,.0f} km2")
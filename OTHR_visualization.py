@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Arctic OTHR Visualization Layer
+Plotting functions for the coverage and performance model
+
+UNCLASSIFIED // PUBLIC RELEASE
+Version: 1.0 Framework
+
+PURPOSE: Keep matplotlib out of the numeric core. OTHR_coverage_model only
+         imports this module when a plot function is first used, so
+         headless workers and sweeps never pay for matplotlib.
+"""
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+from OTHR_coverage_model import calculate_coverage_map, calculate_detection_probability
+from OTHR_equal_area_grid import DEFAULT_CELL_SIZE_KM, calculate_coverage_equal_area
+from OTHR_instrumentation import instrumented, stage
+
+# ============================================================================
+# PLOT STYLE (shared with OTHR_batch_render)
+# ============================================================================
+
+COVERAGE_LEVELS = [0, 0.5, 1.5, 2.5, 3.5]
+COVERAGE_COLORS = ['white', 'lightblue', 'blue', 'darkblue']
+COVERAGE_ALPHA = 0.6
+COVERAGE_MAP_TITLE = 'Arctic OTHR Coverage Map\n(Unclassified Framework - Notional Site Locations)'
+CURVE_TARGET = 'Large Commercial Aircraft'    # Clear vs auroral comparison panel
+SAVE_DPI = 300
+
+# ============================================================================
+# VISUALIZATION FUNCTIONS
+# ============================================================================
+
+@instrumented()
+def plot_coverage_map(params, save_path=None, cache_dir=None, grid='latlon',
+                      cell_size_km=DEFAULT_CELL_SIZE_KM):
+    """
+    Create coverage map visualization
+    (cache_dir reuses cached coverage rasters, see calculate_coverage_map)
+    
+    grid='equal_area' computes coverage on the equal-area grid
+    (cell_size_km cells) and resamples it to lat/lon for display
+    """
+    if grid not in ('latlon', 'equal_area'):
+        raise ValueError(f"Unknown coverage grid: {grid}")
+    
+    fig, ax = plt.subplots(figsize=(14, 10))
+    
+    # Calculate coverage
+    if grid == 'equal_area':
+        ea_grid, coverage_counts = calculate_coverage_equal_area(params, cell_size_km)
+        lat_range, lon_range, coverage_grid = ea_grid.to_latlon(coverage_counts, resolution_deg=0.5)
+    else:
+        lat_range, lon_range, coverage_grid = calculate_coverage_map(
+            params, resolution_deg=2.0, cache_dir=cache_dir)
+    
+    # Plot coverage
+    with stage('contourf', grid_cells=int(coverage_grid.size)):
+        coverage_plot = ax.contourf(lon_range, lat_range, coverage_grid, 
+                                    levels=COVERAGE_LEVELS,
+                                    colors=COVERAGE_COLORS,
+                                    alpha=COVERAGE_ALPHA)
+    
+    # Add colorbar
+    cbar = plt.colorbar(coverage_plot, ax=ax, ticks=[0, 1, 2, 3])
+    cbar.set_label('Number of Sites Covering', rotation=270, labelpad=20)
+    cbar.set_ticklabels(['0', '1', '2', '3'])
+    
+    # Plot radar sites
+    for site in params.sites:
+        ax.plot(site['lon'], site['lat'], 'r*', markersize=20, label=site['name'])
+        
+        # Add coverage wedge (simplified, not accounting for Earth curvature)
+        # This is approximate visualization only
+        ax.text(site['lon'], site['lat']+1, site['name'], 
+               ha='center', fontsize=8, weight='bold')
+    
+    # Plot commercial routes
+    for route in params.commercial_routes:
+        lons = [wp[1] for wp in route['waypoints']]
+        lats = [wp[0] for wp in route['waypoints']]
+        ax.plot(lons, lats, 'g--', linewidth=1, alpha=0.5)
+        ax.text(lons[0], lats[0], route['name'], fontsize=7, color='green')
+    
+    ax.set_xlabel('Longitude (degrees)')
+    ax.set_ylabel('Latitude (degrees)')
+    ax.set_title(COVERAGE_MAP_TITLE, fontsize=14, weight='bold')
+    ax.grid(True, alpha=0.3)
+    ax.set_xlim(-180, -60)
+    ax.set_ylim(50, 85)
+    
+    plt.tight_layout()
+    
+    if save_path:
+        with stage('savefig', dpi=SAVE_DPI):
+            plt.savefig(save_path, dpi=SAVE_DPI, bbox_inches='tight')
+        print(f"Coverage map saved to {save_path}")
+    
+    return fig
+
+@instrumented()
+def plot_performance_curves(params, save_path=None):
+    """
+    Plot detection performance curves for different target types and conditions
+    """
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+    
+    ranges = np.arange(params.min_range_km, params.max_range_km, 50)
+    
+    # Plot 1: Pd vs Range for different targets (clear conditions)
+    for target_type in params.target_profiles.keys():
+        pds = calculate_detection_probability(params, target_type, ranges, 'clear')
+        ax1.plot(ranges, pds, label=target_type, linewidth=2)
+    
+    ax1.axhline(y=0.5, color='r', linestyle='--', alpha=0.5, label='Pd=0.5 threshold')
+    ax1.set_xlabel('Range (km)', fontsize=12)
+    ax1.set_ylabel('Probability of Detection (Pd)', fontsize=12)
+    ax1.set_title('Detection Performance vs Range\n(Clear Conditions)', fontsize=12, weight='bold')
+    ax1.legend()
+    ax1.grid(True, alpha=0.3)
+    ax1.set_ylim(0, 1.05)
+    
+    # Plot 2: Pd vs Range for Large Aircraft (clear vs auroral)
+    target = CURVE_TARGET
+    pds_clear = calculate_detection_probability(params, target, ranges, 'clear')
+    pds_aurora = calculate_detection_probability(params, target, ranges, 'auroral')
+    
+    ax2.plot(ranges, pds_clear, label='Clear Conditions', linewidth=2, color='blue')
+    ax2.plot(ranges, pds_aurora, label='Auroral Conditions', linewidth=2, color='red')
+    ax2.fill_between(ranges, pds_clear, pds_aurora, alpha=0.2, color='yellow', 
+                     label='Performance Degradation')
+    ax2.axhline(y=0.5, color='gray', linestyle='--', alpha=0.5)
+    
+    ax2.set_xlabel('Range (km)', fontsize=12)
+    ax2.set_ylabel('Probability of Detection (Pd)', fontsize=12)
+    ax2.set_title(f'Arctic Performance Impact\n({target})', fontsize=12, weight='bold')
+    ax2.legend()
+    ax2.grid(True, alpha=0.3)
+    ax2.set_ylim(0, 1.05)
+    
+    plt.tight_layout()
+    
+    if save_path:
+        with stage('savefig', dpi=SAVE_DPI):
+            plt.savefig(save_path, dpi=SAVE_DPI, bbox_inches='tight')
+        print(f"Performance curves saved to {save_path}")
+    
+    return fig